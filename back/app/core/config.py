@@ -9,10 +9,46 @@ load_dotenv()
 class Settings:
     app_name: str = "Athlia API"
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    log_level: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    log_json: bool = os.getenv("LOG_JSON", "false").lower() == "true"
+    # Share of successful requests under ACCESS_LOG_SLOW_MS that get an access line, on
+    # ACCESS_LOG_SAMPLE_ROUTES (comma-separated route templates) or on every route when unset.
+    access_log_sample_rate: float = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", 1.0))
+    access_log_sample_routes: tuple[str, ...] = tuple(
+        route.strip() for route in os.getenv("ACCESS_LOG_SAMPLE_ROUTES", "").split(",") if route.strip()
+    )
+    access_log_slow_ms: float = float(os.getenv("ACCESS_LOG_SLOW_MS", 1000))
     database_url: str = os.getenv("DATABASE_URL", "")
+    # Optional replica for read-only routes; clients that just wrote stay on the primary.
+    database_read_url: str = os.getenv("DATABASE_READ_URL", "")
+    read_your_writes_seconds: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+    # Serve routes from an asyncpg/aiosqlite engine instead of the threadpool.
+    async_database: bool = os.getenv("ASYNC_DATABASE", "false").lower() == "true"
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", 5))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    db_pool_recycle_seconds: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+    db_pool_timeout_seconds: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", 30))
+    # "pessimistic" pings on every checkout; "optimistic" relies on recycling and disconnect detection.
+    db_pre_ping: str = os.getenv("DB_PRE_PING", "optimistic").lower()
+    # Also switched on by ``?pgbouncer=true`` in DATABASE_URL.
+    db_pgbouncer: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+    # Behind PgBouncer: 0 opens a connection per checkout (NullPool), >0 keeps a small pool.
+    db_pgbouncer_pool_size: int = int(os.getenv("DB_PGBOUNCER_POOL_SIZE", 0))
     token_secret: str = os.getenv("TOKEN_SECRET", "athlia-dev-secret")
     access_ttl_seconds: int = int(os.getenv("ACCESS_TTL_SECONDS", 3600))
     refresh_ttl_seconds: int = int(os.getenv("REFRESH_TTL_SECONDS", 2592000))
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+    analytics_cache_size: int = int(os.getenv("ANALYTICS_CACHE_SIZE", 5000))
+    analytics_cache_ttl_seconds: int = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", 300))
+    profile_cache_size: int = int(os.getenv("PROFILE_CACHE_SIZE", 5000))
+    profile_cache_ttl_seconds: int = int(os.getenv("PROFILE_CACHE_TTL_SECONDS", 300))
+    hash_pool_size: int = int(os.getenv("HASH_POOL_SIZE", os.cpu_count() or 2))
+    hash_queue_limit: int = int(os.getenv("HASH_QUEUE_LIMIT", 64))
+    last_connection_flush_seconds: float = float(os.getenv("LAST_CONNECTION_FLUSH_SECONDS", 10))
+    metrics_dir: str = os.getenv("METRICS_DIR", "")
+    metrics_snapshot_seconds: float = float(os.getenv("METRICS_SNAPSHOT_SECONDS", 5))
+    # Warn when one statement runs this many times in a request (likely N+1); 0 disables.
+    n_plus_one_threshold: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", 10))
 
 
 settings = Settings()
@@ -1,8 +1,93 @@
+"""Logging through a queue, so request handling never waits on log I/O.
+
+``setup_logging`` gives the root logger a single ``QueueHandler``. A
+``QueueListener`` thread formats each record and writes it to the real
+stream. Records are queued unformatted: message arguments are merged, and
+tracebacks rendered, in the listener thread. Log arguments must therefore not
+be mutated after the logging call. Set ``LOG_JSON=true`` for one JSON object
+per line. Fields passed with ``extra=`` become keys of that object.
+
+Access lines go to ``ACCESS_LOGGER``. ``should_log_access`` samples the
+successful, fast ones (see ``ACCESS_LOG_SAMPLE_RATE``). Errors and slow
+requests are always logged.
+"""
+import atexit
+import json
 import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
+
+from app.core.config import settings
+
+ACCESS_LOGGER = "athlia-api.access"
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so the record need not be made
+        # picklable; formatting is left to the listener thread.
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def setup_logging(stream: TextIO | None = None) -> None:
+    """Route the root logger through a background listener writing to ``stream`` (stderr)."""
+    global _listener
+    stop_logging()
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if settings.log_json else logging.Formatter(TEXT_FORMAT))
+    records: queue.SimpleQueue = queue.SimpleQueue()
+
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, _DeferredQueueHandler)]:
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(records))
+    root.setLevel(settings.log_level)
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Write out every queued record and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
 
 
-def setup_logging() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-    )
+def should_log_access(route: str, status_code: int, elapsed_ms: float) -> bool:
+    """Keep errors, slow requests and a ``ACCESS_LOG_SAMPLE_RATE`` share of the rest."""
+    if status_code >= 400 or elapsed_ms >= settings.access_log_slow_ms:
+        return True
+    if settings.access_log_sample_routes and route not in settings.access_log_sample_routes:
+        return True
+    return random.random() < settings.access_log_sample_rate
@@ -0,0 +1,187 @@
+"""Request latency histograms and counters in the Prometheus text format.
+
+Requests are grouped by route template (``/analytics/{account_id}``), not raw
+path, so the number of series stays bounded. Every update happens on the event
+loop thread in the HTTP middleware, so no lock is needed.
+
+With several workers, set ``METRICS_DIR`` to a directory shared by the
+workers. Each one writes a JSON snapshot there, and ``/metrics`` merges every
+snapshot into one exposition. Counters from workers that have exited are
+kept, but their in-flight gauge is ignored once their snapshot is older than
+three snapshot intervals.
+"""
+import json
+import os
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RequestMetrics:
+    """Latency, status counts and SQL usage per ``(method, route)``, plus in-flight requests."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.in_flight = 0
+        # (method, route) -> per-bucket counts (last slot is +Inf), then sum and count.
+        self._latency: dict[tuple[str, str], list[float]] = {}
+        self._status: dict[tuple[str, str, int], int] = {}
+        # (method, route) -> [SQL statements, seconds spent in the database].
+        self._db: dict[tuple[str, str], list[float]] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        statements: int = 0,
+        db_seconds: float = 0.0,
+    ) -> None:
+        series = self._latency.get((method, route))
+        if series is None:
+            series = self._latency[(method, route)] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        series[bisect_left(self.buckets, seconds)] += 1
+        series[-2] += seconds
+        series[-1] += 1
+        key = (method, route, status)
+        self._status[key] = self._status.get(key, 0) + 1
+        db = self._db.get((method, route))
+        if db is None:
+            db = self._db[(method, route)] = [0, 0.0]
+        db[0] += statements
+        db[1] += db_seconds
+
+    def reset(self) -> None:
+        self.in_flight = 0
+        self._latency.clear()
+        self._status.clear()
+        self._db.clear()
+
+    def snapshot(self) -> dict:
+        """JSON-serialisable copy of every series; take it on the event loop thread."""
+        return {
+            "taken_at": time.time(),
+            "in_flight": self.in_flight,
+            "buckets": list(self.buckets),
+            "latency": [[method, route, list(series)] for (method, route), series in self._latency.items()],
+            "status": [[method, route, status, count] for (method, route, status), count in self._status.items()],
+            "db": [[method, route, list(usage)] for (method, route), usage in self._db.items()],
+        }
+
+
+request_metrics = RequestMetrics()
+
+
+def write_snapshot(snapshot: dict) -> None:
+    """Publish this worker's ``snapshot`` to ``METRICS_DIR``; no-op when it is unset."""
+    if not settings.metrics_dir:
+        return
+    path = Path(settings.metrics_dir) / f"metrics-{os.getpid()}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(snapshot))
+    os.replace(tmp, path)
+
+
+def collect_snapshots(local: dict) -> list[dict]:
+    """``local`` plus the latest snapshot of every other worker sharing ``METRICS_DIR``."""
+    if not settings.metrics_dir:
+        return [local]
+    write_snapshot(local)
+    snapshots = []
+    for path in Path(settings.metrics_dir).glob("metrics-*.json"):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # Replaced between glob and read.
+    return snapshots
+
+
+def _merge(snapshots: Iterable[dict]) -> dict:
+    latency: dict[tuple[str, str], list[float]] = {}
+    status: dict[tuple[str, str, int], int] = {}
+    db: dict[tuple[str, str], list[float]] = {}
+    in_flight = 0
+    buckets = LATENCY_BUCKETS
+    live_since = time.time() - 3 * settings.metrics_snapshot_seconds
+    for snapshot in snapshots:
+        if tuple(snapshot["buckets"]) != buckets:
+            continue
+        if snapshot["taken_at"] >= live_since:
+            in_flight += snapshot["in_flight"]
+        for target, rows in ((latency, snapshot["latency"]), (db, snapshot.get("db", ()))):
+            for method, route, values in rows:
+                merged = target.setdefault((method, route), [0] * len(values))
+                for index, value in enumerate(values):
+                    merged[index] += value
+        for method, route, code, count in snapshot["status"]:
+            status[(method, route, code)] = status.get((method, route, code), 0) + count
+    return {"buckets": buckets, "latency": latency, "status": status, "db": db, "in_flight": in_flight}
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def render_metrics(snapshots: Iterable[dict], pool_stats: Mapping[str, Mapping[str, object]]) -> str:
+    """Prometheus exposition of the merged request ``snapshots`` and this worker's ``pool_stats``."""
+    merged = _merge(snapshots)
+    lines = [
+        "# HELP http_request_duration_seconds Request latency by route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), series in sorted(merged["latency"].items()):
+        cumulative = 0
+        for bound, count in zip((*merged["buckets"], "+Inf"), series):
+            cumulative += count
+            labels = _labels(method=method, route=route, le=bound)
+            lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+        lines.append(f"http_request_duration_seconds_sum{_labels(method=method, route=route)} {series[-2]:.6f}")
+        lines.append(f"http_request_duration_seconds_count{_labels(method=method, route=route)} {series[-1]}")
+
+    lines += ["# HELP http_requests_total Responses by route template and status.", "# TYPE http_requests_total counter"]
+    for (method, route, code), count in sorted(merged["status"].items()):
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=code)} {count}")
+
+    lines += [
+        "# HELP http_request_db_statements_total SQL statements issued while serving requests.",
+        "# TYPE http_request_db_statements_total counter",
+        *(
+            f"http_request_db_statements_total{_labels(method=method, route=route)} {statements}"
+            for (method, route), (statements, _seconds) in sorted(merged["db"].items())
+        ),
+        "# HELP http_request_db_seconds_total Time spent executing SQL while serving requests.",
+        "# TYPE http_request_db_seconds_total counter",
+        *(
+            f"http_request_db_seconds_total{_labels(method=method, route=route)} {seconds:.6f}"
+            for (method, route), (_statements, seconds) in sorted(merged["db"].items())
+        ),
+    ]
+    lines += [
+        "# HELP http_requests_in_flight Requests being served.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {merged['in_flight']}",
+    ]
+
+    # Pool figures belong to the worker answering this scrape.
+    for metric, key, kind, description in (
+        ("db_pool_checked_out", "checked_out", "gauge", "Connections currently checked out."),
+        ("db_pool_checkouts_total", "checkouts", "counter", "Successful pool checkouts."),
+        ("db_pool_checkout_timeouts_total", "timeouts", "counter", "Checkouts that hit the pool timeout."),
+        ("db_pool_checkout_wait_seconds_total", "wait_seconds_total", "counter", "Time spent waiting for a connection."),
+    ):
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} {kind}"]
+        for engine, stats in sorted(pool_stats.items()):
+            lines.append(f"{metric}{_labels(engine=engine, pid=os.getpid())} {stats[key]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,22 @@
+"""The application's JSON response class.
+
+Routes that build plain dicts, lists, dates and datetimes return
+``FastJSONResponse`` themselves. FastAPI then neither validates them against
+``response_model`` nor walks them with ``jsonable_encoder``. The
+``response_model`` declarations remain for the OpenAPI schema, and the test
+suite checks responses against them.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON; dates and datetimes are written in ISO 8601."""
+    return orjson.dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -2,9 +2,13 @@ import base64
 import hashlib
 import hmac
 import json
+import threading
 import time
+from collections import OrderedDict
 from typing import Literal, TypedDict
 
+from fastapi import HTTPException, status
+
 from app.core.config import settings
 
 
@@ -24,12 +28,13 @@ def _from_base64_url(value: str) -> str:
     return base64.urlsafe_b64decode(padded.encode("utf-8")).decode("utf-8")
 
 
+_SIGNING_KEY = hmac.new(settings.token_secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
 def _sign(part: str) -> str:
-    digest = hmac.new(
-        settings.token_secret.encode("utf-8"),
-        part.encode("utf-8"),
-        hashlib.sha256,
-    ).digest()
+    mac = _SIGNING_KEY.copy()
+    mac.update(part.encode("utf-8"))
+    digest = mac.digest()
     return base64.urlsafe_b64encode(digest).decode("utf-8").rstrip("=")
 
 
@@ -75,3 +80,62 @@ def parse_token(token: str) -> TokenPayload | None:
         return None
 
     return {"sub": sub, "type": token_type, "exp": exp}
+
+
+class TokenCache:
+    """Bounded LRU of verified tokens; an entry is dropped once its ``exp`` is reached."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, TokenPayload] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> TokenPayload | None:
+        with self._lock:
+            payload = self._entries.get(token)
+            if payload is None:
+                return None
+            if payload["exp"] <= int(time.time()):
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return payload
+
+    def put(self, token: str, payload: TokenPayload) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[token] = payload
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.token_cache_size)
+
+
+def parse_token_cached(token: str) -> TokenPayload | None:
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    payload = parse_token(token)
+    if payload is not None:
+        token_cache.put(token, payload)
+    return payload
+
+
+def require_account_id(authorization: str | None) -> str:
+    """Account id of a valid ``Bearer`` access token; 401 otherwise."""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
+    token = parse_token_cached(authorization.replace("Bearer ", "", 1))
+    if not token or token["type"] != "access":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return token["sub"]
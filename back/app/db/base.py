@@ -1,6 +1,57 @@
-from app.db.session import engine
+from sqlalchemy import inspect
+
+from app.db.session import SessionLocal, engine
 from app.models import Base
+from app.services.readiness_service import dedupe_readiness_logs
+from app.services.rollups import rebuild_rollups
+from app.services.sync_service import migrate_sync_columns
 
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
+
+
+def create_missing_indexes() -> list[str]:
+    """Create indexes declared on the models but absent from an existing database.
+
+    ``create_all`` only creates indexes together with their table; ``migrate``
+    runs this for tables that already existed.
+    """
+    inspector = inspect(engine)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    return created
+
+
+def migrate() -> dict:
+    """Bring an existing database up to the current models (``python -m app.db.base``).
+
+    Every step is a no-op once applied, so this is safe to run on each deploy.
+    The order matters: duplicate readiness logs are ordered by ``updated_at``,
+    and must be gone before the unique (account, day) index is created.
+    Rollups are rebuilt last, from the deduplicated rows.
+    """
+    init_db()
+    with SessionLocal() as db:
+        sync_columns = migrate_sync_columns(db)
+        duplicate_readiness_logs = dedupe_readiness_logs(db)
+        indexes = create_missing_indexes()
+        rollups = rebuild_rollups(db)
+    return {
+        "updated_at added to": sync_columns,
+        "duplicate readiness logs removed": duplicate_readiness_logs,
+        "indexes created": indexes,
+        "account rollups rebuilt": rollups,
+    }
+
+
+if __name__ == "__main__":
+    for step, result in migrate().items():
+        if isinstance(result, list):
+            result = ", ".join(result) or "none"
+        print(f"{step}: {result}")
@@ -0,0 +1,115 @@
+"""Connection pool configuration and checkout metrics.
+
+Pool sizing, recycling, timeout and pre-ping come from ``settings``. Behind
+PgBouncer in transaction mode a server connection is only ours for one
+transaction, so the app either opens a client connection per checkout
+(``NullPool``) or keeps a small pool, and asyncpg's prepared statement caches
+are switched off.
+"""
+import threading
+import time
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.core.config import settings
+
+PRE_PING_STRATEGIES = ("optimistic", "pessimistic")
+
+
+class PoolMetrics:
+    """Checkout counts and wait times for one engine's pool."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.pool: Pool | None = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait_seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def stats(self) -> dict[str, int | float | str]:
+        pool = self.pool
+        sized = isinstance(pool, QueuePool)
+        return {
+            "pool": type(pool).__name__ if pool else None,
+            "size": pool.size() if sized else 0,
+            "checked_out": pool.checkedout() if sized else 0,
+            "overflow": pool.overflow() if sized else 0,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def _instrumented(base: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    # A subclass rather than an instance hook: ``Pool.recreate`` builds a new
+    # instance of the same class on dispose, and the metrics must follow it.
+    class InstrumentedPool(base):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            metrics.pool = self
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+                raise
+            metrics.record_checkout(time.perf_counter() - start, timed_out=False)
+            return connection
+
+    InstrumentedPool.__name__ = base.__name__
+    return InstrumentedPool
+
+
+def uses_pgbouncer(raw_url: str) -> bool:
+    flag = make_url(raw_url).query.get("pgbouncer", "")
+    return settings.db_pgbouncer or str(flag).lower() in ("true", "1")
+
+
+def engine_options(url: URL, name: str, pgbouncer: bool = False, is_async: bool = False) -> dict:
+    """``create_engine`` keyword arguments for ``url``, registering ``pool_metrics[name]``."""
+    if settings.db_pre_ping not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DB_PRE_PING must be one of {PRE_PING_STRATEGIES}, not {settings.db_pre_ping!r}")
+    metrics = pool_metrics[name] = PoolMetrics(name)
+    queue_pool = AsyncAdaptedQueuePool if is_async else QueuePool
+    options: dict = {"pool_pre_ping": settings.db_pre_ping == "pessimistic"}
+
+    if pgbouncer and settings.db_pgbouncer_pool_size <= 0:
+        options["poolclass"] = _instrumented(NullPool, metrics)
+    else:
+        options.update(
+            poolclass=_instrumented(queue_pool, metrics),
+            pool_size=settings.db_pgbouncer_pool_size if pgbouncer else settings.db_pool_size,
+            max_overflow=0 if pgbouncer else settings.db_max_overflow,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_timeout=settings.db_pool_timeout_seconds,
+        )
+
+    if pgbouncer and url.get_driver_name() == "asyncpg":
+        # Transaction pooling hands each transaction a different server connection,
+        # so named prepared statements cannot be cached or reused across them.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return options
@@ -0,0 +1,64 @@
+"""Per-request SQL statement counts and database time.
+
+``track_queries`` installs a ``QueryStats`` in a context variable. The cursor
+hooks that ``instrument`` adds to each engine update whichever ``QueryStats``
+is current. Threadpool calls and SQLAlchemy's async greenlets inherit the
+request's context, so statements from ``AsyncDB.run`` are counted against the
+request that issued them. Statements run with no tracker active cost one
+context variable lookup.
+"""
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+    # Statement text -> executions; a high count for one SELECT usually means a per-row query.
+    repeats: Counter = field(default_factory=Counter)
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        top = self.repeats.most_common(1)
+        return top[0] if top else None
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(_conn, _cursor, statement, _parameters, context, _executemany) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.repeats[statement] += 1
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.seconds += time.perf_counter() - started
+
+
+def instrument(engine: Engine) -> None:
+    """Attach the tracking hooks to ``engine`` (the ``sync_engine`` of an async engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,23 +1,103 @@
-from collections.abc import Generator
-from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator
+from contextlib import asynccontextmanager
+from typing import Concatenate, ParamSpec, TypeVar
+
+import anyio
 
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
 
 from app.core.config import settings
+from app.db.pool import engine_options, uses_pgbouncer
+from app.db.query_stats import instrument
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+# Dialect-specific ``insert`` constructs, for ``ON CONFLICT`` upserts.
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+SUPPORTED_DATABASES = ASYNC_DRIVERS.keys() & UPSERT_INSERTS.keys()
+
+
+class UnsupportedDatabaseError(Exception):
+    """``DATABASE_URL`` or ``DATABASE_READ_URL`` names a database the app cannot run on."""
+
+
+def _normalized_url(raw_url: str) -> URL:
+    """Driver URL without the app-level query options; raises ``UnsupportedDatabaseError``."""
+    url = make_url(raw_url).difference_update_query(["pgbouncer", "uselibpqcompat"])
+    backend = url.get_backend_name()
+    if backend not in SUPPORTED_DATABASES:
+        supported = ", ".join(sorted(SUPPORTED_DATABASES))
+        raise UnsupportedDatabaseError(f"Unsupported database {backend!r}; use one of: {supported}")
+    return url
 
 
 def _normalized_database_url(raw_url: str) -> str:
-    parsed = urlparse(raw_url)
-    query_params = dict(parse_qsl(parsed.query, keep_blank_values=True))
-    query_params.pop("pgbouncer", None)
-    query_params.pop("uselibpqcompat", None)
-    normalized_query = urlencode(query_params)
-    return urlunparse(parsed._replace(query=normalized_query))
+    return _normalized_url(raw_url).render_as_string(hide_password=False)
+
+
+def _async_database_url(raw_url: str) -> str:
+    """Same database through the asyncpg / aiosqlite driver."""
+    url = _normalized_url(raw_url)
+    backend = url.get_backend_name()
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+    if backend == "postgresql" and "sslmode" in url.query:
+        # asyncpg spells libpq's sslmode as ssl.
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": url.query["sslmode"]})
+    return url.render_as_string(hide_password=False)
+
+
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
 
 
-engine = create_engine(_normalized_database_url(settings.database_url), pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _create_engine(raw_url: str, name: str) -> Engine:
+    created = create_engine(
+        _normalized_database_url(raw_url),
+        **engine_options(_normalized_url(raw_url), name, pgbouncer=uses_pgbouncer(raw_url)),
+    )
+    instrument(created)
+    return created
+
+
+def _create_async_engine(raw_url: str, name: str) -> AsyncEngine:
+    async_url = _async_database_url(raw_url)
+    created = create_async_engine(
+        async_url,
+        **engine_options(make_url(async_url), name, pgbouncer=uses_pgbouncer(raw_url), is_async=True),
+    )
+    instrument(created.sync_engine)
+    return created
+
+
+engine = _create_engine(settings.database_url, "primary")
+# Objects keep their values after commit so responses are built without re-SELECTing them.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+read_engine = engine
+ReadSessionLocal = SessionLocal
+if settings.database_read_url:
+    read_engine = _create_engine(settings.database_read_url, "replica")
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine)
+
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+async_read_engine: AsyncEngine | None = None
+AsyncReadSessionLocal: async_sessionmaker[AsyncSession] | None = None
+if settings.async_database:
+    async_engine = async_read_engine = _create_async_engine(settings.database_url, "primary_async")
+    AsyncSessionLocal = AsyncReadSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    if settings.database_read_url:
+        async_read_engine = _create_async_engine(settings.database_read_url, "replica_async")
+        AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -26,3 +106,98 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+class AsyncDB:
+    """Session handle for ``async def`` routes.
+
+    ``run`` calls a function written against a plain ``Session``. With
+    ``ASYNC_DATABASE`` enabled it runs on the event loop over the async driver
+    (``AsyncSession.run_sync``); otherwise it is sent to the threadpool with a
+    regular session. Functions should return plain data rather than ORM
+    objects, whose unloaded attributes cannot be fetched outside ``run``.
+    ``session_factory`` opens sync sessions on the same database, for work that
+    outlives the request such as streamed responses. ``primary`` is false when
+    reads go to a replica, which may lag behind recent writes.
+    """
+
+    def __init__(
+        self, session: Session | AsyncSession, session_factory: sessionmaker[Session], primary: bool = True
+    ) -> None:
+        self.session = session
+        self.session_factory = session_factory
+        self.primary = primary
+
+    async def run(self, fn: Callable[Concatenate[Session, P], T], *args: P.args, **kwargs: P.kwargs) -> T:
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+# Threads for returning connections to the pool, apart from the shared threadpool.
+_close_limiter = anyio.CapacityLimiter(settings.db_pool_size)
+
+
+@asynccontextmanager
+async def _open_db(
+    session_factory: sessionmaker[Session],
+    async_session_factory: async_sessionmaker[AsyncSession] | None,
+    primary: bool = True,
+) -> AsyncIterator[AsyncDB]:
+    if async_session_factory is None:
+        db = session_factory()
+        try:
+            yield AsyncDB(db, session_factory, primary)
+        finally:
+            # Outside the shared threadpool: when every worker is blocked waiting for a
+            # pooled connection, the close that would free one must not wait behind them.
+            await anyio.to_thread.run_sync(db.close, limiter=_close_limiter)
+        return
+    async with async_session_factory() as session:
+        yield AsyncDB(session, session_factory, primary)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncDB, None]:
+    async with _open_db(SessionLocal, AsyncSessionLocal) as db:
+        yield db
+
+
+def has_replica() -> bool:
+    return read_engine is not engine
+
+
+def primary_until() -> str:
+    """Value for ``PRIMARY_UNTIL_HEADER`` on a response to a write."""
+    return f"{time.time() + settings.read_your_writes_seconds:.3f}"
+
+
+def wants_primary(request: Request) -> bool:
+    """Whether the client echoed a ``PRIMARY_UNTIL_HEADER`` that has not expired yet.
+
+    Values further ahead than ``primary_until`` ever issues are ignored: a forged
+    far-future value would otherwise pin the client to the primary for good.
+    """
+    try:
+        until = float(request.headers.get(PRIMARY_UNTIL_HEADER, "0"))
+    except ValueError:
+        return False
+    now = time.time()
+    return now < until <= now + settings.read_your_writes_seconds
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncDB, None]:
+    """``get_async_db`` for read-only routes: the replica, unless the client just wrote."""
+    if not has_replica() or wants_primary(request):
+        async with _open_db(SessionLocal, AsyncSessionLocal) as db:
+            yield db
+        return
+    async with _open_db(ReadSessionLocal, AsyncReadSessionLocal, primary=False) as db:
+        yield db
+
+
+def dialect_insert(db: Session):
+    """``insert`` construct with ``on_conflict_do_update`` support for the bound dialect.
+
+    Engines are only created for dialects in ``UPSERT_INSERTS`` (see ``_normalized_url``).
+    """
+    return UPSERT_INSERTS[db.get_bind().dialect.name]
@@ -1,25 +1,53 @@
+import asyncio
 import logging
 import time
+from collections.abc import AsyncIterator
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
-from app.core.logging import setup_logging
+from app.core.hashing import HashingOverloadedError, password_hasher
+from app.core.logging import ACCESS_LOGGER, setup_logging, should_log_access
+from app.core.metrics import (
+    CONTENT_TYPE,
+    UNMATCHED_ROUTE,
+    collect_snapshots,
+    render_metrics,
+    request_metrics,
+    write_snapshot,
+)
+from app.core.responses import FastJSONResponse
 from app.db.base import init_db
-from app.routers import analytics, auth, injuries, readiness, users, workouts
+from app.db.pool import pool_metrics
+from app.db.query_stats import QueryStats, track_queries
+from app.db.session import (
+    PRIMARY_UNTIL_HEADER,
+    SessionLocal,
+    async_engine,
+    async_read_engine,
+    has_replica,
+    primary_until,
+)
+from app.routers import analytics, auth, injuries, readiness, sync, users, workouts
+from app.services.exercise_catalog import refresh_catalog
+from app.services.last_connection import flush_last_connections
+from app.services.listing import NEXT_CURSOR_HEADER
 
 setup_logging()
 logger = logging.getLogger("athlia-api")
+access_logger = logging.getLogger(ACCESS_LOGGER)
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, default_response_class=FastJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, PRIMARY_UNTIL_HEADER, "Server-Timing"],
 )
 
 
@@ -27,17 +55,138 @@ app.add_middleware(
 def on_startup() -> None:
     init_db()
     logger.info("Database initialized")
+    with SessionLocal() as db:
+        catalog = refresh_catalog(db)
+    logger.info("Exercise catalog v%s loaded (%s exercises)", catalog.version, len(catalog.exercises))
+
+
+async def _flush_last_connections_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.last_connection_flush_seconds)
+        try:
+            await run_in_threadpool(flush_last_connections)
+        except Exception:
+            # Keep the task alive: the next interval retries whatever is still buffered.
+            logger.exception("Periodic last_connection flush failed")
+
+
+async def _write_metrics_snapshots_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.metrics_snapshot_seconds)
+        await run_in_threadpool(write_snapshot, request_metrics.snapshot())
+
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+@app.on_event("startup")
+async def start_background_tasks() -> None:
+    _background_tasks.add(asyncio.create_task(_flush_last_connections_periodically()))
+    if settings.metrics_dir:
+        _background_tasks.add(asyncio.create_task(_write_metrics_snapshots_periodically()))
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
+    await run_in_threadpool(flush_last_connections)
+    await run_in_threadpool(write_snapshot, request_metrics.snapshot())
+    password_hasher.shutdown()
+    for engine in {async_engine, async_read_engine} - {None}:
+        await engine.dispose()
+
+
+def _finish_request(request: Request, status_code: int, start: float, queries: QueryStats) -> None:
+    """Record metrics and the access line once the response body has been sent."""
+    elapsed = time.perf_counter() - start
+    request_metrics.in_flight -= 1
+    # Routing fills in ``scope["route"]``; unmatched paths share one series.
+    route = request.scope.get("route")
+    route_path = route.path if route else UNMATCHED_ROUTE
+    request_metrics.observe(request.method, route_path, status_code, elapsed, queries.statements, queries.seconds)
+    elapsed_ms = round(elapsed * 1000, 1)
+    if should_log_access(route_path, status_code, elapsed_ms):
+        access_logger.info(
+            "%s %s -> %s (%sms, %s queries)",
+            request.method,
+            request.url.path,
+            status_code,
+            int(elapsed_ms),
+            queries.statements,
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "route": route_path,
+                "status": status_code,
+                "duration_ms": elapsed_ms,
+                "db_statements": queries.statements,
+            },
+        )
+    repeated = queries.most_repeated()
+    if settings.n_plus_one_threshold and repeated and repeated[1] >= settings.n_plus_one_threshold:
+        logger.warning(
+            "Possible N+1 on %s %s: statement ran %s times: %.200s",
+            request.method,
+            route_path,
+            repeated[1],
+            repeated[0],
+        )
+
+
+async def _finish_after_body(
+    body: AsyncIterator[bytes], request: Request, status_code: int, start: float, queries: QueryStats
+) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        _finish_request(request, status_code, start, queries)
 
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start = time.time()
+    """Time each request and count its SQL statements, up to the last body chunk.
+
+    ``call_next`` returns as soon as the headers are ready; streamed listings run
+    their queries while the body is sent. The route's task inherits the context,
+    so those queries still land in ``queries``.
+    """
+    start = time.perf_counter()
+    request_metrics.in_flight += 1
+    with track_queries() as queries:
+        try:
+            response = await call_next(request)
+        except BaseException:
+            _finish_request(request, 500, start, queries)
+            raise
+    if settings.debug:
+        # Sent with the headers, so a streamed body's queries are not included.
+        elapsed = time.perf_counter() - start
+        response.headers["Server-Timing"] = (
+            f'db;dur={queries.seconds * 1000:.1f};desc="{queries.statements} queries", '
+            f"app;dur={elapsed * 1000:.1f}"
+        )
+    response.body_iterator = _finish_after_body(response.body_iterator, request, response.status_code, start, queries)
+    return response
+
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """Tell clients that just wrote to keep reading from the primary for a short while."""
     response = await call_next(request)
-    elapsed_ms = int((time.time() - start) * 1000)
-    logger.info("%s %s -> %s (%sms)", request.method, request.url.path, response.status_code, elapsed_ms)
+    if has_replica() and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.headers[PRIMARY_UNTIL_HEADER] = primary_until()
     return response
 
 
+@app.exception_handler(HashingOverloadedError)
+async def hashing_overloaded_handler(_request: Request, exc: HashingOverloadedError):
+    logger.warning("Rejecting auth request: %s", exc)
+    return JSONResponse(status_code=503, content={"detail": "Service busy, retry later"}, headers={"Retry-After": "1"})
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(_request: Request, exc: Exception):
     logger.exception("Unhandled server error: %s", exc)
@@ -52,15 +201,20 @@ def root() -> dict:
         "docs": "/docs",
         "endpoints": [
             "/health",
+            "/health/db",
+            "/metrics",
             "/auth/register",
             "/auth/login",
             "/auth/refresh",
             "/users",
+            "/users/{account_id}",
             "/workouts/programs/generate",
             "/readiness",
             "/injuries",
             "/progress/{account_id}",
             "/analytics/{account_id}",
+            "/analytics/batch",
+            "/sync",
         ],
     }
 
@@ -70,9 +224,24 @@ def health() -> dict:
     return {"ok": True}
 
 
+@app.get("/health/db")
+def database_health() -> dict:
+    """Connection pool usage and checkout wait per engine."""
+    return {name: metrics.stats() for name, metrics in pool_metrics.items()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    """Prometheus text exposition; merged across workers when ``METRICS_DIR`` is set."""
+    snapshots = await run_in_threadpool(collect_snapshots, request_metrics.snapshot())
+    pool_stats = {name: metrics.stats() for name, metrics in pool_metrics.items()}
+    return Response(render_metrics(snapshots, pool_stats), media_type=CONTENT_TYPE)
+
+
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(workouts.router)
 app.include_router(readiness.router)
 app.include_router(injuries.router)
 app.include_router(analytics.router)
+app.include_router(sync.router)
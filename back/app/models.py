@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -43,6 +43,9 @@ class UserProfile(Base):
     stress: Mapped[str | None] = mapped_column(String(40), nullable=True)
     load: Mapped[str | None] = mapped_column(String(40), nullable=True)
     recovery: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     account: Mapped[Account] = relationship(back_populates="profile")
     readiness_logs: Mapped[list["ReadinessLog"]] = relationship(back_populates="profile")
@@ -60,6 +63,13 @@ class Exercise(Base):
     duration_min: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
 
+class CatalogVersion(Base):
+    __tablename__ = "catalog_versions"
+
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class WorkoutProgram(Base):
     __tablename__ = "workout_programs"
 
@@ -76,29 +86,48 @@ class WorkoutProgram(Base):
 
 class WorkoutSession(Base):
     __tablename__ = "workout_sessions"
+    __table_args__ = (
+        Index("ix_workout_sessions_account_date_status", "account_id", "session_date", "status"),
+        Index("ix_workout_sessions_account_updated", "account_id", "updated_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     program_id: Mapped[str] = mapped_column(String(36), ForeignKey("workout_programs.id"), index=True)
-    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id"), index=True)
+    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id"))
     name: Mapped[str] = mapped_column(String(120), nullable=False)
-    session_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    session_date: Mapped[date] = mapped_column(Date, nullable=False)
     planned_duration_min: Mapped[int] = mapped_column(Integer, nullable=False)
     planned_intensity: Mapped[int] = mapped_column(Integer, nullable=False)
     adjusted_intensity: Mapped[int] = mapped_column(Integer, nullable=False)
     status: Mapped[str] = mapped_column(String(30), nullable=False, default="planned")
     rpe_reported: Mapped[int | None] = mapped_column(Integer, nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     program: Mapped[WorkoutProgram] = relationship(back_populates="sessions")
 
 
+class SessionExercise(Base):
+    __tablename__ = "session_exercises"
+
+    session_id: Mapped[str] = mapped_column(String(36), ForeignKey("workout_sessions.id"), primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+    exercise_id: Mapped[str] = mapped_column(String(36), ForeignKey("exercises.id"), nullable=False)
+
+
 class ReadinessLog(Base):
     __tablename__ = "readiness_logs"
+    __table_args__ = (
+        Index("uq_readiness_logs_account_day", "account_id", "log_date", unique=True),
+        Index("ix_readiness_logs_account_updated", "account_id", "updated_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id"), index=True)
+    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id"))
     profile_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("user_profiles.id"), nullable=True)
-    log_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    log_date: Mapped[date] = mapped_column(Date, nullable=False)
     sleep_hours: Mapped[float] = mapped_column(Float, nullable=False)
     fatigue: Mapped[int] = mapped_column(Integer, nullable=False)
     stress: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -106,19 +135,49 @@ class ReadinessLog(Base):
     pain_level: Mapped[int] = mapped_column(Integer, nullable=False)
     readiness_score: Mapped[int] = mapped_column(Integer, nullable=False)
     ai_advice: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     profile: Mapped[UserProfile | None] = relationship(back_populates="readiness_logs")
 
 
 class Injury(Base):
     __tablename__ = "injuries"
+    __table_args__ = (
+        Index("ix_injuries_account_created", "account_id", "created_at"),
+        Index("ix_injuries_account_updated", "account_id", "updated_at"),
+        # Active injuries only: what program generation reads.
+        Index(
+            "ix_injuries_account_active",
+            "account_id",
+            "muscle_group",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id"), index=True)
+    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id"))
     profile_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("user_profiles.id"), nullable=True)
     muscle_group: Mapped[str] = mapped_column(String(80), nullable=False)
     pain_level: Mapped[int] = mapped_column(Integer, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
 
     profile: Mapped[UserProfile | None] = relationship(back_populates="injuries")
+
+
+class AccountTrainingRollup(Base):
+    __tablename__ = "account_training_rollups"
+
+    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id"), primary_key=True)
+    total_sessions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_sessions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rpe_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rpe_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    readiness_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    readiness_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
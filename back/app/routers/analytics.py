@@ -1,25 +1,67 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import date, timedelta
 
-from app.db.session import get_db
-from app.schemas import AnalyticsOut, ProgressOut
-from app.services.analytics_service import compute_analytics, compute_progress
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.responses import FastJSONResponse
+from app.db.session import AsyncDB, get_read_db
+from app.schemas import (
+    AnalyticsBatchIn,
+    AnalyticsBatchOut,
+    AnalyticsOut,
+    LoadSeriesOut,
+    ProgressOut,
+)
+from app.services.analytics_service import (
+    cached_analytics,
+    compute_analytics,
+    compute_analytics_batch,
+    compute_progress,
+    fill_analytics_cache,
+)
+from app.services.load_service import compute_load_series
 
 router = APIRouter(tags=["analytics"])
 
+MAX_LOAD_RANGE_DAYS = 366 * 10
+
 
 @router.get("/progress/{account_id}", response_model=ProgressOut)
-def progress(account_id: str, db: Session = Depends(get_db)) -> ProgressOut:
-    data = compute_progress(db, account_id)
-    return ProgressOut(
-        completed_sessions=int(data["completed_sessions"]),
-        completion_rate=float(data["completion_rate"]),
-        average_rpe=float(data["average_rpe"]),
-        readiness_average=float(data["readiness_average"]),
-    )
+async def progress(account_id: str, db: AsyncDB = Depends(get_read_db)) -> FastJSONResponse:
+    return FastJSONResponse(await db.run(compute_progress, account_id))
 
 
 @router.get("/analytics/{account_id}", response_model=AnalyticsOut)
-def analytics(account_id: str, db: Session = Depends(get_db)) -> AnalyticsOut:
-    data = compute_analytics(db, account_id)
-    return AnalyticsOut(**data)
+async def analytics(account_id: str, db: AsyncDB = Depends(get_read_db)) -> FastJSONResponse:
+    """Served from ``analytics_cache``, which is filled only from the primary.
+
+    A replica may not have caught up with the write that invalidated the entry,
+    so replica reads are returned without being cached.
+    """
+    data = cached_analytics(account_id)
+    if data is None:
+        data = await db.run(fill_analytics_cache if db.primary else compute_analytics, account_id)
+    return FastJSONResponse(data)
+
+
+@router.post("/analytics/batch", response_model=AnalyticsBatchOut)
+async def analytics_batch(payload: AnalyticsBatchIn, db: AsyncDB = Depends(get_read_db)) -> FastJSONResponse:
+    account_ids = list(dict.fromkeys(payload.account_ids))
+    data = await db.run(compute_analytics_batch, account_ids)
+    return FastJSONResponse({"results": [{"account_id": account_id, **data[account_id]} for account_id in account_ids]})
+
+
+@router.get("/analytics/{account_id}/load", response_model=LoadSeriesOut)
+async def training_load(
+    account_id: str,
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    db: AsyncDB = Depends(get_read_db),
+) -> FastJSONResponse:
+    end = end or date.today()
+    start = start or end - timedelta(days=27)
+    if start > end:
+        raise HTTPException(status_code=400, detail="from must be before to")
+    if (end - start).days > MAX_LOAD_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail="Date range is too large")
+    points = await db.run(compute_load_series, account_id, start, end)
+    return FastJSONResponse({"account_id": account_id, "points": points})
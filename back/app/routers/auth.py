@@ -2,95 +2,102 @@ from datetime import datetime
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.security import create_token_pair, parse_token
-from app.db.session import get_db
+from app.core.hashing import password_hasher
+from app.core.responses import FastJSONResponse
+from app.core.security import create_token_pair, parse_token_cached
+from app.db.session import AsyncDB, get_async_db
 from app.models import Account
 from app.schemas import AuthResponse, LoginIn, RefreshIn, RegisterIn
-from app.utils import hash_password, verify_password
+from app.services.last_connection import last_connection_buffer
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _find_account_by_mail(db: Session, mail: str) -> Account | None:
+    return db.query(Account).filter(Account.mail == mail).first()
+
+
+def _save_account(db: Session, account: Account) -> None:
+    db.add(account)
+    db.commit()
+
+
+def _record_connection(account: Account) -> datetime:
+    """Buffer the new ``last_connection``; it is written in the background."""
+    now = datetime.utcnow()
+    last_connection_buffer.record(account.id, now)
+    return now
+
+
+def _account_out(account: Account, last_connection: datetime | None) -> dict:
+    return {
+        "id": account.id,
+        "username": account.username,
+        "mail": account.mail,
+        "avatar": account.avatar,
+        "statut_account": account.statut_account,
+        "last_connection": last_connection.isoformat() if last_connection else None,
+    }
+
+
 @router.post("/register", response_model=AuthResponse)
-def register(payload: RegisterIn, db: Session = Depends(get_db)) -> AuthResponse:
+async def register(payload: RegisterIn, db: AsyncDB = Depends(get_async_db)) -> FastJSONResponse:
+    """Statements: 2 (account lookup, INSERT); 1 when the account already exists."""
     normalized_mail = payload.mail.strip().lower()
-    account = db.query(Account).filter(Account.mail == normalized_mail).first()
+    account = await db.run(_find_account_by_mail, normalized_mail)
 
     if account:
-        if not verify_password(payload.password, account.password_hash):
+        if not await password_hasher.verify(payload.password, account.password_hash):
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Account already exists")
-        account.last_connection = datetime.utcnow()
-        db.commit()
-        db.refresh(account)
         pair = create_token_pair(account.id)
-        return AuthResponse(**pair, account={
-            "id": account.id,
-            "username": account.username,
-            "mail": account.mail,
-            "avatar": account.avatar,
-            "statut_account": account.statut_account,
-            "last_connection": account.last_connection.isoformat() if account.last_connection else None,
-        })
+        return FastJSONResponse({**pair, "account": _account_out(account, _record_connection(account))})
 
+    password_hash = await password_hasher.hash(payload.password)
     now = datetime.utcnow()
     account = Account(
         id=str(uuid4()),
         username=payload.username.strip(),
         mail=normalized_mail,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
         avatar=None,
         statut_account="active",
         created_at=now,
         last_connection=now,
     )
-    db.add(account)
-    db.commit()
-    db.refresh(account)
+    await db.run(_save_account, account)
 
     pair = create_token_pair(account.id)
-    return AuthResponse(**pair, account={
-        "id": account.id,
-        "username": account.username,
-        "mail": account.mail,
-        "avatar": account.avatar,
-        "statut_account": account.statut_account,
-        "last_connection": account.last_connection.isoformat() if account.last_connection else None,
-    })
+    return FastJSONResponse({**pair, "account": _account_out(account, account.last_connection)})
 
 
 @router.post("/login", response_model=AuthResponse)
-def login(payload: LoginIn, db: Session = Depends(get_db)) -> AuthResponse:
+async def login(payload: LoginIn, db: AsyncDB = Depends(get_async_db)) -> FastJSONResponse:
+    """Statements: 1 (account lookup); ``last_connection`` is written in the background."""
     normalized_mail = payload.mail.strip().lower()
-    account = db.query(Account).filter(Account.mail == normalized_mail).first()
+    account = await db.run(_find_account_by_mail, normalized_mail)
 
-    if not account or not verify_password(payload.password, account.password_hash):
+    if not account or not await password_hasher.verify(payload.password, account.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    account.last_connection = datetime.utcnow()
-    db.commit()
-    db.refresh(account)
-
     pair = create_token_pair(account.id)
-    return AuthResponse(**pair, account={
-        "id": account.id,
-        "username": account.username,
-        "mail": account.mail,
-        "avatar": account.avatar,
-        "statut_account": account.statut_account,
-        "last_connection": account.last_connection.isoformat() if account.last_connection else None,
-    })
+    return FastJSONResponse({**pair, "account": _account_out(account, _record_connection(account))})
+
+
+def _account_exists(db: Session, account_id: str) -> bool:
+    return db.scalar(select(Account.id).where(Account.id == account_id)) is not None
 
 
 @router.post("/refresh")
-def refresh(payload: RefreshIn, db: Session = Depends(get_db)) -> dict[str, str]:
-    token = parse_token(payload.refreshToken)
+async def refresh(payload: RefreshIn, db: AsyncDB = Depends(get_async_db)) -> dict[str, str]:
+    """Statements: 1 (account existence)."""
+    token = parse_token_cached(payload.refreshToken)
     if not token or token["type"] != "refresh":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
-    account = db.query(Account).filter(Account.id == token["sub"]).first()
-    if not account:
+    if not await db.run(_account_exists, token["sub"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
     return create_token_pair(token["sub"])
@@ -1,63 +1,102 @@
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.models import Injury, UserProfile
+from app.core.responses import FastJSONResponse
+from app.db.session import AsyncDB, get_async_db, get_read_db
+from app.models import Injury
 from app.schemas import InjuryIn, InjuryOut
+from app.services.analytics_service import invalidate_analytics
+from app.services.listing import DEFAULT_PAGE_SIZE, apply_keyset, keyset_page, stream_json_array
+from app.services.profile_service import profile_id_of
 
 router = APIRouter(prefix="/injuries", tags=["injuries"])
 
 
-@router.post("", response_model=InjuryOut)
-def create_injury(payload: InjuryIn, db: Session = Depends(get_db)) -> InjuryOut:
-    profile = db.query(UserProfile).filter(UserProfile.account_id == payload.account_id).first()
-    injury = Injury(
-        id=str(uuid4()),
-        account_id=payload.account_id,
-        profile_id=profile.id if profile else None,
-        muscle_group=payload.muscle_group,
-        pain_level=payload.pain_level,
-        is_active=True,
-        created_at=datetime.utcnow(),
+def _create_injury(db: Session, payload: InjuryIn) -> dict:
+    injury = {
+        "id": str(uuid4()),
+        "muscle_group": payload.muscle_group,
+        "pain_level": payload.pain_level,
+        "is_active": True,
+    }
+    now = datetime.utcnow()
+    db.execute(
+        insert(Injury).values(
+            **injury,
+            account_id=payload.account_id,
+            profile_id=profile_id_of(payload.account_id),
+            created_at=now,
+            updated_at=now,
+        )
     )
-    db.add(injury)
     db.commit()
-    db.refresh(injury)
-    return InjuryOut(
-        id=injury.id,
-        muscle_group=injury.muscle_group,
-        pain_level=injury.pain_level,
-        is_active=injury.is_active,
-    )
+    return injury
+
+
+@router.post("", response_model=InjuryOut)
+async def create_injury(payload: InjuryIn, db: AsyncDB = Depends(get_async_db)) -> FastJSONResponse:
+    """Statements: 1 (INSERT with the profile id as a subquery)."""
+    injury = await db.run(_create_injury, payload)
+    invalidate_analytics(payload.account_id)
+    return FastJSONResponse(injury)
+
+
+INJURY_LISTING_COLUMNS = (Injury.id, Injury.muscle_group, Injury.pain_level, Injury.is_active)
+INJURY_LISTING_FIELDS = tuple(column.key for column in INJURY_LISTING_COLUMNS)
 
 
-@router.get("")
-def list_injuries(account_id: str, db: Session = Depends(get_db)) -> list[InjuryOut]:
-    injuries = (
-        db.query(Injury)
-        .filter(Injury.account_id == account_id)
-        .order_by(Injury.created_at.desc())
-        .all()
+@router.get("", response_model=list[InjuryOut])
+async def list_injuries(
+    account_id: str,
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = None,
+    db: AsyncDB = Depends(get_read_db),
+) -> Response:
+    """Injuries newest first, paged with ``limit``/``cursor`` or streamed in full.
+
+    ``created_at`` is selected last, for the keyset only; it is not listed.
+    """
+    stmt = select(*INJURY_LISTING_COLUMNS, Injury.created_at).where(Injury.account_id == account_id)
+    if start:
+        stmt = stmt.where(Injury.created_at >= datetime.combine(start, time.min))
+    if end:
+        stmt = stmt.where(Injury.created_at < datetime.combine(end + timedelta(days=1), time.min))
+    stmt = apply_keyset(stmt, Injury.created_at, Injury.id, cursor, datetime)
+
+    if limit is None and cursor is None:
+        return stream_json_array(stmt, INJURY_LISTING_FIELDS, db.session_factory)
+    return await db.run(
+        keyset_page,
+        stmt,
+        limit or DEFAULT_PAGE_SIZE,
+        INJURY_LISTING_FIELDS,
+        lambda row: (row.created_at, row.id),
     )
-    return [
-        InjuryOut(
-            id=i.id,
-            muscle_group=i.muscle_group,
-            pain_level=i.pain_level,
-            is_active=i.is_active,
-        )
-        for i in injuries
-    ]
 
 
-@router.patch("/{injury_id}/resolve")
-def resolve_injury(injury_id: str, db: Session = Depends(get_db)) -> dict:
-    injury = db.query(Injury).filter(Injury.id == injury_id).first()
-    if not injury:
+def _resolve_injury(db: Session, injury_id: str) -> str:
+    account_id = db.execute(
+        update(Injury)
+        .where(Injury.id == injury_id)
+        .values(is_active=False, updated_at=datetime.utcnow())
+        .returning(Injury.account_id)
+    ).scalar_one_or_none()
+    if account_id is None:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Injury not found")
-    injury.is_active = False
     db.commit()
-    return {"id": injury.id, "is_active": injury.is_active}
+    return account_id
+
+
+@router.patch("/{injury_id}/resolve")
+async def resolve_injury(injury_id: str, db: AsyncDB = Depends(get_async_db)) -> dict:
+    """Statements: 1 (UPDATE ... RETURNING)."""
+    account_id = await db.run(_resolve_injury, injury_id)
+    invalidate_analytics(account_id)
+    return {"id": injury_id, "is_active": False}
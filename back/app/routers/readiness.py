@@ -1,21 +1,45 @@
+import logging
+from collections.abc import AsyncIterator
 from datetime import date
-from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.models import ReadinessLog, UserProfile, WorkoutSession
-from app.schemas import ReadinessIn, ReadinessOut
-from app.services.adaptation import build_advice, compute_readiness_score, suggest_intensity
+from app.core.responses import FastJSONResponse
+from app.db.session import AsyncDB, get_async_db, get_read_db
+from app.models import ReadinessLog
+from app.schemas import ReadinessBulkIn, ReadinessBulkOut, ReadinessIn, ReadinessOut
+from app.services.adaptation import build_advice, compute_readiness_score
+from app.services.analytics_service import invalidate_analytics
+from app.services.readiness_service import (
+    BULK_CHUNK_SIZE,
+    BULK_MAX_LINE_BYTES,
+    READINESS_FIELDS,
+    ingest_readiness_chunk,
+    store_daily_readiness,
+)
 
 router = APIRouter(prefix="/readiness", tags=["readiness"])
+logger = logging.getLogger("athlia-api")
 
 
-@router.post("", response_model=ReadinessOut)
-def submit_readiness(payload: ReadinessIn, db: Session = Depends(get_db)) -> ReadinessOut:
-    profile = db.query(UserProfile).filter(UserProfile.account_id == payload.account_id).first()
+def _store_today(db: Session, payload: ReadinessIn, score: int, advice: str) -> None:
+    store_daily_readiness(
+        db,
+        payload.account_id,
+        date.today(),
+        payload.model_dump(include=set(READINESS_FIELDS)),
+        score,
+        advice,
+    )
+    db.commit()
 
+
+@router.post("", response_model=ReadinessOut)
+async def submit_readiness(payload: ReadinessIn, db: AsyncDB = Depends(get_async_db)) -> FastJSONResponse:
     score = compute_readiness_score(
         payload.sleep_hours,
         payload.fatigue,
@@ -25,56 +49,125 @@ def submit_readiness(payload: ReadinessIn, db: Session = Depends(get_db)) -> Rea
     )
     advice = build_advice(score, payload.pain_level)
 
-    log = ReadinessLog(
-        id=str(uuid4()),
-        account_id=payload.account_id,
-        profile_id=profile.id if profile else None,
-        log_date=date.today(),
-        sleep_hours=payload.sleep_hours,
-        fatigue=payload.fatigue,
-        stress=payload.stress,
-        soreness=payload.soreness,
-        pain_level=payload.pain_level,
-        readiness_score=score,
-        ai_advice=advice,
-    )
-    db.add(log)
+    await db.run(_store_today, payload, score, advice)
+    invalidate_analytics(payload.account_id)
 
-    today_sessions = (
-        db.query(WorkoutSession)
-        .filter(WorkoutSession.account_id == payload.account_id, WorkoutSession.session_date == date.today())
-        .all()
+    return FastJSONResponse({"readiness_score": score, "ai_advice": advice})
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[tuple[int, bytes | None]]:
+    """Yield ``(line number, line)`` for every non-blank line of the body.
+
+    Only the current line is buffered. One longer than ``BULK_MAX_LINE_BYTES``
+    yields ``None`` and the rest of it is skipped up to the next newline.
+    """
+    buffer = bytearray()
+    too_long = False
+    line_number = 0
+    async for chunk in request.stream():
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            piece = chunk[start:] if end == -1 else chunk[start:end]
+            if not too_long:
+                if len(buffer) + len(piece) > BULK_MAX_LINE_BYTES:
+                    too_long = True
+                    buffer.clear()
+                else:
+                    buffer += piece
+            if end == -1:
+                break
+            line_number += 1
+            if too_long:
+                yield line_number, None
+            elif buffer.strip():
+                yield line_number, bytes(buffer)
+            buffer.clear()
+            too_long = False
+            start = end + 1
+    if too_long:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, bytes(buffer)
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'body'}: {error['msg']}"
+        for error in exc.errors(include_url=False)
     )
-    for session in today_sessions:
-        session.adjusted_intensity = suggest_intensity(
-            session.planned_intensity,
-            score,
-            payload.pain_level,
-        )
 
-    db.commit()
 
-    return ReadinessOut(readiness_score=score, ai_advice=advice)
+def _store_chunk(db: Session, chunk: list[tuple[int, ReadinessBulkIn]]) -> tuple[set[str], list[dict]]:
+    try:
+        return ingest_readiness_chunk(db, chunk)
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception("Bulk readiness chunk failed")
+        return set(), [{"line": line, "error": "Could not be stored"} for line, _ in chunk]
 
 
-@router.get("/latest")
-def latest_readiness(account_id: str, db: Session = Depends(get_db)) -> dict:
-    log = (
-        db.query(ReadinessLog)
-        .filter(ReadinessLog.account_id == account_id)
+@router.post("/bulk", response_model=ReadinessBulkOut)
+async def submit_readiness_bulk(request: Request, db: AsyncDB = Depends(get_async_db)) -> FastJSONResponse:
+    """Ingest newline-delimited JSON readiness records, one ``ReadinessBulkIn`` per line."""
+    received = 0
+    errors: list[dict] = []
+    touched_accounts: set[str] = set()
+    chunk: list[tuple[int, ReadinessBulkIn]] = []
+
+    async def flush() -> None:
+        stored_accounts, chunk_errors = await db.run(_store_chunk, chunk)
+        touched_accounts.update(stored_accounts)
+        errors.extend(chunk_errors)
+        chunk.clear()
+
+    async for line_number, line in _ndjson_lines(request):
+        received += 1
+        if line is None:
+            errors.append({"line": line_number, "error": f"Line exceeds {BULK_MAX_LINE_BYTES} bytes"})
+            continue
+        try:
+            chunk.append((line_number, ReadinessBulkIn.model_validate_json(line)))
+        except ValidationError as exc:
+            errors.append({"line": line_number, "error": _format_validation_error(exc)})
+            continue
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            await flush()
+    if chunk:
+        await flush()
+
+    for account_id in touched_accounts:
+        invalidate_analytics(account_id)
+    errors.sort(key=lambda error: error["line"])
+    return FastJSONResponse({"accepted": received - len(errors), "rejected": len(errors), "errors": errors})
+
+
+LATEST_READINESS_COLUMNS = (
+    ReadinessLog.log_date,
+    ReadinessLog.sleep_hours,
+    ReadinessLog.fatigue,
+    ReadinessLog.stress,
+    ReadinessLog.soreness,
+    ReadinessLog.pain_level,
+    ReadinessLog.readiness_score,
+    ReadinessLog.ai_advice,
+)
+
+
+def _latest_log(db: Session, account_id: str) -> dict | None:
+    row = db.execute(
+        select(*LATEST_READINESS_COLUMNS)
+        .where(ReadinessLog.account_id == account_id)
         .order_by(ReadinessLog.log_date.desc())
-        .first()
-    )
+        .limit(1)
+    ).first()
+    return dict(row._mapping) if row else None
+
+
+@router.get("/latest")
+async def latest_readiness(account_id: str, db: AsyncDB = Depends(get_read_db)) -> dict:
+    log = await db.run(_latest_log, account_id)
     if not log:
         raise HTTPException(status_code=404, detail="No readiness found")
 
-    return {
-        "log_date": log.log_date.isoformat(),
-        "sleep_hours": log.sleep_hours,
-        "fatigue": log.fatigue,
-        "stress": log.stress,
-        "soreness": log.soreness,
-        "pain_level": log.pain_level,
-        "readiness_score": log.readiness_score,
-        "ai_advice": log.ai_advice,
-    }
+    return {**log, "log_date": log["log_date"].isoformat()}
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.core.responses import FastJSONResponse
+from app.core.security import require_account_id
+from app.db.session import AsyncDB, get_async_db
+from app.services.sync_service import collect_changes, decode_sync_cursor
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("")
+async def sync(
+    since: str | None = None,
+    authorization: str | None = Header(default=None),
+    db: AsyncDB = Depends(get_async_db),
+) -> FastJSONResponse:
+    """Sessions, readiness logs, injuries and profile of the token's account changed since ``since``.
+
+    Omit ``since`` for the initial download; pass the returned ``cursor`` next time.
+    """
+    account_id = require_account_id(authorization)
+    try:
+        changed_since = decode_sync_cursor(since) if since else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="since is invalid") from exc
+    return FastJSONResponse(await db.run(collect_changes, account_id, changed_since))
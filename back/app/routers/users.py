@@ -1,88 +1,64 @@
-from datetime import datetime
-from uuid import uuid4
+from datetime import date, datetime
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.core.security import parse_token
-from app.db.session import get_db
-from app.models import Account, UserProfile
-from app.schemas import UserProfileIn
+from app.core.security import require_account_id
+from app.db.session import AsyncDB, get_async_db
+from app.schemas import UserProfileIn, UserProfilePatch
+from app.services.profile_service import PROFILE_FIELDS, upsert_profile
 
 router = APIRouter(tags=["users"])
 
 
-def _require_account_id(authorization: str | None) -> str:
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
-    token = parse_token(authorization.replace("Bearer ", "", 1))
-    if not token or token["type"] != "access":
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return token["sub"]
+def _parse_birthdate(value: str | None) -> date | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="birthdate is invalid") from exc
+
+
+def _save_profile(db: Session, account_id: str, values: dict) -> dict:
+    if "birthdate" in values:
+        values = {**values, "birthdate": _parse_birthdate(values["birthdate"])}
+    result = upsert_profile(db, account_id, values)
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+    profile, created = result
+    return {
+        "id": profile["id"],
+        "id_account": profile["account_id"],
+        **{name: profile[name] for name in PROFILE_FIELDS},
+        "birthdate": profile["birthdate"].isoformat() if profile["birthdate"] else None,
+        "created": created,
+    }
 
 
 @router.post("/users")
-def upsert_user_profile(
+async def upsert_user_profile(
     payload: UserProfileIn,
     authorization: str | None = Header(default=None),
-    db: Session = Depends(get_db),
+    db: AsyncDB = Depends(get_async_db),
 ) -> dict:
-    account_id = _require_account_id(authorization)
+    """Replace every profile field. Statements: 1 (INSERT ... ON CONFLICT)."""
+    account_id = require_account_id(authorization)
     if payload.id_account != account_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    account = db.query(Account).filter(Account.id == account_id).first()
-    if not account:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
-    birthdate = None
-    if payload.birthdate:
-        try:
-            birthdate = datetime.fromisoformat(payload.birthdate.replace("Z", "+00:00")).date()
-        except ValueError as exc:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="birthdate is invalid") from exc
+    return await db.run(_save_profile, account_id, payload.model_dump(include=set(PROFILE_FIELDS)))
 
-    profile = db.query(UserProfile).filter(UserProfile.account_id == account_id).first()
-    created = False
-    if not profile:
-        profile = UserProfile(id=str(uuid4()), account_id=account_id)
-        db.add(profile)
-        created = True
 
-    profile.gender = payload.gender
-    profile.birthdate = birthdate
-    profile.height_cm = payload.height_cm
-    profile.weight_kg = payload.weight_kg
-    profile.training_experience = payload.training_experience
-    profile.sport = payload.sport
-    profile.main_goal = payload.main_goal
-    profile.week_availability = payload.week_availability
-    profile.equipment = payload.equipment
-    profile.health = payload.health
-    profile.sleep = payload.sleep
-    profile.stress = payload.stress
-    profile.load = payload.load
-    profile.recovery = payload.recovery
-
-    db.commit()
-    db.refresh(profile)
+@router.patch("/users/{account_id}")
+async def patch_user_profile(
+    account_id: str,
+    payload: UserProfilePatch,
+    authorization: str | None = Header(default=None),
+    db: AsyncDB = Depends(get_async_db),
+) -> dict:
+    """Write only the fields present in the body. Statements: 1 (INSERT ... ON CONFLICT)."""
+    if require_account_id(authorization) != account_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    return {
-        "id": profile.id,
-        "id_account": profile.account_id,
-        "gender": profile.gender,
-        "birthdate": profile.birthdate.isoformat() if profile.birthdate else None,
-        "height_cm": profile.height_cm,
-        "weight_kg": profile.weight_kg,
-        "training_experience": profile.training_experience,
-        "sport": profile.sport,
-        "main_goal": profile.main_goal,
-        "week_availability": profile.week_availability,
-        "equipment": profile.equipment,
-        "health": profile.health,
-        "sleep": profile.sleep,
-        "stress": profile.stress,
-        "load": profile.load,
-        "recovery": profile.recovery,
-        "created": created,
-    }
+    return await db.run(_save_profile, account_id, payload.model_dump(exclude_unset=True))
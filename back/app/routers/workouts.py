@@ -1,126 +1,212 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.models import Account, Exercise, WorkoutSession
-from app.schemas import GenerateProgramIn, ProgramOut, SessionFeedbackIn, SessionOut
-from app.services.program_service import ensure_seed_exercises, generate_program
+from app.core.responses import FastJSONResponse
+from app.core.security import require_account_id
+from app.db.session import AsyncDB, get_async_db, get_read_db
+from app.models import Account, WorkoutSession
+from app.schemas import (
+    GenerateProgramIn,
+    ProgramOut,
+    SessionCompletionBatchIn,
+    SessionCompletionBatchOut,
+    SessionFeedbackIn,
+    SessionListingOut,
+    SessionOut,
+)
+from app.services.analytics_service import invalidate_analytics
+from app.services.exercise_catalog import get_catalog
+from app.services.listing import DEFAULT_PAGE_SIZE, apply_keyset, keyset_page, stream_json_array
+from app.services.program_service import generate_program
+from app.services.rollups import apply_rollup_delta
+from app.services.session_completion import complete_sessions
 
 router = APIRouter(prefix="/workouts", tags=["workouts"])
 
+PROGRAM_SESSION_FIELDS = tuple(SessionOut.model_fields)
 
-@router.post("/programs/generate", response_model=ProgramOut)
-def create_program(payload: GenerateProgramIn, db: Session = Depends(get_db)) -> ProgramOut:
-    account = db.query(Account).filter(Account.id == payload.account_id).first()
-    if not account:
-        raise HTTPException(status_code=404, detail="Account not found")
 
-    ensure_seed_exercises(db)
-    program = generate_program(db, payload.account_id, payload.goal, payload.week_availability)
-    sessions = (
-        db.query(WorkoutSession)
-        .filter(WorkoutSession.program_id == program.id)
-        .order_by(WorkoutSession.session_date.asc())
-        .all()
+def _create_program(db: Session, payload: GenerateProgramIn) -> tuple[dict, list[dict]]:
+    if db.get(Account, payload.account_id) is None:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return generate_program(
+        db,
+        payload.account_id,
+        payload.goal,
+        payload.week_availability,
+        payload.weeks,
     )
 
-    return ProgramOut(
-        id=program.id,
-        title=program.title,
-        goal=program.goal,
-        sessions=[
-            SessionOut(
-                id=s.id,
-                name=s.name,
-                session_date=s.session_date,
-                planned_duration_min=s.planned_duration_min,
-                planned_intensity=s.planned_intensity,
-                adjusted_intensity=s.adjusted_intensity,
-                status=s.status,
-            )
-            for s in sessions
-        ],
+
+@router.post("/programs/generate", response_model=ProgramOut)
+async def create_program(payload: GenerateProgramIn, db: AsyncDB = Depends(get_async_db)) -> FastJSONResponse:
+    """Statements: 7 (account, profile, active injuries, program, sessions, exercises, rollup).
+
+    6 when the profile is already in ``profile_cache``.
+    """
+    program, sessions = await db.run(_create_program, payload)
+    invalidate_analytics(payload.account_id)
+
+    return FastJSONResponse(
+        {
+            "id": program["id"],
+            "title": program["title"],
+            "goal": program["goal"],
+            "sessions": [{field: session[field] for field in PROGRAM_SESSION_FIELDS} for session in sessions],
+        }
     )
 
 
-@router.get("/sessions/today")
-def get_today_session(account_id: str, db: Session = Depends(get_db)) -> dict:
-    session = (
-        db.query(WorkoutSession)
-        .filter(WorkoutSession.account_id == account_id, WorkoutSession.session_date == date.today())
+def _today_session(db: Session, account_id: str) -> dict | None:
+    row = db.execute(
+        select(
+            WorkoutSession.id,
+            WorkoutSession.name,
+            WorkoutSession.planned_duration_min,
+            WorkoutSession.planned_intensity,
+            WorkoutSession.adjusted_intensity,
+            WorkoutSession.status,
+        )
+        .where(WorkoutSession.account_id == account_id, WorkoutSession.session_date == date.today())
         .order_by(WorkoutSession.id.asc())
-        .first()
-    )
+        .limit(1)
+    ).first()
+    return dict(row._mapping) if row else None
+
+
+@router.get("/sessions/today")
+async def get_today_session(account_id: str, db: AsyncDB = Depends(get_read_db)) -> dict:
+    """Statements: 1."""
+    session = await db.run(_today_session, account_id)
     if not session:
         raise HTTPException(status_code=404, detail="No session for today")
-
-    return {
-        "id": session.id,
-        "name": session.name,
-        "planned_duration_min": session.planned_duration_min,
-        "planned_intensity": session.planned_intensity,
-        "adjusted_intensity": session.adjusted_intensity,
-        "status": session.status,
-    }
+    return session
 
 
-@router.post("/sessions/{session_id}/complete")
-def complete_session(session_id: str, payload: SessionFeedbackIn, db: Session = Depends(get_db)) -> dict:
-    session = db.query(WorkoutSession).filter(WorkoutSession.id == session_id).first()
+def _complete_session(db: Session, session_id: str, payload: SessionFeedbackIn) -> dict:
+    session = db.get(WorkoutSession, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
+    apply_rollup_delta(
+        db,
+        session.account_id,
+        completed_sessions=0 if session.status == "done" else 1,
+        rpe_sum=payload.rpe_reported - (session.rpe_reported or 0),
+        rpe_count=0 if session.rpe_reported is not None else 1,
+    )
     session.status = "done"
     session.rpe_reported = payload.rpe_reported
     session.notes = payload.notes
     db.commit()
-    db.refresh(session)
 
     return {
         "id": session.id,
+        "account_id": session.account_id,
         "status": session.status,
         "rpe_reported": session.rpe_reported,
         "notes": session.notes,
     }
 
 
-@router.get("/sessions")
-def list_sessions(account_id: str, db: Session = Depends(get_db)) -> list[dict]:
-    sessions = (
-        db.query(WorkoutSession)
-        .filter(WorkoutSession.account_id == account_id)
-        .order_by(WorkoutSession.session_date.desc())
-        .all()
+@router.post("/sessions/{session_id}/complete")
+async def complete_session(
+    session_id: str, payload: SessionFeedbackIn, db: AsyncDB = Depends(get_async_db)
+) -> dict:
+    """Statements: 3 (session lookup, rollup upsert, UPDATE)."""
+    session = await db.run(_complete_session, session_id, payload)
+    account_id = session.pop("account_id")
+    invalidate_analytics(account_id)
+    return session
+
+
+@router.post("/sessions/complete/batch", response_model=SessionCompletionBatchOut)
+async def complete_sessions_batch(
+    payload: SessionCompletionBatchIn,
+    authorization: str | None = Header(default=None),
+    db: AsyncDB = Depends(get_async_db),
+) -> FastJSONResponse:
+    """Apply queued offline completions to the token's account; safe to replay.
+
+    Statements: 3 (lookup, UPDATE, rollup upsert); 1 when nothing changed.
+    """
+    account_id = require_account_id(authorization)
+    results = await db.run(complete_sessions, account_id, payload.items)
+    completed = sum(1 for result in results if result["status"] == "completed")
+    if completed:
+        invalidate_analytics(account_id)
+    return FastJSONResponse({"completed": completed, "results": results})
+
+
+SESSION_LISTING_COLUMNS = (
+    WorkoutSession.id,
+    WorkoutSession.name,
+    WorkoutSession.session_date,
+    WorkoutSession.planned_duration_min,
+    WorkoutSession.planned_intensity,
+    WorkoutSession.adjusted_intensity,
+    WorkoutSession.status,
+    WorkoutSession.rpe_reported,
+)
+SESSION_LISTING_FIELDS = tuple(column.key for column in SESSION_LISTING_COLUMNS)
+
+
+@router.get("/sessions", response_model=list[SessionListingOut])
+async def list_sessions(
+    account_id: str,
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = None,
+    db: AsyncDB = Depends(get_read_db),
+) -> Response:
+    """Sessions newest first.
+
+    With ``limit`` (or ``cursor``) a keyset page is returned and the next page's
+    cursor is sent in ``X-Next-Cursor``; otherwise the whole history is streamed.
+    """
+    stmt = select(*SESSION_LISTING_COLUMNS).where(WorkoutSession.account_id == account_id)
+    if start:
+        stmt = stmt.where(WorkoutSession.session_date >= start)
+    if end:
+        stmt = stmt.where(WorkoutSession.session_date <= end)
+    stmt = apply_keyset(stmt, WorkoutSession.session_date, WorkoutSession.id, cursor, date)
+
+    if limit is None and cursor is None:
+        return stream_json_array(stmt, SESSION_LISTING_FIELDS, db.session_factory)
+    return await db.run(
+        keyset_page,
+        stmt,
+        limit or DEFAULT_PAGE_SIZE,
+        SESSION_LISTING_FIELDS,
+        lambda row: (row.session_date, row.id),
     )
-    return [
-        {
-            "id": s.id,
-            "name": s.name,
-            "session_date": s.session_date.isoformat(),
-            "planned_duration_min": s.planned_duration_min,
-            "planned_intensity": s.planned_intensity,
-            "adjusted_intensity": s.adjusted_intensity,
-            "status": s.status,
-            "rpe_reported": s.rpe_reported,
-        }
-        for s in sessions
-    ]
 
 
 @router.get("/exercises")
-def list_exercises(db: Session = Depends(get_db)) -> list[dict]:
-    ensure_seed_exercises(db)
-    exercises = db.query(Exercise).order_by(Exercise.name.asc()).all()
-    return [
-        {
-            "id": ex.id,
-            "name": ex.name,
-            "category": ex.category,
-            "muscle_groups": ex.muscle_groups,
-            "equipment": ex.equipment,
-            "duration_min": ex.duration_min,
-        }
-        for ex in exercises
-    ]
+def list_exercises(
+    category: str | None = None,
+    muscle_group: str | None = None,
+    equipment: str | None = None,
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    catalog = get_catalog()
+    if category or muscle_group or equipment:
+        exercises = catalog.filter(category, muscle_group, equipment)
+        return FastJSONResponse([exercise.as_dict() for exercise in exercises])
+
+    headers = {"ETag": catalog.etag, "Cache-Control": "public, max-age=300"}
+    if if_none_match == catalog.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=catalog.listing_json, media_type="application/json", headers=headers)
+
+
+@router.get("/exercises/{exercise_id}")
+def get_exercise(exercise_id: str) -> dict:
+    exercise = get_catalog().by_id.get(exercise_id)
+    if not exercise:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    return exercise.as_dict()
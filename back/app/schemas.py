@@ -1,4 +1,5 @@
 from datetime import date
+from typing import Literal
 from pydantic import BaseModel, Field
 
 
@@ -32,8 +33,7 @@ class RefreshIn(BaseModel):
     refreshToken: str
 
 
-class UserProfileIn(BaseModel):
-    id_account: str
+class UserProfilePatch(BaseModel):
     gender: str | None = None
     birthdate: str | None = None
     height_cm: int | None = None
@@ -50,10 +50,21 @@ class UserProfileIn(BaseModel):
     recovery: str | None = None
 
 
+class UserProfileIn(UserProfilePatch):
+    id_account: str
+
+
 class GenerateProgramIn(BaseModel):
     account_id: str
     goal: str
     week_availability: int = Field(ge=1, le=7)
+    weeks: int = Field(default=1, ge=1, le=12)
+
+
+class SessionExerciseOut(BaseModel):
+    id: str
+    name: str
+    category: str
 
 
 class SessionOut(BaseModel):
@@ -64,6 +75,18 @@ class SessionOut(BaseModel):
     planned_intensity: int
     adjusted_intensity: int
     status: str
+    exercises: list[SessionExerciseOut] = []
+
+
+class SessionListingOut(BaseModel):
+    id: str
+    name: str
+    session_date: date
+    planned_duration_min: int
+    planned_intensity: int
+    adjusted_intensity: int
+    status: str
+    rpe_reported: int | None
 
 
 class ProgramOut(BaseModel):
@@ -82,6 +105,21 @@ class ReadinessIn(BaseModel):
     pain_level: int = Field(ge=0, le=10)
 
 
+class ReadinessBulkIn(ReadinessIn):
+    log_date: date
+
+
+class ReadinessBulkError(BaseModel):
+    line: int
+    error: str
+
+
+class ReadinessBulkOut(BaseModel):
+    accepted: int
+    rejected: int
+    errors: list[ReadinessBulkError]
+
+
 class ReadinessOut(BaseModel):
     readiness_score: int
     ai_advice: str
@@ -92,6 +130,24 @@ class SessionFeedbackIn(BaseModel):
     notes: str | None = None
 
 
+class SessionCompletionIn(SessionFeedbackIn):
+    session_id: str
+
+
+class SessionCompletionBatchIn(BaseModel):
+    items: list[SessionCompletionIn] = Field(min_length=1, max_length=500)
+
+
+class SessionCompletionResult(BaseModel):
+    session_id: str
+    status: Literal["completed", "unchanged", "superseded", "not_found"]
+
+
+class SessionCompletionBatchOut(BaseModel):
+    completed: int
+    results: list[SessionCompletionResult]
+
+
 class InjuryIn(BaseModel):
     account_id: str
     muscle_group: str
@@ -117,3 +173,33 @@ class AnalyticsOut(BaseModel):
     weekly_sessions_planned: int
     injury_risk_flag: bool
     next_session_intensity: int | None
+
+
+class AnalyticsBatchIn(BaseModel):
+    account_ids: list[str] = Field(min_length=1, max_length=500)
+
+
+class AccountAnalyticsOut(BaseModel):
+    account_id: str
+    analytics: AnalyticsOut
+    progress: ProgressOut
+
+
+class AnalyticsBatchOut(BaseModel):
+    results: list[AccountAnalyticsOut]
+
+
+class LoadPointOut(BaseModel):
+    date: date
+    daily_load: float
+    acute_load: float
+    chronic_load: float
+    acwr: float | None
+    monotony: float | None
+    strain: float | None
+    readiness: float | None
+
+
+class LoadSeriesOut(BaseModel):
+    account_id: str
+    points: list[LoadPointOut]
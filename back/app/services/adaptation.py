@@ -1,3 +1,15 @@
+from collections.abc import Sequence
+
+import numpy as np
+from sqlalchemy import ColumnElement, case
+
+ADVICE_HIGH_PAIN = "Douleur elevee detectee: reduis fortement l'intensite et privilegie mobilite/recuperation."
+ADVICE_EXCELLENT = "Excellente forme du jour: tu peux maintenir ou augmenter legerement la charge."
+ADVICE_CORRECT = "Etat correct: suis la seance planifiee avec un echauffement soigne."
+ADVICE_FATIGUE = "Fatigue perceptible: reduis l'intensite et focalise la technique."
+ADVICE_OVERREACHING = "Risque de surmenage: seance legere conseillee, priorite a la recuperation."
+
+
 def compute_readiness_score(
     sleep_hours: float,
     fatigue: int,
@@ -25,11 +37,59 @@ def suggest_intensity(base_intensity: int, readiness_score: int, pain_level: int
 
 def build_advice(readiness_score: int, pain_level: int) -> str:
     if pain_level >= 7:
-        return "Douleur elevee detectee: reduis fortement l'intensite et privilegie mobilite/recuperation."
+        return ADVICE_HIGH_PAIN
     if readiness_score >= 75:
-        return "Excellente forme du jour: tu peux maintenir ou augmenter legerement la charge."
+        return ADVICE_EXCELLENT
     if readiness_score >= 50:
-        return "Etat correct: suis la seance planifiee avec un echauffement soigne."
+        return ADVICE_CORRECT
     if readiness_score >= 30:
-        return "Fatigue perceptible: reduis l'intensite et focalise la technique."
-    return "Risque de surmenage: seance legere conseillee, priorite a la recuperation."
+        return ADVICE_FATIGUE
+    return ADVICE_OVERREACHING
+
+
+def compute_readiness_scores(
+    sleep_hours: Sequence[float] | np.ndarray,
+    fatigue: Sequence[int] | np.ndarray,
+    stress: Sequence[int] | np.ndarray,
+    soreness: Sequence[int] | np.ndarray,
+    pain_level: Sequence[int] | np.ndarray,
+) -> np.ndarray:
+    """Array version of ``compute_readiness_score``."""
+    sleep_score = np.clip((np.asarray(sleep_hours, dtype=np.float64) / 8.0 * 100).astype(np.int64), 0, 100)
+    strain = (
+        np.asarray(fatigue, dtype=np.int64)
+        + np.asarray(stress, dtype=np.int64)
+        + np.asarray(soreness, dtype=np.int64)
+        + np.asarray(pain_level, dtype=np.int64)
+    )
+    return np.clip(sleep_score - strain * 8 + 40, 0, 100)
+
+
+def build_advice_batch(readiness_scores: np.ndarray, pain_levels: np.ndarray) -> np.ndarray:
+    """Array version of ``build_advice``."""
+    scores = np.asarray(readiness_scores)
+    pain = np.asarray(pain_levels)
+    return np.select(
+        [pain >= 7, scores >= 75, scores >= 50, scores >= 30],
+        [ADVICE_HIGH_PAIN, ADVICE_EXCELLENT, ADVICE_CORRECT, ADVICE_FATIGUE],
+        default=ADVICE_OVERREACHING,
+    )
+
+
+def suggest_intensity_sql(base_intensity, readiness_score, pain_level) -> ColumnElement[int]:
+    """``suggest_intensity`` as a SQL expression over integer columns or subqueries.
+
+    Integer division keeps ``int(x * 0.8)``-style truncation identical on SQLite and
+    PostgreSQL.
+    """
+
+    def at_least_one(value):
+        return case((value < 1, 1), else_=value)
+
+    return case(
+        (pain_level >= 7, at_least_one(base_intensity // 2)),
+        (readiness_score >= 75, case((base_intensity * 11 // 10 > 10, 10), else_=base_intensity * 11 // 10)),
+        (readiness_score >= 50, base_intensity),
+        (readiness_score >= 30, at_least_one(base_intensity * 8 // 10)),
+        else_=at_least_one(base_intensity * 6 // 10),
+    )
@@ -1,41 +1,36 @@
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 
-from sqlalchemy import func
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
-from app.models import ReadinessLog, WorkoutSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import AccountTrainingRollup, ReadinessLog, WorkoutSession
 
+analytics_cache = TTLCache(settings.analytics_cache_size, settings.analytics_cache_ttl_seconds)
 
-def compute_progress(db: Session, account_id: str) -> dict[str, float]:
-    total_sessions = (
-        db.query(func.count(WorkoutSession.id))
-        .filter(WorkoutSession.account_id == account_id)
-        .scalar()
-        or 0
-    )
-    completed_sessions = (
-        db.query(func.count(WorkoutSession.id))
-        .filter(WorkoutSession.account_id == account_id, WorkoutSession.status == "done")
-        .scalar()
-        or 0
-    )
-    average_rpe = (
-        db.query(func.avg(WorkoutSession.rpe_reported))
-        .filter(WorkoutSession.account_id == account_id, WorkoutSession.rpe_reported.is_not(None))
-        .scalar()
-        or 0
-    )
-    readiness_avg = (
-        db.query(func.avg(ReadinessLog.readiness_score))
-        .filter(ReadinessLog.account_id == account_id)
-        .scalar()
-        or 0
-    )
 
-    completion_rate = (completed_sessions / total_sessions * 100.0) if total_sessions else 0.0
+def compute_progress(db: Session, account_id: str) -> dict[str, int | float]:
+    return _progress_from_rollup(db.get(AccountTrainingRollup, account_id))
+
+
+def _progress_from_rollup(rollup: AccountTrainingRollup | None) -> dict[str, int | float]:
+    if rollup is None:
+        return {
+            "completed_sessions": 0,
+            "completion_rate": 0.0,
+            "average_rpe": 0.0,
+            "readiness_average": 0.0,
+        }
+
+    completion_rate = (
+        rollup.completed_sessions / rollup.total_sessions * 100.0 if rollup.total_sessions else 0.0
+    )
+    average_rpe = rollup.rpe_sum / rollup.rpe_count if rollup.rpe_count else 0.0
+    readiness_avg = rollup.readiness_sum / rollup.readiness_count if rollup.readiness_count else 0.0
 
     return {
-        "completed_sessions": float(completed_sessions),
+        "completed_sessions": int(rollup.completed_sessions),
         "completion_rate": round(completion_rate, 2),
         "average_rpe": round(float(average_rpe), 2),
         "readiness_average": round(float(readiness_avg), 2),
@@ -80,7 +75,7 @@ def compute_analytics(db: Session, account_id: str) -> dict[str, int | bool | No
         .first()
     )
 
-    injury_risk = bool(last_readiness and (last_readiness.pain_level >= 7 or last_readiness.readiness_score < 30))
+    injury_risk = bool(last_readiness and _is_injury_risk(last_readiness.pain_level, last_readiness.readiness_score))
 
     return {
         "weekly_sessions_done": int(done),
@@ -88,3 +83,120 @@ def compute_analytics(db: Session, account_id: str) -> dict[str, int | bool | No
         "injury_risk_flag": injury_risk,
         "next_session_intensity": int(next_session.adjusted_intensity) if next_session else None,
     }
+
+
+def _is_injury_risk(pain_level: int, readiness_score: int) -> bool:
+    return pain_level >= 7 or readiness_score < 30
+
+
+def compute_analytics_batch(db: Session, account_ids: list[str]) -> dict[str, dict]:
+    """Analytics and progress for many accounts in a fixed number of grouped queries."""
+    today = date.today()
+    week_start = today - timedelta(days=6)
+    results: dict[str, dict] = {
+        account_id: {
+            "analytics": {
+                "weekly_sessions_done": 0,
+                "weekly_sessions_planned": 0,
+                "injury_risk_flag": False,
+                "next_session_intensity": None,
+            },
+            "progress": _progress_from_rollup(None),
+        }
+        for account_id in account_ids
+    }
+    if not results:
+        return results
+
+    weekly_counts = db.execute(
+        select(
+            WorkoutSession.account_id,
+            func.count(WorkoutSession.id),
+            func.sum(case((WorkoutSession.status == "done", 1), else_=0)),
+        )
+        .where(WorkoutSession.account_id.in_(account_ids), WorkoutSession.session_date >= week_start)
+        .group_by(WorkoutSession.account_id)
+    )
+    for account_id, planned, done in weekly_counts:
+        analytics = results[account_id]["analytics"]
+        analytics["weekly_sessions_planned"] = int(planned)
+        analytics["weekly_sessions_done"] = int(done or 0)
+
+    next_ranked = (
+        select(
+            WorkoutSession.account_id,
+            WorkoutSession.adjusted_intensity,
+            func.row_number()
+            .over(
+                partition_by=WorkoutSession.account_id,
+                order_by=(WorkoutSession.session_date.asc(), WorkoutSession.id.asc()),
+            )
+            .label("rank"),
+        )
+        .where(
+            WorkoutSession.account_id.in_(account_ids),
+            WorkoutSession.session_date >= today,
+            WorkoutSession.status == "planned",
+        )
+        .subquery()
+    )
+    next_sessions = db.execute(
+        select(next_ranked.c.account_id, next_ranked.c.adjusted_intensity).where(next_ranked.c.rank == 1)
+    )
+    for account_id, intensity in next_sessions:
+        results[account_id]["analytics"]["next_session_intensity"] = int(intensity)
+
+    readiness_ranked = (
+        select(
+            ReadinessLog.account_id,
+            ReadinessLog.pain_level,
+            ReadinessLog.readiness_score,
+            func.row_number()
+            .over(
+                partition_by=ReadinessLog.account_id,
+                order_by=(ReadinessLog.log_date.desc(), ReadinessLog.id.desc()),
+            )
+            .label("rank"),
+        )
+        .where(ReadinessLog.account_id.in_(account_ids))
+        .subquery()
+    )
+    last_readiness = db.execute(
+        select(
+            readiness_ranked.c.account_id,
+            readiness_ranked.c.pain_level,
+            readiness_ranked.c.readiness_score,
+        ).where(readiness_ranked.c.rank == 1)
+    )
+    for account_id, pain_level, readiness_score in last_readiness:
+        results[account_id]["analytics"]["injury_risk_flag"] = _is_injury_risk(pain_level, readiness_score)
+
+    rollups = db.scalars(
+        select(AccountTrainingRollup).where(AccountTrainingRollup.account_id.in_(account_ids))
+    )
+    for rollup in rollups:
+        results[rollup.account_id]["progress"] = _progress_from_rollup(rollup)
+
+    return results
+
+
+def cached_analytics(account_id: str) -> dict[str, int | bool | None] | None:
+    """Today's cached analytics for the account, without touching the database."""
+    return analytics_cache.get((account_id, date.today()))
+
+
+def fill_analytics_cache(db: Session, account_id: str) -> dict[str, int | bool | None]:
+    """``compute_analytics``, stored in ``analytics_cache`` until the end of the calendar day.
+
+    Called after a ``cached_analytics`` miss; it does not look the entry up again,
+    so each miss is counted once.
+    """
+    today = date.today()
+    data = compute_analytics(db, account_id)
+    midnight = datetime.combine(today + timedelta(days=1), time.min).timestamp()
+    analytics_cache.put((account_id, today), data, expires_at=midnight)
+    return data
+
+
+def invalidate_analytics(account_id: str) -> None:
+    analytics_cache.invalidate((account_id, date.today()))
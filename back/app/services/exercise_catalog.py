@@ -0,0 +1,250 @@
+"""Read-only exercise catalog held in memory.
+
+The catalog is loaded once at startup (seeding the defaults when they are
+missing) and swapped atomically by ``refresh_catalog``. Bump
+``CATALOG_VERSION`` whenever ``DEFAULT_EXERCISES`` changes so existing
+databases receive the new defaults on the next startup.
+"""
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from hashlib import sha256
+from types import MappingProxyType
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.responses import dumps
+from app.db.session import SessionLocal
+from app.models import CatalogVersion, Exercise
+
+CATALOG_NAME = "exercises"
+CATALOG_VERSION = 1
+
+DEFAULT_EXERCISES = [
+    ("Squat poids du corps", "strength", "legs", "bodyweight", 35),
+    ("Pompes", "strength", "chest", "bodyweight", 30),
+    ("Gainage", "core", "core", "mat", 20),
+    ("Course footing", "cardio", "full_body", "none", 40),
+    ("Mobilite hanches", "mobility", "hips", "mat", 15),
+]
+
+# Equipment tags that do not require the athlete to own anything.
+NO_EQUIPMENT_TAGS = frozenset({"none", "bodyweight"})
+# Exercises tagged with this muscle group load every muscle group.
+FULL_BODY_TAG = "full_body"
+
+
+@dataclass(frozen=True)
+class TagVocabulary:
+    """Maps tags to bit positions; tag sets become rows of ``uint64`` words."""
+
+    bits: Mapping[str, int]
+
+    @property
+    def words(self) -> int:
+        return max(1, -(-len(self.bits) // 64))
+
+    @classmethod
+    def from_tags(cls, tag_sets: Iterable[Iterable[str]]) -> "TagVocabulary":
+        tags = sorted({tag for tag_set in tag_sets for tag in tag_set})
+        return cls(MappingProxyType({tag: bit for bit, tag in enumerate(tags)}))
+
+    def encode(self, tags: Iterable[str]) -> np.ndarray:
+        """Mask of the known ``tags``; unknown tags are ignored."""
+        mask = np.zeros(self.words, dtype=np.uint64)
+        for tag in tags:
+            bit = self.bits.get(tag)
+            if bit is not None:
+                mask[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        return mask
+
+    def encode_many(self, tag_sets: Iterable[Iterable[str]]) -> np.ndarray:
+        rows = [self.encode(tags) for tags in tag_sets]
+        if not rows:
+            return np.zeros((0, self.words), dtype=np.uint64)
+        return np.vstack(rows)
+
+
+@dataclass(frozen=True)
+class CatalogExercise:
+    id: str
+    name: str
+    category: str
+    muscle_groups: tuple[str, ...]
+    equipment: tuple[str, ...]
+    duration_min: int | None
+    raw_muscle_groups: str | None
+    raw_equipment: str | None
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "category": self.category,
+            "muscle_groups": self.raw_muscle_groups,
+            "equipment": self.raw_equipment,
+            "duration_min": self.duration_min,
+        }
+
+
+@dataclass(frozen=True)
+class ExerciseCatalog:
+    version: int
+    exercises: tuple[CatalogExercise, ...]
+    by_id: Mapping[str, CatalogExercise]
+    by_category: Mapping[str, tuple[CatalogExercise, ...]]
+    by_muscle_group: Mapping[str, tuple[CatalogExercise, ...]]
+    by_equipment: Mapping[str, tuple[CatalogExercise, ...]]
+    listing_json: bytes
+    etag: str
+    muscle_vocabulary: TagVocabulary
+    equipment_vocabulary: TagVocabulary
+    # One row per entry of ``exercises``: muscle groups loaded / equipment required.
+    muscle_masks: np.ndarray
+    equipment_masks: np.ndarray
+    categories: tuple[str, ...]
+    category_codes: np.ndarray
+
+    def filter(
+        self,
+        category: str | None = None,
+        muscle_group: str | None = None,
+        equipment: str | None = None,
+    ) -> list[CatalogExercise]:
+        """Exercises matching every given attribute, in name order."""
+        candidates: set[str] | None = None
+        for index, value in (
+            (self.by_category, category),
+            (self.by_muscle_group, muscle_group),
+            (self.by_equipment, equipment),
+        ):
+            if value is None:
+                continue
+            ids = {exercise.id for exercise in index.get(value.strip().lower(), ())}
+            candidates = ids if candidates is None else candidates & ids
+        if candidates is None:
+            return list(self.exercises)
+        return [exercise for exercise in self.exercises if exercise.id in candidates]
+
+
+def _split_tags(value: str | None) -> tuple[str, ...]:
+    if not value:
+        return ()
+    return tuple(tag.strip().lower() for tag in value.split(",") if tag.strip())
+
+
+def _index(exercises: Iterable[CatalogExercise], key) -> Mapping[str, tuple[CatalogExercise, ...]]:
+    index: dict[str, list[CatalogExercise]] = {}
+    for exercise in exercises:
+        for tag in key(exercise):
+            index.setdefault(tag, []).append(exercise)
+    return MappingProxyType({tag: tuple(items) for tag, items in index.items()})
+
+
+def build_catalog(rows: Iterable[Exercise], version: int) -> ExerciseCatalog:
+    exercises = tuple(
+        sorted(
+            (
+                CatalogExercise(
+                    id=row.id,
+                    name=row.name,
+                    category=row.category,
+                    muscle_groups=_split_tags(row.muscle_groups),
+                    equipment=_split_tags(row.equipment),
+                    duration_min=row.duration_min,
+                    raw_muscle_groups=row.muscle_groups,
+                    raw_equipment=row.equipment,
+                )
+                for row in rows
+            ),
+            key=lambda exercise: exercise.name,
+        )
+    )
+    muscle_vocabulary = TagVocabulary.from_tags(
+        [tag for tag in exercise.muscle_groups if tag != FULL_BODY_TAG] for exercise in exercises
+    )
+    required_equipment = [
+        [tag for tag in exercise.equipment if tag not in NO_EQUIPMENT_TAGS] for exercise in exercises
+    ]
+    equipment_vocabulary = TagVocabulary.from_tags(required_equipment)
+    muscle_masks = muscle_vocabulary.encode_many(
+        muscle_vocabulary.bits if FULL_BODY_TAG in exercise.muscle_groups else exercise.muscle_groups
+        for exercise in exercises
+    )
+
+    categories = tuple(sorted({exercise.category for exercise in exercises}))
+    category_code = {category: code for code, category in enumerate(categories)}
+
+    listing_json = dumps([exercise.as_dict() for exercise in exercises])
+    return ExerciseCatalog(
+        version=version,
+        exercises=exercises,
+        by_id=MappingProxyType({exercise.id: exercise for exercise in exercises}),
+        by_category=_index(exercises, lambda exercise: (exercise.category.lower(),)),
+        by_muscle_group=_index(exercises, lambda exercise: exercise.muscle_groups),
+        by_equipment=_index(exercises, lambda exercise: exercise.equipment),
+        listing_json=listing_json,
+        etag=f'"{version}-{sha256(listing_json).hexdigest()[:16]}"',
+        muscle_vocabulary=muscle_vocabulary,
+        equipment_vocabulary=equipment_vocabulary,
+        muscle_masks=muscle_masks,
+        equipment_masks=equipment_vocabulary.encode_many(required_equipment),
+        categories=categories,
+        category_codes=np.array([category_code[exercise.category] for exercise in exercises], dtype=np.int64),
+    )
+
+
+def seed_missing_exercises(db: Session) -> int:
+    """Insert default exercises absent from the table when the stored version is behind."""
+    stored = db.get(CatalogVersion, CATALOG_NAME)
+    if stored is not None and stored.version >= CATALOG_VERSION:
+        return 0
+
+    existing = set(db.scalars(select(Exercise.name)))
+    added = 0
+    for name, category, muscle_groups, equipment, duration in DEFAULT_EXERCISES:
+        if name in existing:
+            continue
+        db.add(
+            Exercise(
+                id=str(uuid4()),
+                name=name,
+                category=category,
+                muscle_groups=muscle_groups,
+                equipment=equipment,
+                duration_min=duration,
+            )
+        )
+        added += 1
+    if stored is None:
+        db.add(CatalogVersion(name=CATALOG_NAME, version=CATALOG_VERSION))
+    else:
+        stored.version = CATALOG_VERSION
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker seeded the same version concurrently.
+        db.rollback()
+        return 0
+    return added
+
+
+_catalog: ExerciseCatalog | None = None
+
+
+def refresh_catalog(db: Session) -> ExerciseCatalog:
+    """Seed if needed, then reload the catalog from the database and publish it."""
+    global _catalog
+    seed_missing_exercises(db)
+    _catalog = build_catalog(db.scalars(select(Exercise)), CATALOG_VERSION)
+    return _catalog
+
+
+def get_catalog() -> ExerciseCatalog:
+    if _catalog is None:
+        with SessionLocal() as db:
+            return refresh_catalog(db)
+    return _catalog
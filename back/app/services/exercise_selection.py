@@ -0,0 +1,75 @@
+"""Pick catalog exercises an athlete can do: owned equipment, no injured muscle group.
+
+Eligibility for the whole catalog is computed with bitwise AND over the
+catalog's ``uint64`` mask matrices, so it stays cheap for large catalogs.
+"""
+import numpy as np
+
+from app.services.exercise_catalog import CatalogExercise, ExerciseCatalog
+
+EXERCISES_PER_SESSION = 4
+
+GOAL_CATEGORY_PRIORITY = {
+    "muscle": ("strength", "core", "mobility", "cardio"),
+    "performance": ("strength", "cardio", "core", "mobility"),
+    "endurance": ("cardio", "mobility", "core", "strength"),
+}
+DEFAULT_CATEGORY_PRIORITY = ("strength", "cardio", "core", "mobility")
+
+
+def parse_equipment(value: str | None) -> list[str] | None:
+    """Profile equipment as tags; ``None`` when the athlete never filled it in."""
+    if value is None:
+        return None
+    return [tag.strip().lower() for tag in value.split(",") if tag.strip()]
+
+
+def eligible_exercises(
+    catalog: ExerciseCatalog,
+    equipment: list[str] | None,
+    injured_muscle_groups: list[str],
+) -> np.ndarray:
+    """Boolean array over ``catalog.exercises``.
+
+    ``equipment=None`` skips the equipment check (unknown inventory).
+    """
+    eligible = np.ones(len(catalog.exercises), dtype=bool)
+    if equipment is not None:
+        owned = catalog.equipment_vocabulary.encode(equipment)
+        eligible &= ~(catalog.equipment_masks & ~owned).any(axis=1)
+    if injured_muscle_groups:
+        injured = catalog.muscle_vocabulary.encode(tag.strip().lower() for tag in injured_muscle_groups)
+        eligible &= ~(catalog.muscle_masks & injured).any(axis=1)
+    return eligible
+
+
+def assign_exercises(
+    catalog: ExerciseCatalog,
+    eligible: np.ndarray,
+    goal: str,
+    session_count: int,
+    per_session: int = EXERCISES_PER_SESSION,
+) -> list[list[CatalogExercise]]:
+    """Give each session a window of eligible exercises, rotating through the pool.
+
+    The pool is ordered by the goal's category priority so the first sessions
+    lead with the most relevant work; later sessions slide further along it.
+    """
+    candidates = np.flatnonzero(eligible)
+    if len(candidates) == 0 or session_count == 0:
+        return [[] for _ in range(session_count)]
+
+    priority = GOAL_CATEGORY_PRIORITY.get(goal.lower(), DEFAULT_CATEGORY_PRIORITY)
+    rank = {category: position for position, category in enumerate(priority)}
+    rank_by_code = np.array([rank.get(category, len(priority)) for category in catalog.categories], dtype=np.int64)
+    category_rank = rank_by_code[catalog.category_codes[candidates]]
+    # Interleave categories: 1st of each category, then 2nd of each, ...
+    order = np.lexsort((candidates, category_rank))
+    ordered_ranks = category_rank[order]
+    occurrence = np.arange(len(order)) - np.searchsorted(ordered_ranks, ordered_ranks)
+    pool = candidates[order][np.lexsort((ordered_ranks, occurrence))]
+
+    per_session = min(per_session, len(pool))
+    slots = (np.arange(session_count)[:, None] * per_session + np.arange(per_session)[None, :]) % len(pool)
+    picks = pool[slots]
+    return [[catalog.exercises[i] for i in row] for row in picks.tolist()]
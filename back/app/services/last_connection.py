@@ -0,0 +1,80 @@
+"""Buffered ``accounts.last_connection`` writes.
+
+Logins only record the timestamp in memory; a background task in ``app.main``
+writes the pending values every ``LAST_CONNECTION_FLUSH_SECONDS`` with one
+batched UPDATE, and once more on shutdown. A crash loses at most one interval
+of timestamps, which only feed "last seen" displays.
+"""
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import bindparam, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models import Account
+
+logger = logging.getLogger("athlia-api")
+
+
+class LastConnectionBuffer:
+    """Latest connection time per account, waiting to be written."""
+
+    def __init__(self) -> None:
+        self._pending: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, account_id: str, at: datetime) -> None:
+        with self._lock:
+            if account_id not in self._pending or self._pending[account_id] < at:
+                self._pending[account_id] = at
+
+    def clear(self) -> None:
+        self._drain()
+
+    def _drain(self) -> dict[str, datetime]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def flush(self, db: Session) -> int:
+        """Write every pending timestamp with one executemany UPDATE and commit."""
+        pending = self._drain()
+        if not pending:
+            return 0
+        table = Account.__table__
+        stmt = (
+            table.update()
+            .where(
+                table.c.id == bindparam("account_id"),
+                # Never move a newer value (written by another worker) backwards.
+                or_(table.c.last_connection.is_(None), table.c.last_connection < bindparam("at")),
+            )
+            .values(last_connection=bindparam("at"))
+        )
+        try:
+            db.execute(stmt, [{"account_id": account_id, "at": at} for account_id, at in pending.items()])
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            for account_id, at in pending.items():
+                self.record(account_id, at)
+            raise
+        return len(pending)
+
+
+last_connection_buffer = LastConnectionBuffer()
+
+
+def flush_last_connections() -> int:
+    with SessionLocal() as db:
+        try:
+            return last_connection_buffer.flush(db)
+        except SQLAlchemyError:
+            logger.exception("Could not write buffered last_connection values")
+            return 0
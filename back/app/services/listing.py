@@ -0,0 +1,95 @@
+"""Keyset pagination and streamed JSON arrays for per-account history listings.
+
+Rows are written straight from the query's tuples: each becomes an object of
+the leading ``fields``, so no model is built per row.
+"""
+import base64
+import json
+from collections.abc import Callable, Iterator, Sequence
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import ColumnElement, Select, tuple_
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.responses import FastJSONResponse, dumps
+from app.db.session import SessionLocal
+
+DEFAULT_PAGE_SIZE = 50
+STREAM_BATCH_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: date | datetime, row_id: str) -> str:
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_type: type[date] | type[datetime]) -> tuple[date | datetime, str]:
+    try:
+        padded = cursor + "=" * ((4 - len(cursor) % 4) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("utf-8")))
+        return sort_type.fromisoformat(sort_value), str(row_id)
+    except (ValueError, TypeError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cursor is invalid") from exc
+
+
+def apply_keyset(
+    stmt: Select,
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    cursor: str | None,
+    sort_type: type[date] | type[datetime],
+) -> Select:
+    """Order newest first on (sort, id) and start strictly after ``cursor``."""
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_type)
+        stmt = stmt.where(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+    return stmt.order_by(sort_column.desc(), id_column.desc())
+
+
+def _objects(fields: Sequence[str], rows: Sequence[Any]) -> list[dict]:
+    # ``zip`` stops at the shorter side: trailing columns (sort keys) are left out.
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def keyset_page(
+    db: Session,
+    stmt: Select,
+    limit: int,
+    fields: Sequence[str],
+    cursor_of: Callable[[Any], tuple[date | datetime, str]],
+) -> FastJSONResponse:
+    """One page as a JSON array; ``X-Next-Cursor`` is set when more rows follow."""
+    rows = db.execute(stmt.limit(limit + 1)).all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(*cursor_of(rows[-1]))
+    return FastJSONResponse(_objects(fields, rows), headers=headers)
+
+
+def stream_json_array(
+    stmt: Select,
+    fields: Sequence[str],
+    session_factory: sessionmaker[Session] = SessionLocal,
+) -> StreamingResponse:
+    """Stream every row of ``stmt`` as one JSON array, ``STREAM_BATCH_SIZE`` rows at a time.
+
+    The query runs on its own session with a server-side cursor (where the
+    driver supports one), so memory stays flat however long the history is.
+    """
+
+    def generate() -> Iterator[bytes]:
+        with session_factory() as db:
+            result = db.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+            separator = b"["
+            for partition in result.partitions():
+                # Strip the partition array's brackets to splice it into the stream.
+                yield separator + dumps(_objects(fields, partition))[1:-1]
+                separator = b","
+            yield b"[]" if separator == b"[" else b"]"
+
+    return StreamingResponse(generate(), media_type="application/json")
@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import Float, cast, null, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models import ReadinessLog, WorkoutSession
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+# Variances below this fraction of the window's mean square are rounding noise.
+VARIANCE_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class TrainingHistory:
+    """Columnar history: one entry per done session and one per readiness log."""
+
+    session_days: np.ndarray
+    session_loads: np.ndarray
+    readiness_days: np.ndarray
+    readiness_scores: np.ndarray
+
+
+def load_training_history(db: Session, account_id: str, start: date, end: date) -> TrainingHistory:
+    """Fetch session loads (duration x RPE) and readiness scores in ``[start, end]`` in one query."""
+    sessions = select(
+        WorkoutSession.session_date.label("day"),
+        cast(WorkoutSession.planned_duration_min * WorkoutSession.rpe_reported, Float).label("load"),
+        cast(null(), Float).label("readiness"),
+    ).where(
+        WorkoutSession.account_id == account_id,
+        WorkoutSession.status == "done",
+        WorkoutSession.rpe_reported.is_not(None),
+        WorkoutSession.session_date.between(start, end),
+    )
+    readiness = select(
+        ReadinessLog.log_date.label("day"),
+        cast(null(), Float).label("load"),
+        cast(ReadinessLog.readiness_score, Float).label("readiness"),
+    ).where(
+        ReadinessLog.account_id == account_id,
+        ReadinessLog.log_date.between(start, end),
+    )
+    rows = db.execute(union_all(sessions, readiness)).all()
+
+    if rows:
+        day_column, load_column, score_column = zip(*rows)
+        days = (np.array(day_column, dtype="datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+        loads = np.array(load_column, dtype=np.float64)
+        scores = np.array(score_column, dtype=np.float64)
+    else:
+        days = np.empty(0, dtype=np.int64)
+        loads = scores = np.empty(0)
+    is_session = ~np.isnan(loads)
+    is_readiness = ~np.isnan(scores)
+    return TrainingHistory(
+        session_days=days[is_session],
+        session_loads=loads[is_session],
+        readiness_days=days[is_readiness],
+        readiness_scores=scores[is_readiness],
+    )
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    upper = np.arange(1, len(values) + 1)
+    return cumulative[upper] - cumulative[np.maximum(upper - window, 0)]
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    mean = _rolling_sum(values, window) / window
+    mean_of_squares = _rolling_sum(values * values, window) / window
+    variance = mean_of_squares - mean * mean
+    # The cumulative-sum differences cancel badly: constant non-integer loads
+    # leave a tiny positive variance instead of 0, and monotony explodes.
+    variance[variance <= VARIANCE_EPSILON * mean_of_squares] = 0.0
+    return np.sqrt(variance)
+
+
+def compute_load_metrics(history: TrainingHistory, days: int) -> dict[str, np.ndarray]:
+    """Daily load, 7/28-day rolling loads, ACWR, monotony and strain over ``days`` days.
+
+    ``history`` day offsets are relative to the first day of the array. Ratios are
+    NaN where they are undefined (no chronic load, or no load variation).
+    """
+    daily_load = np.bincount(history.session_days, weights=history.session_loads, minlength=days)[:days]
+    acute = _rolling_sum(daily_load, ACUTE_DAYS)
+    chronic = _rolling_sum(daily_load, CHRONIC_DAYS) / (CHRONIC_DAYS / ACUTE_DAYS)
+    std = _rolling_std(daily_load, ACUTE_DAYS)
+
+    readiness_total = np.bincount(history.readiness_days, weights=history.readiness_scores, minlength=days)[:days]
+    readiness_count = np.bincount(history.readiness_days, minlength=days)[:days]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acwr = np.where(chronic > 0, acute / chronic, np.nan)
+        monotony = np.where(std > 0, (acute / ACUTE_DAYS) / std, np.nan)
+        readiness = np.where(readiness_count > 0, readiness_total / readiness_count, np.nan)
+    return {
+        "daily_load": daily_load,
+        "acute_load": acute,
+        "chronic_load": chronic,
+        "acwr": acwr,
+        "monotony": monotony,
+        "strain": acute * monotony,
+        "readiness": readiness,
+    }
+
+
+def compute_load_series(db: Session, account_id: str, start: date, end: date) -> list[dict]:
+    history_start = start - timedelta(days=CHRONIC_DAYS - 1)
+    history = load_training_history(db, account_id, history_start, end)
+    metrics = compute_load_metrics(history, (end - history_start).days + 1)
+
+    offset = (start - history_start).days
+    columns = {name: np.round(values[offset:], 2).tolist() for name, values in metrics.items()}
+    dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return [
+        {"date": day, **{name: (None if value != value else value) for name, value in zip(columns, row)}}
+        for day, *row in zip(dates, *columns.values())
+    ]
@@ -0,0 +1,89 @@
+"""Profile upserts and the in-process profile cache.
+
+``upsert_profile`` writes a profile in one ``INSERT ... ON CONFLICT`` statement
+and stores the returned row in ``profile_cache``. Readers that only need a
+profile attribute go through ``cached_profile``. A profile's id never
+changes once created, so ``profile_id_of`` can always use a cached id. Other
+attributes written by a different worker can be up to
+``PROFILE_CACHE_TTL_SECONDS`` stale.
+"""
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import dialect_insert
+from app.models import Account, UserProfile
+
+PROFILE_FIELDS = (
+    "gender",
+    "birthdate",
+    "height_cm",
+    "weight_kg",
+    "training_experience",
+    "sport",
+    "main_goal",
+    "week_availability",
+    "equipment",
+    "health",
+    "sleep",
+    "stress",
+    "load",
+    "recovery",
+)
+
+profile_cache = TTLCache(settings.profile_cache_size, settings.profile_cache_ttl_seconds)
+
+
+def upsert_profile(db: Session, account_id: str, values: dict[str, Any]) -> tuple[dict, bool] | None:
+    """Create the profile or update only the ``values`` given, in one statement.
+
+    Returns the stored row and whether it was created, or ``None`` when the
+    account does not exist: ``account_id`` is read through a subquery, so a
+    missing account violates its NOT NULL constraint.
+    """
+    table = UserProfile.__table__
+    new_id = str(uuid4())
+    stmt = dialect_insert(db)(table).values(
+        id=new_id,
+        account_id=select(Account.id).where(Account.id == account_id).scalar_subquery(),
+        **values,
+        updated_at=datetime.utcnow(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.account_id],
+        set_={name: stmt.excluded[name] for name in (*values, "updated_at")},
+    ).returning(*table.c)
+    try:
+        profile = dict(db.execute(stmt).mappings().one())
+    except IntegrityError:
+        db.rollback()
+        return None
+    db.commit()
+    profile_cache.put(account_id, profile)
+    return profile, profile["id"] == new_id
+
+
+def cached_profile(db: Session, account_id: str) -> dict | None:
+    """The account's profile row, from ``profile_cache`` when possible."""
+    profile = profile_cache.get(account_id)
+    if profile is None:
+        row = db.execute(select(*UserProfile.__table__.c).where(UserProfile.account_id == account_id)).mappings().first()
+        if row is None:
+            return None
+        profile = dict(row)
+        profile_cache.put(account_id, profile)
+    return profile
+
+
+def profile_id_of(account_id: str) -> str | ColumnElement[str]:
+    """The cached profile id, or a scalar subquery to resolve it in the same statement."""
+    profile = profile_cache.get(account_id)
+    if profile is not None:
+        return profile["id"]
+    return select(UserProfile.id).where(UserProfile.account_id == account_id).scalar_subquery()
@@ -1,35 +1,34 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from uuid import uuid4
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
-from app.models import Exercise, WorkoutProgram, WorkoutSession
-
-
-DEFAULT_EXERCISES = [
-    ("Squat poids du corps", "strength", "legs", "bodyweight", 35),
-    ("Pompes", "strength", "chest", "bodyweight", 30),
-    ("Gainage", "core", "core", "mat", 20),
-    ("Course footing", "cardio", "full_body", "none", 40),
-    ("Mobilite hanches", "mobility", "hips", "mat", 15),
-]
-
-
-def ensure_seed_exercises(db: Session) -> None:
-    if db.query(Exercise).count() > 0:
-        return
-    for name, category, muscle_groups, equipment, duration in DEFAULT_EXERCISES:
-        db.add(
-            Exercise(
-                id=str(uuid4()),
-                name=name,
-                category=category,
-                muscle_groups=muscle_groups,
-                equipment=equipment,
-                duration_min=duration,
-            )
-        )
-    db.commit()
+from app.models import Injury, SessionExercise, WorkoutProgram, WorkoutSession
+from app.services.exercise_catalog import get_catalog
+from app.services.exercise_selection import assign_exercises, eligible_exercises, parse_equipment
+from app.services.profile_service import cached_profile
+from app.services.rollups import apply_rollup_delta
+
+
+DELOAD_EVERY_WEEKS = 4
+
+
+def plan_training_offsets(week_availability: int) -> list[int]:
+    """Day offsets within a week, spread as evenly as possible (3 -> 0, 2, 5)."""
+    return sorted({round(i * 7 / week_availability) for i in range(week_availability)})
+
+
+def plan_week(base_intensity: int, base_duration: int, week_index: int) -> tuple[int, int, bool]:
+    """Intensity, duration and deload flag for a week of the mesocycle.
+
+    Loading weeks ramp intensity by one point per week of the block; every
+    ``DELOAD_EVERY_WEEKS``-th week drops intensity and volume to recover.
+    """
+    week_in_block = week_index % DELOAD_EVERY_WEEKS
+    if week_in_block == DELOAD_EVERY_WEEKS - 1:
+        return max(1, base_intensity - 2), int(base_duration * 0.7), True
+    return min(10, base_intensity + week_in_block), base_duration, False
 
 
 def generate_program(
@@ -37,39 +36,73 @@ def generate_program(
     account_id: str,
     goal: str,
     week_availability: int,
-) -> WorkoutProgram:
-    program = WorkoutProgram(
-        id=str(uuid4()),
-        account_id=account_id,
-        title=f"Plan {goal.title()} {week_availability}j/semaine",
-        goal=goal,
-        created_at=date.today(),
-        active=True,
-    )
-    db.add(program)
-    db.flush()
+    weeks: int = 1,
+) -> tuple[dict, list[dict]]:
+    """Plan a ``weeks``-long mesocycle and insert it; returns the program and session rows.
+
+    Each session row carries an ``exercises`` list picked from the catalog
+    according to the athlete's equipment and active injuries.
+    """
+    title = f"Plan {goal.title()} {week_availability}j/semaine"
+    if weeks > 1:
+        title += f" - {weeks} semaines"
+    program = {
+        "id": str(uuid4()),
+        "account_id": account_id,
+        "title": title,
+        "goal": goal,
+        "created_at": datetime.utcnow(),
+        "active": True,
+    }
 
     base_intensity = 6 if goal.lower() in {"performance", "muscle"} else 5
     base_duration = 45 if goal.lower() in {"endurance", "performance"} else 35
 
-    for i in range(week_availability):
-        workout_date = date.today() + timedelta(days=i)
-        db.add(
-            WorkoutSession(
-                id=str(uuid4()),
-                program_id=program.id,
-                account_id=account_id,
-                name=f"Seance {i + 1} - {goal.title()}",
-                session_date=workout_date,
-                planned_duration_min=base_duration,
-                planned_intensity=base_intensity,
-                adjusted_intensity=base_intensity,
-                status="planned",
-                rpe_reported=None,
-                notes=None,
+    start = date.today()
+    offsets = plan_training_offsets(week_availability)
+    sessions: list[dict] = []
+    for week_index in range(weeks):
+        intensity, duration, deload = plan_week(base_intensity, base_duration, week_index)
+        for offset in offsets:
+            name = f"Seance {len(sessions) + 1} - {goal.title()}"
+            sessions.append(
+                {
+                    "id": str(uuid4()),
+                    "program_id": program["id"],
+                    "account_id": account_id,
+                    "name": f"{name} (decharge)" if deload else name,
+                    "session_date": start + timedelta(days=week_index * 7 + offset),
+                    "planned_duration_min": duration,
+                    "planned_intensity": intensity,
+                    "adjusted_intensity": intensity,
+                    "status": "planned",
+                    "rpe_reported": None,
+                    "notes": None,
+                }
             )
-        )
 
+    catalog = get_catalog()
+    profile = cached_profile(db, account_id)
+    equipment = parse_equipment(profile["equipment"] if profile else None)
+    # Bare ``is_active`` (not ``IS true``) so the partial index on active injuries applies.
+    injured = list(db.scalars(select(Injury.muscle_group).where(Injury.account_id == account_id, Injury.is_active)))
+    eligible = eligible_exercises(catalog, equipment, injured)
+    picks = assign_exercises(catalog, eligible, goal, len(sessions))
+    session_exercises = [
+        {"session_id": session["id"], "position": position, "exercise_id": exercise.id}
+        for session, exercises in zip(sessions, picks)
+        for position, exercise in enumerate(exercises)
+    ]
+
+    db.execute(insert(WorkoutProgram), program)
+    db.execute(insert(WorkoutSession.__table__), sessions)
+    if session_exercises:
+        db.execute(insert(SessionExercise.__table__), session_exercises)
+    apply_rollup_delta(db, account_id, total_sessions=len(sessions))
     db.commit()
-    db.refresh(program)
-    return program
+
+    for session, exercises in zip(sessions, picks):
+        session["exercises"] = [
+            {"id": exercise.id, "name": exercise.name, "category": exercise.category} for exercise in exercises
+        ]
+    return program, sessions
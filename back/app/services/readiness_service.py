@@ -0,0 +1,207 @@
+from datetime import date
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import and_, case, func, literal_column, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.db.session import dialect_insert
+from app.models import Account, ReadinessLog, UserProfile, WorkoutSession
+from app.schemas import ReadinessBulkIn
+from app.services.adaptation import build_advice_batch, compute_readiness_scores, suggest_intensity_sql
+from app.services.profile_service import profile_id_of
+from app.services.rollups import apply_rollup_delta, apply_rollup_deltas
+
+BULK_CHUNK_SIZE = 500
+# A readiness record is well under 1 KiB; longer NDJSON lines are rejected unbuffered.
+BULK_MAX_LINE_BYTES = 4096
+READINESS_FIELDS = ("sleep_hours", "fatigue", "stress", "soreness", "pain_level")
+UPSERT_FIELDS = ("profile_id", *READINESS_FIELDS, "readiness_score", "ai_advice", "updated_at")
+
+
+def _upsert_readiness_logs(db: Session, rows: list[dict]) -> None:
+    """Insert logs, replacing the existing log of the same (account, day)."""
+    table = ReadinessLog.__table__
+    stmt = dialect_insert(db)(table).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.account_id, table.c.log_date],
+            set_={name: stmt.excluded[name] for name in UPSERT_FIELDS},
+        )
+    )
+
+
+def _matches_keys(account_column, day_column, keys: list[tuple[str, date]]):
+    """``(account, day) IN keys``, plus per-column INs so the (account_id, day) index is searched.
+
+    Row-value IN alone is evaluated as a filter over a full scan on SQLite.
+    """
+    accounts = sorted({account_id for account_id, _ in keys})
+    days = sorted({day for _, day in keys})
+    return and_(account_column.in_(accounts), day_column.in_(days), tuple_(account_column, day_column).in_(keys))
+
+
+def store_daily_readiness(
+    db: Session,
+    account_id: str,
+    log_date: date,
+    values: dict[str, float | int],
+    readiness_score: int,
+    ai_advice: str,
+) -> None:
+    """Upsert the day's readiness log and re-plan that day's sessions, without reading rows back.
+
+    Issues three statements whatever the number of sessions: the rollup counter
+    upsert (which diffs against the log being replaced), the log upsert and one
+    UPDATE computing ``adjusted_intensity`` in SQL. The caller commits.
+    """
+    previous_score = (
+        select(ReadinessLog.readiness_score)
+        .where(ReadinessLog.account_id == account_id, ReadinessLog.log_date == log_date)
+        .scalar_subquery()
+    )
+    apply_rollup_delta(
+        db,
+        account_id,
+        readiness_sum=readiness_score - func.coalesce(previous_score, 0),
+        readiness_count=case((previous_score.is_(None), 1), else_=0),
+    )
+    _upsert_readiness_logs(
+        db,
+        [
+            {
+                "id": str(uuid4()),
+                "account_id": account_id,
+                "profile_id": profile_id_of(account_id),
+                "log_date": log_date,
+                **values,
+                "readiness_score": readiness_score,
+                "ai_advice": ai_advice,
+            }
+        ],
+    )
+    db.execute(
+        update(WorkoutSession)
+        .where(WorkoutSession.account_id == account_id, WorkoutSession.session_date == log_date)
+        .values(
+            adjusted_intensity=suggest_intensity_sql(
+                WorkoutSession.planned_intensity,
+                readiness_score,
+                values["pain_level"],
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def ingest_readiness_chunk(
+    db: Session,
+    records: list[tuple[int, ReadinessBulkIn]],
+) -> tuple[set[str], list[dict]]:
+    """Score and upsert one chunk of bulk readiness records, then commit.
+
+    Returns the accounts that received data and per-line errors for the records
+    that were rejected. Sessions on the same day as a stored log get their
+    ``adjusted_intensity`` recomputed in a single UPDATE.
+    """
+    account_ids = {record.account_id for _, record in records}
+    profiles = dict(
+        db.execute(
+            select(Account.id, UserProfile.id)
+            .outerjoin(UserProfile, UserProfile.account_id == Account.id)
+            .where(Account.id.in_(account_ids))
+        ).all()
+    )
+
+    errors: list[dict] = []
+    valid: list[ReadinessBulkIn] = []
+    today = date.today()
+    for line, record in records:
+        if record.account_id not in profiles:
+            errors.append({"line": line, "error": "Unknown account"})
+        elif record.log_date > today:
+            errors.append({"line": line, "error": "log_date is in the future"})
+        else:
+            valid.append(record)
+    if not valid:
+        return set(), errors
+
+    # One log per (account, day): the last record of the chunk wins.
+    latest = list({(record.account_id, record.log_date): record for record in valid}.values())
+    columns = {name: np.array([getattr(record, name) for record in latest]) for name in READINESS_FIELDS}
+    scores = compute_readiness_scores(**columns)
+    advice = build_advice_batch(scores, columns["pain_level"])
+
+    keys = [(record.account_id, record.log_date) for record in latest]
+    previous = {
+        (account_id, log_date): score
+        for account_id, log_date, score in db.execute(
+            select(ReadinessLog.account_id, ReadinessLog.log_date, ReadinessLog.readiness_score).where(
+                _matches_keys(ReadinessLog.account_id, ReadinessLog.log_date, keys)
+            )
+        )
+    }
+
+    rows = [
+        {
+            "id": str(uuid4()),
+            "account_id": record.account_id,
+            "profile_id": profiles[record.account_id],
+            "log_date": record.log_date,
+            **{name: getattr(record, name) for name in READINESS_FIELDS},
+            "readiness_score": int(score),
+            "ai_advice": str(text),
+        }
+        for record, score, text in zip(latest, scores, advice)
+    ]
+    _upsert_readiness_logs(db, rows)
+
+    # Logs are unique per (account, day), so correlating on both picks exactly one row.
+    same_day_log = (
+        ReadinessLog.account_id == WorkoutSession.account_id,
+        ReadinessLog.log_date == WorkoutSession.session_date,
+    )
+    db.execute(
+        update(WorkoutSession)
+        .where(_matches_keys(WorkoutSession.account_id, WorkoutSession.session_date, keys))
+        .values(
+            adjusted_intensity=suggest_intensity_sql(
+                WorkoutSession.planned_intensity,
+                select(ReadinessLog.readiness_score).where(*same_day_log).scalar_subquery(),
+                select(ReadinessLog.pain_level).where(*same_day_log).scalar_subquery(),
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    deltas: dict[str, dict[str, int]] = {}
+    for key, row in zip(keys, rows):
+        account_delta = deltas.setdefault(row["account_id"], {"readiness_sum": 0, "readiness_count": 0})
+        account_delta["readiness_sum"] += row["readiness_score"] - previous.get(key, 0)
+        account_delta["readiness_count"] += 0 if key in previous else 1
+    apply_rollup_deltas(db, deltas)
+
+    db.commit()
+    return set(deltas), errors
+
+
+def dedupe_readiness_logs(db: Session) -> int:
+    """Keep the latest log per (account, day) so the unique index can be created on old data.
+
+    The latest is the most recent ``updated_at``. Ties (``migrate_sync_columns``
+    stamps old rows alike) go to the last inserted row on SQLite (``rowid``).
+    """
+    recency = [ReadinessLog.updated_at.desc()]
+    if db.get_bind().dialect.name == "sqlite":
+        recency.append(literal_column("rowid").desc())
+    ranked = select(
+        ReadinessLog.id,
+        func.row_number()
+        .over(partition_by=(ReadinessLog.account_id, ReadinessLog.log_date), order_by=recency)
+        .label("rank"),
+    ).subquery()
+    superseded = select(ranked.c.id).where(ranked.c.rank > 1)
+    result = db.execute(ReadinessLog.__table__.delete().where(ReadinessLog.id.in_(superseded)))
+    db.commit()
+    return result.rowcount
+
@@ -0,0 +1,90 @@
+"""Per-account training counters kept in step with session and readiness writes.
+
+``python -m app.db.base`` backfills or repairs them with ``rebuild_rollups``.
+"""
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.db.session import dialect_insert
+from app.models import AccountTrainingRollup, ReadinessLog, WorkoutSession
+
+ROLLUP_COUNTERS = (
+    "total_sessions",
+    "completed_sessions",
+    "rpe_sum",
+    "rpe_count",
+    "readiness_sum",
+    "readiness_count",
+)
+
+
+def apply_rollup_delta(db: Session, account_id: str, **deltas: int) -> None:
+    """Add ``deltas`` to the account's counters in the caller's transaction.
+
+    A delta may be a SQL expression (e.g. a scalar subquery) as well as an int.
+    """
+    apply_rollup_deltas(db, {account_id: deltas})
+
+
+def apply_rollup_deltas(db: Session, deltas_by_account: dict[str, dict[str, int]]) -> None:
+    """Multi-account ``apply_rollup_delta`` as a single multi-row upsert."""
+    rows = []
+    changed: set[str] = set()
+    for account_id, deltas in deltas_by_account.items():
+        unknown = set(deltas) - set(ROLLUP_COUNTERS)
+        if unknown:
+            raise ValueError(f"Unknown rollup counters: {sorted(unknown)}")
+        nonzero = [name for name, value in deltas.items() if not isinstance(value, int) or value]
+        if nonzero:
+            rows.append({"account_id": account_id, **{name: deltas.get(name, 0) for name in ROLLUP_COUNTERS}})
+            changed.update(nonzero)
+    if not rows:
+        return
+
+    table = AccountTrainingRollup.__table__
+    stmt = dialect_insert(db)(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.account_id],
+        set_={name: table.c[name] + stmt.excluded[name] for name in ROLLUP_COUNTERS if name in changed},
+    )
+    db.execute(stmt)
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every account's rollup from the raw tables. Returns the row count."""
+    session_totals = (
+        select(
+            WorkoutSession.account_id.label("account_id"),
+            func.count(WorkoutSession.id).label("total_sessions"),
+            func.sum(case((WorkoutSession.status == "done", 1), else_=0)).label("completed_sessions"),
+            func.coalesce(func.sum(WorkoutSession.rpe_reported), 0).label("rpe_sum"),
+            func.count(WorkoutSession.rpe_reported).label("rpe_count"),
+            literal(0).label("readiness_sum"),
+            literal(0).label("readiness_count"),
+        )
+        .group_by(WorkoutSession.account_id)
+    )
+    readiness_totals = (
+        select(
+            ReadinessLog.account_id.label("account_id"),
+            literal(0).label("total_sessions"),
+            literal(0).label("completed_sessions"),
+            literal(0).label("rpe_sum"),
+            literal(0).label("rpe_count"),
+            func.sum(ReadinessLog.readiness_score).label("readiness_sum"),
+            func.count(ReadinessLog.id).label("readiness_count"),
+        )
+        .group_by(ReadinessLog.account_id)
+    )
+    combined = session_totals.union_all(readiness_totals).subquery()
+    merged = select(
+        combined.c.account_id,
+        *(func.sum(combined.c[name]).label(name) for name in ROLLUP_COUNTERS),
+    ).group_by(combined.c.account_id)
+
+    table = AccountTrainingRollup.__table__
+    db.execute(table.delete())
+    result = db.execute(table.insert().from_select(["account_id", *ROLLUP_COUNTERS], merged))
+    db.commit()
+    return result.rowcount
+
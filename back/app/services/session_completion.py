@@ -0,0 +1,73 @@
+from sqlalchemy import case, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.models import WorkoutSession
+from app.schemas import SessionCompletionIn
+from app.services.rollups import apply_rollup_delta
+
+
+def complete_sessions(db: Session, account_id: str, items: list[SessionCompletionIn]) -> list[dict]:
+    """Mark the account's sessions done with their RPE and notes, then commit.
+
+    Duplicate ids are resolved last-wins; sessions already holding the same
+    feedback are reported ``unchanged`` and not written, so replaying a batch
+    is free. Unknown ids and sessions of other accounts are ``not_found``.
+    Issues one SELECT plus, when something changed, one UPDATE and the rollup
+    upsert.
+    """
+    latest = {item.session_id: index for index, item in enumerate(items)}
+    current = {
+        row.id: row
+        for row in db.execute(
+            select(
+                WorkoutSession.id,
+                WorkoutSession.status,
+                WorkoutSession.rpe_reported,
+                WorkoutSession.notes,
+            ).where(WorkoutSession.account_id == account_id, WorkoutSession.id.in_(latest))
+        )
+    }
+
+    results = []
+    changed: dict[str, SessionCompletionIn] = {}
+    for index, item in enumerate(items):
+        row = current.get(item.session_id)
+        if latest[item.session_id] != index:
+            status = "superseded"
+        elif row is None:
+            status = "not_found"
+        elif (row.status, row.rpe_reported, row.notes) == ("done", item.rpe_reported, item.notes):
+            status = "unchanged"
+        else:
+            status = "completed"
+            changed[item.session_id] = item
+        results.append({"session_id": item.session_id, "status": status})
+    if not changed:
+        return results
+
+    db.execute(
+        update(WorkoutSession)
+        .where(WorkoutSession.account_id == account_id, WorkoutSession.id.in_(changed))
+        .values(
+            status="done",
+            rpe_reported=case(
+                {session_id: literal(item.rpe_reported) for session_id, item in changed.items()},
+                value=WorkoutSession.id,
+            ),
+            notes=case(
+                {session_id: literal(item.notes) for session_id, item in changed.items()},
+                value=WorkoutSession.id,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    previous = [current[session_id] for session_id in changed]
+    apply_rollup_delta(
+        db,
+        account_id,
+        completed_sessions=sum(1 for row in previous if row.status != "done"),
+        rpe_sum=sum(item.rpe_reported for item in changed.values()) - sum(row.rpe_reported or 0 for row in previous),
+        rpe_count=sum(1 for row in previous if row.rpe_reported is None),
+    )
+    db.commit()
+    return results
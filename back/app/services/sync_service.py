@@ -0,0 +1,112 @@
+"""Delta sync for the offline-first mobile client.
+
+Every synced table carries an ``updated_at`` stamped by the application on
+insert and update, indexed together with ``account_id``. A sync returns the
+rows of one account changed since the client's cursor and a new cursor taken
+before the queries run. Each query re-reads ``SYNC_OVERLAP`` before the cursor
+so that rows stamped just before it but committed after it are not missed;
+clients upsert by ``id`` and simply see those rows twice.
+"""
+import base64
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.models import Injury, ReadinessLog, UserProfile, WorkoutSession
+
+SYNC_OVERLAP = timedelta(seconds=5)
+
+SYNC_SESSION_COLUMNS = (
+    WorkoutSession.id,
+    WorkoutSession.program_id,
+    WorkoutSession.name,
+    WorkoutSession.session_date,
+    WorkoutSession.planned_duration_min,
+    WorkoutSession.planned_intensity,
+    WorkoutSession.adjusted_intensity,
+    WorkoutSession.status,
+    WorkoutSession.rpe_reported,
+    WorkoutSession.notes,
+)
+SYNC_READINESS_COLUMNS = (
+    ReadinessLog.id,
+    ReadinessLog.log_date,
+    ReadinessLog.sleep_hours,
+    ReadinessLog.fatigue,
+    ReadinessLog.stress,
+    ReadinessLog.soreness,
+    ReadinessLog.pain_level,
+    ReadinessLog.readiness_score,
+    ReadinessLog.ai_advice,
+)
+SYNC_INJURY_COLUMNS = (
+    Injury.id,
+    Injury.muscle_group,
+    Injury.pain_level,
+    Injury.is_active,
+    Injury.created_at,
+)
+SYNC_PROFILE_COLUMNS = tuple(
+    column
+    for column in UserProfile.__table__.columns
+    if column.name not in ("account_id", "updated_at")
+)
+# (table, index name) pairs created by ``migrate_sync_columns`` on older databases.
+SYNC_INDEXES = (
+    ("workout_sessions", "ix_workout_sessions_account_updated"),
+    ("readiness_logs", "ix_readiness_logs_account_updated"),
+    ("injuries", "ix_injuries_account_updated"),
+)
+
+
+def encode_sync_cursor(moment: datetime) -> str:
+    return base64.urlsafe_b64encode(moment.isoformat().encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def decode_sync_cursor(cursor: str) -> datetime:
+    """Raises ``ValueError`` when ``cursor`` was not produced by ``encode_sync_cursor``."""
+    try:
+        padded = cursor + "=" * ((4 - len(cursor) % 4) % 4)
+        return datetime.fromisoformat(base64.urlsafe_b64decode(padded.encode("utf-8")).decode("utf-8"))
+    except (TypeError, UnicodeDecodeError) as exc:
+        raise ValueError("sync cursor is invalid") from exc
+
+
+def collect_changes(db: Session, account_id: str, since: datetime | None) -> dict:
+    """Rows of ``account_id`` changed after ``since`` (everything when ``None``), one query per table."""
+    cursor = datetime.utcnow()
+    changed_after = since - SYNC_OVERLAP if since is not None else None
+
+    def changed(columns, model):
+        stmt = select(*columns).where(model.account_id == account_id)
+        if changed_after is not None:
+            stmt = stmt.where(model.updated_at > changed_after)
+        return [row._asdict() for row in db.execute(stmt)]
+
+    profiles = changed(SYNC_PROFILE_COLUMNS, UserProfile)
+    return {
+        "cursor": encode_sync_cursor(cursor),
+        "sessions": changed(SYNC_SESSION_COLUMNS, WorkoutSession),
+        "readiness": changed(SYNC_READINESS_COLUMNS, ReadinessLog),
+        "injuries": changed(SYNC_INJURY_COLUMNS, Injury),
+        "profile": profiles[0] if profiles else None,
+    }
+
+
+def migrate_sync_columns(db: Session) -> list[str]:
+    """Add ``updated_at`` and its indexes to tables created before delta sync existed."""
+    inspector = inspect(db.get_bind())
+    migrated = []
+    for model in (WorkoutSession, ReadinessLog, Injury, UserProfile):
+        table = model.__tablename__
+        if "updated_at" in {column["name"] for column in inspector.get_columns(table)}:
+            continue
+        db.execute(text(f"ALTER TABLE {table} ADD COLUMN updated_at TIMESTAMP"))
+        db.execute(text(f"UPDATE {table} SET updated_at = :now"), {"now": datetime.utcnow()})
+        migrated.append(table)
+    for table, index in SYNC_INDEXES:
+        db.execute(text(f"CREATE INDEX IF NOT EXISTS {index} ON {table} (account_id, updated_at)"))
+    db.commit()
+    return migrated
+
@@ -0,0 +1,75 @@
+"""DB statements and latency per /analytics request, with and without the cache.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_analytics --accounts 3000 --requests 20000
+
+Requests follow a skewed distribution (a minority of athletes open the app
+most often), with a readiness submission every ``--write-every`` requests to
+exercise invalidation.
+"""
+import argparse
+import time
+from random import Random
+
+from benchmarks.common import StatementCounter, percentile, reset_database, seed_athletes
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.analytics_service import analytics_cache
+
+READINESS = {"sleep_hours": 7.5, "fatigue": 3, "stress": 3, "soreness": 2, "pain_level": 1}
+
+
+def run(client: TestClient, account_ids: list[str], requests: int, write_every: int, cached: bool) -> dict:
+    analytics_cache.clear()
+    original_size = analytics_cache.max_entries
+    if not cached:
+        analytics_cache.max_entries = 0
+    rng = Random(11)
+    latencies: list[float] = []
+    counter = StatementCounter()
+    try:
+        with counter.active():
+            for i in range(requests):
+                account_id = account_ids[min(len(account_ids) - 1, int(rng.paretovariate(1.2)) - 1)]
+                if write_every and i % write_every == write_every - 1:
+                    before = counter.count
+                    client.post("/readiness", json={"account_id": account_id, **READINESS})
+                    counter.count = before
+                start = time.perf_counter()
+                response = client.get(f"/analytics/{account_id}")
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200
+    finally:
+        analytics_cache.max_entries = original_size
+    return {
+        "statements_per_request": counter.count / requests,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        **analytics_cache.stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=3000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--write-every", type=int, default=50)
+    args = parser.parse_args()
+
+    reset_database()
+    account_ids = seed_athletes(args.accounts)
+    with TestClient(app) as client:
+        for label, cached in (("uncached", False), ("cached", True)):
+            result = run(client, account_ids, args.requests, args.write_every, cached)
+            print(
+                f"{label:<9} statements/request={result['statements_per_request']:.2f}  "
+                f"p50={result['p50_ms']:.2f}ms  p99={result['p99_ms']:.2f}ms  "
+                f"hits={result['hits']} misses={result['misses']} size={result['size']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Threadpool sessions vs the async engine under concurrent read traffic.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_async_db --accounts 500 --requests 4000 --concurrency 8 64 256
+
+Each mode serves the same mix of read routes in-process (httpx ``ASGITransport``)
+at every concurrency level. In ``threadpool`` mode each request holds one of
+the ``--threadpool`` worker threads while it talks to the database; in
+``async`` mode the same route code runs on the event loop through
+``AsyncSession.run_sync``. Point ``BENCH_DATABASE_URL`` at PostgreSQL for
+numbers that matter: SQLite serializes writers and runs aiosqlite on a thread
+per connection.
+"""
+import argparse
+import asyncio
+import time
+from random import Random
+
+from benchmarks.common import percentile, reset_database, seed_athletes
+
+import anyio.to_thread
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.main import app
+from app.services.analytics_service import analytics_cache
+
+
+def _paths(account_ids: list[str], count: int) -> list[str]:
+    rng = Random(5)
+    routes = (
+        "/progress/{}",
+        "/analytics/{}",
+        "/readiness/latest?account_id={}",
+        "/workouts/sessions?account_id={}&limit=20",
+    )
+    return [rng.choice(routes).format(rng.choice(account_ids)) for _ in range(count)]
+
+
+async def _load(paths: list[str], concurrency: int) -> dict:
+    latencies: list[float] = []
+    failures = 0
+    queue = iter(paths)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            nonlocal failures
+            for path in queue:
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append((time.perf_counter() - start) * 1000)
+                failures += response.status_code >= 500
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {
+        "rps": len(paths) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "failures": failures,
+    }
+
+
+async def run(mode: str, paths: list[str], levels: list[int], threadpool: int) -> None:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool
+    async_engine = None
+    if mode == "async":
+        url = db_session._async_database_url(settings.database_url)
+        # aiosqlite engines default to NullPool; pool them like the sync engine for a fair comparison.
+        async_engine = create_async_engine(url, poolclass=AsyncAdaptedQueuePool, pool_size=threadpool, max_overflow=0)
+        db_session.AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    else:
+        db_session.AsyncSessionLocal = None
+    try:
+        for concurrency in levels:
+            result = await _load(paths, concurrency)
+            print(
+                f"{mode:<10} concurrency={concurrency:<4} rps={result['rps']:8.1f}  "
+                f"p50={result['p50_ms']:7.2f}ms  p99={result['p99_ms']:7.2f}ms  failures={result['failures']}"
+            )
+    finally:
+        if async_engine is not None:
+            await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 64, 256])
+    parser.add_argument("--threadpool", type=int, default=40, help="worker threads / async pool size")
+    args = parser.parse_args()
+
+    reset_database()
+    paths = _paths(seed_athletes(args.accounts), args.requests)
+    analytics_cache.max_entries = 0
+    for mode in ("threadpool", "async"):
+        asyncio.run(run(mode, paths, args.concurrency, args.threadpool))
+
+
+if __name__ == "__main__":
+    main()
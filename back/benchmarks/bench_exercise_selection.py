@@ -0,0 +1,85 @@
+"""Exercise eligibility and assignment for many athletes against a large synthetic catalog.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_exercise_selection --exercises 50000 --athletes 1000
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.exercise_catalog import NO_EQUIPMENT_TAGS, build_catalog
+from app.services.exercise_selection import assign_exercises, eligible_exercises
+
+MUSCLES = [f"muscle_{i}" for i in range(40)] + ["full_body"]
+EQUIPMENT = [f"gear_{i}" for i in range(60)] + ["none", "bodyweight"]
+CATEGORIES = ["strength", "cardio", "core", "mobility"]
+
+
+def synthetic_catalog(count: int, rng: np.random.Generator):
+    rows = [
+        SimpleNamespace(
+            id=f"ex-{i}",
+            name=f"Exercise {i:06d}",
+            category=CATEGORIES[i % len(CATEGORIES)],
+            muscle_groups=",".join(rng.choice(MUSCLES, size=rng.integers(1, 4), replace=False)),
+            equipment=",".join(rng.choice(EQUIPMENT, size=rng.integers(1, 3), replace=False)),
+            duration_min=int(rng.integers(10, 40)),
+        )
+        for i in range(count)
+    ]
+    start = time.perf_counter()
+    catalog = build_catalog(rows, version=1)
+    print(f"catalog build: {len(rows)} exercises in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return catalog
+
+
+def naive_eligible(catalog, equipment: set[str], injured: set[str]) -> list[bool]:
+    return [
+        set(exercise.equipment) - NO_EQUIPMENT_TAGS <= equipment
+        and "full_body" not in exercise.muscle_groups
+        and not set(exercise.muscle_groups) & injured
+        for exercise in catalog.exercises
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--exercises", type=int, default=50000)
+    parser.add_argument("--athletes", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=72)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(17)
+    catalog = synthetic_catalog(args.exercises, rng)
+    athletes = [
+        (
+            list(rng.choice(EQUIPMENT[:-2], size=rng.integers(3, 25), replace=False)),
+            list(rng.choice(MUSCLES[:-1], size=rng.integers(0, 3), replace=False)),
+        )
+        for _ in range(args.athletes)
+    ]
+
+    start = time.perf_counter()
+    eligible_counts = []
+    for equipment, injured in athletes:
+        eligible = eligible_exercises(catalog, equipment, injured)
+        assign_exercises(catalog, eligible, "performance", args.sessions)
+        eligible_counts.append(int(eligible.sum()))
+    vectorized = (time.perf_counter() - start) / args.athletes * 1000
+
+    sample = athletes[: max(1, args.athletes // 20)]
+    start = time.perf_counter()
+    for equipment, injured in sample:
+        naive_eligible(catalog, set(equipment), set(injured))
+    naive = (time.perf_counter() - start) / len(sample) * 1000
+
+    print(f"median eligible exercises per athlete: {int(np.median(eligible_counts))}")
+    print(f"bitmask eligibility + {args.sessions}-session assignment: {vectorized:.2f}ms per athlete")
+    print(f"python set eligibility only (baseline):              {naive:.2f}ms per athlete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Login burst benchmark: scrypt on request threads vs the hashing process pool.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_hashing --logins 200 --concurrency 50
+
+While the login burst runs, unrelated endpoints are polled and their latency
+is reported, which is what the process pool is meant to protect.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.common import percentile, reset_database, seed_athletes
+
+import httpx
+
+from app.core.hashing import password_hasher
+from app.main import app
+from app.utils import hash_password
+
+PASSWORD = "bench-password"
+
+
+def seed_accounts(count: int) -> list[str]:
+    reset_database()
+    account_ids = seed_athletes(count, history_days=7, password_hash=hash_password(PASSWORD))
+    return [f"{account_id}@bench.local" for account_id in account_ids]
+
+
+async def run_mode(pool_size: int, mails: list[str], concurrency: int) -> dict[str, float]:
+    password_hasher.shutdown()
+    password_hasher.pool_size = pool_size
+    password_hasher.queue_limit = max(password_hasher.queue_limit, len(mails))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm the pool so process spawn time is not charged to the burst.
+        await client.post("/auth/login", json={"mail": mails[0], "password": PASSWORD})
+
+        semaphore = asyncio.Semaphore(concurrency)
+        other_latencies: list[float] = []
+        burst_done = asyncio.Event()
+
+        async def login(mail: str) -> None:
+            async with semaphore:
+                response = await client.post("/auth/login", json={"mail": mail, "password": PASSWORD})
+                assert response.status_code == 200, response.text
+
+        async def poll_other_endpoints() -> None:
+            paths = ["/health", "/progress/athlete-000000", "/readiness/latest?account_id=athlete-000000"]
+            i = 0
+            while not burst_done.is_set():
+                start = time.perf_counter()
+                await client.get(paths[i % len(paths)])
+                other_latencies.append((time.perf_counter() - start) * 1000)
+                i += 1
+                await asyncio.sleep(0.005)
+
+        poller = asyncio.create_task(poll_other_endpoints())
+        start = time.perf_counter()
+        await asyncio.gather(*(login(mail) for mail in mails))
+        elapsed = time.perf_counter() - start
+        burst_done.set()
+        await poller
+
+    return {
+        "logins_per_s": len(mails) / elapsed,
+        "other_p50_ms": statistics.median(other_latencies) if other_latencies else 0.0,
+        "other_p99_ms": percentile(other_latencies, 99),
+        "other_samples": float(len(other_latencies)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    mails = seed_accounts(args.logins)
+    for label, pool_size in (("request threads", 0), (f"process pool ({args.pool_size})", args.pool_size)):
+        result = asyncio.run(run_mode(pool_size, mails, args.concurrency))
+        print(
+            f"{label:<22} logins/s={result['logins_per_s']:8.1f}  "
+            f"other p50={result['other_p50_ms']:7.1f}ms  p99={result['other_p99_ms']:7.1f}ms  "
+            f"(n={int(result['other_samples'])})"
+        )
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Mixed HTTP traffic against a seeded database, checked against a stored baseline.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_http --accounts 2000 --requests 5000 --concurrency 32
+    python -m benchmarks.bench_http --mode uvicorn --workers 4 --output /tmp/http.json
+    python -m benchmarks.bench_http --update-baseline
+
+Synthetic athletes (60 days of sessions and readiness logs each) are seeded
+first. A deterministic mix of logins, readiness submissions, analytics,
+listings, sync and program generation then runs, weighted towards a minority
+of very active athletes. ``asgi`` mode drives the app in-process through
+httpx's ``ASGITransport``. ``uvicorn`` mode starts ``--workers`` server
+processes on the same database and drives them over TCP.
+
+Throughput and p50/p95/p99 per route are printed, written to ``--output``,
+and compared with ``benchmarks/baselines/http_<mode>.json``. The exit status
+is 1 when a route's latency grows, or total throughput drops, by more than
+the tolerances. Baselines are machine specific: refresh them with
+``--update-baseline`` on the machine that runs the comparison. Use
+``BENCH_DATABASE_URL`` for PostgreSQL. With SQLite, several uvicorn workers
+contend on one database file, and write failures are expected.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from random import Random
+from typing import NamedTuple
+
+from benchmarks.common import percentile, reset_database, seed_athletes
+
+import httpx
+
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.security import create_token_pair
+from app.main import app
+from app.utils import hash_password
+
+PASSWORD = "bench-password"
+BASELINE_DIR = Path(__file__).parent / "baselines"
+READINESS = {"sleep_hours": 7.0, "fatigue": 3, "stress": 3, "soreness": 2, "pain_level": 1}
+# Route template -> share of the traffic.
+TRAFFIC_MIX = {
+    "POST /auth/login": 4,
+    "POST /readiness": 12,
+    "GET /analytics/{account_id}": 18,
+    "GET /progress/{account_id}": 10,
+    "GET /readiness/latest": 10,
+    "GET /workouts/sessions/today": 12,
+    "GET /workouts/sessions": 14,
+    "GET /injuries": 6,
+    "GET /sync": 8,
+    "POST /workouts/programs/generate": 6,
+}
+
+
+class PlannedRequest(NamedTuple):
+    route: str
+    method: str
+    url: str
+    body: dict | None
+    headers: dict | None = None
+
+
+def _request_for(route: str, account_id: str) -> PlannedRequest:
+    method, _template = route.split(" ", 1)
+    if route == "POST /auth/login":
+        return PlannedRequest(route, method, "/auth/login", {"mail": f"{account_id}@bench.local", "password": PASSWORD})
+    if route == "POST /readiness":
+        return PlannedRequest(route, method, "/readiness", {"account_id": account_id, **READINESS})
+    if route == "POST /workouts/programs/generate":
+        body = {"account_id": account_id, "goal": "performance", "week_availability": 4, "weeks": 2}
+        return PlannedRequest(route, method, "/workouts/programs/generate", body)
+    urls = {
+        "GET /analytics/{account_id}": f"/analytics/{account_id}",
+        "GET /progress/{account_id}": f"/progress/{account_id}",
+        "GET /readiness/latest": f"/readiness/latest?account_id={account_id}",
+        "GET /workouts/sessions/today": f"/workouts/sessions/today?account_id={account_id}",
+        "GET /workouts/sessions": f"/workouts/sessions?account_id={account_id}&limit=20",
+        "GET /injuries": f"/injuries?account_id={account_id}&limit=20",
+    }
+    if route == "GET /sync":
+        headers = {"Authorization": f"Bearer {create_token_pair(account_id)['token']}"}
+        return PlannedRequest(route, method, "/sync", None, headers)
+    return PlannedRequest(route, method, urls[route], None)
+
+
+def plan_requests(account_ids: list[str], count: int, seed: int = 17) -> list[PlannedRequest]:
+    """``count`` requests following ``TRAFFIC_MIX``, over a Pareto-skewed choice of athletes."""
+    rng = Random(seed)
+    routes, weights = zip(*TRAFFIC_MIX.items())
+    plan = []
+    for route in rng.choices(routes, weights, k=count):
+        account_id = account_ids[min(len(account_ids) - 1, int(rng.paretovariate(1.1)) - 1)]
+        plan.append(_request_for(route, account_id))
+    return plan
+
+
+async def drive(client: httpx.AsyncClient, plan: list[PlannedRequest], concurrency: int) -> dict:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    failures: dict[str, int] = defaultdict(int)
+    queue = iter(plan)
+
+    async def worker() -> None:
+        for request in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    request.method, request.url, json=request.body, headers=request.headers
+                )
+                failed = response.status_code >= 500
+            except httpx.HTTPError:
+                failed = True
+            latencies[request.route].append((time.perf_counter() - start) * 1000)
+            failures[request.route] += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    every = [latency for values in latencies.values() for latency in values]
+    return {
+        "total": _summary(every, sum(failures.values()), elapsed),
+        "routes": {route: _summary(values, failures[route], elapsed) for route, values in sorted(latencies.items())},
+    }
+
+
+def _summary(latencies: list[float], failures: int, elapsed: float) -> dict:
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def run_asgi(plan: list[PlannedRequest], warmup: list[PlannedRequest], concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await drive(client, warmup, concurrency)
+        return await drive(client, plan, concurrency)
+
+
+async def _wait_until_up(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn did not come up in time")
+
+
+async def run_uvicorn(
+    plan: list[PlannedRequest], warmup: list[PlannedRequest], concurrency: int, workers: int, port: int
+) -> dict:
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers)]
+    # Own process group, so the workers' hashing pool processes are stopped with it.
+    server = subprocess.Popen([*command, "--log-level", "warning"], env=os.environ.copy(), start_new_session=True)
+    try:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60, limits=limits) as client:
+            await _wait_until_up(client, server)
+            await drive(client, warmup, concurrency)
+            return await drive(client, plan, concurrency)
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        finally:
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(server.pid, signal.SIGKILL)
+
+
+def compare(current: dict, baseline: dict, tolerance: float, p99_tolerance: float, slack_ms: float) -> list[str]:
+    """Regressions of ``current`` against ``baseline``; empty when within tolerance."""
+    problems = []
+    if current["total"]["rps"] < baseline["total"]["rps"] * (1 - tolerance):
+        problems.append(f"throughput {current['total']['rps']} rps < baseline {baseline['total']['rps']} rps")
+    for route, expected in baseline["routes"].items():
+        measured = current["routes"].get(route)
+        if measured is None:
+            problems.append(f"{route}: not measured")
+            continue
+        if measured["failures"] > expected["failures"]:
+            problems.append(f"{route}: {measured['failures']} failures (baseline {expected['failures']})")
+        for key, allowed in (("p50_ms", tolerance), ("p95_ms", tolerance), ("p99_ms", p99_tolerance)):
+            limit = expected[key] * (1 + allowed) + slack_ms
+            if measured[key] > limit:
+                problems.append(f"{route}: {key} {measured[key]} > {limit:.2f} (baseline {expected[key]})")
+    return problems
+
+
+def _print_report(result: dict) -> None:
+    print(f"{'route':<36}{'n':>7}{'fail':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, stats in [*result["routes"].items(), ("total", result["total"])]:
+        print(
+            f"{route:<36}{stats['requests']:>7}{stats['failures']:>6}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+    print(f"throughput: {result['total']['rps']} requests/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--accounts", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", type=Path, help="write the results JSON here")
+    parser.add_argument("--baseline", type=Path, help="default: benchmarks/baselines/http_<mode>.json")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50/p95 growth and rps drop")
+    parser.add_argument("--p99-tolerance", type=float, default=0.5)
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="absolute latency noise allowance")
+    args = parser.parse_args()
+
+    for name in ("athlia-api", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    reset_database()
+    account_ids = seed_athletes(args.accounts, password_hash=hash_password(PASSWORD))
+    warmup = plan_requests(account_ids, args.warmup, seed=3)
+    plan = plan_requests(account_ids, args.requests)
+
+    if args.mode == "asgi":
+        result = asyncio.run(run_asgi(plan, warmup, args.concurrency))
+        password_hasher.shutdown()
+    else:
+        result = asyncio.run(run_uvicorn(plan, warmup, args.concurrency, args.workers, args.port))
+    result["meta"] = {
+        "mode": args.mode,
+        "workers": args.workers if args.mode == "uvicorn" else 1,
+        "accounts": args.accounts,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "database": settings.database_url.split(":", 1)[0],
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    _print_report(result)
+
+    document = json.dumps(result, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(document)
+    baseline_path = args.baseline or BASELINE_DIR / f"http_{args.mode}.json"
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(document)
+        print(f"baseline written to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --update-baseline to create one")
+        return
+
+    baseline = json.loads(baseline_path.read_text())
+    shape = ("mode", "workers", "accounts", "requests", "concurrency", "database")
+    if any(baseline["meta"].get(key) != result["meta"][key] for key in shape):
+        print(f"warning: baseline was recorded with different settings: {baseline['meta']}")
+    problems = compare(result, baseline, args.tolerance, args.p99_tolerance, args.slack_ms)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"within tolerance of {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Serialization cost of a 5000-session listing: response models vs row tuples.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_listing --sessions 5000 --repeat 50
+
+One athlete is seeded with ``--sessions`` sessions and the listing query runs
+once. The rows are then encoded ``--repeat`` times in two ways:
+
+* ``models``: the former path. One dict per row, a ``SessionListingOut`` per
+  dict, ``response_model`` validation and ``jsonable_encoder`` as FastAPI
+  does it, then ``json.dumps``.
+* ``tuples``: the current path. ``dict(zip(fields, row))`` per row, encoded
+  by orjson.
+
+Latency of the streamed and paged ``GET /workouts/sessions`` is then measured
+end to end through httpx's ``ASGITransport``.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from benchmarks.common import percentile, reset_database, seed_athletes
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.responses import dumps
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import WorkoutSession
+from app.routers.workouts import SESSION_LISTING_COLUMNS, SESSION_LISTING_FIELDS
+from app.schemas import SessionListingOut
+
+LISTING = TypeAdapter(list[SessionListingOut])
+
+
+def encode_with_models(rows) -> bytes:
+    objects = [SessionListingOut(**dict(zip(SESSION_LISTING_FIELDS, row))) for row in rows]
+    validated = LISTING.validate_python(objects, from_attributes=True)
+    content = jsonable_encoder(LISTING.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_tuples(rows) -> bytes:
+    return dumps([dict(zip(SESSION_LISTING_FIELDS, row)) for row in rows])
+
+
+def time_encoder(encode, rows, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(rows)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def time_requests(account_id: str, repeat: int) -> dict[str, list[float]]:
+    urls = {
+        "stream": f"/workouts/sessions?account_id={account_id}",
+        "page of 500": f"/workouts/sessions?account_id={account_id}&limit=500",
+    }
+    timings: dict[str, list[float]] = {label: [] for label in urls}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, url in urls.items():
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = await client.get(url)
+                timings[label].append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for name in ("athlia-api", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    reset_database()
+    # Seven sessions a week means one every day: ``--sessions`` days in total, 7 of them ahead.
+    (account_id,) = seed_athletes(1, history_days=args.sessions - 7, sessions_per_week=7)
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(*SESSION_LISTING_COLUMNS)
+            .where(WorkoutSession.account_id == account_id)
+            .order_by(WorkoutSession.session_date.desc(), WorkoutSession.id.desc())
+        ).all()
+    assert json.loads(encode_with_models(rows)) == json.loads(encode_tuples(rows))
+
+    print(f"{len(rows)} sessions")
+    for label, encode in (("models", encode_with_models), ("tuples", encode_tuples)):
+        timings = time_encoder(encode, rows, args.repeat)
+        print(f"encode {label:<13} p50={percentile(timings, 50):7.2f}ms  p99={percentile(timings, 99):7.2f}ms")
+    for label, timings in asyncio.run(time_requests(account_id, args.repeat)).items():
+        print(f"GET    {label:<13} p50={percentile(timings, 50):7.2f}ms  p99={percentile(timings, 99):7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Acute:chronic workload series over a synthetic multi-year history.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_load --years 5 --repeat 20
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import SessionLocal, percentile, reset_database, seed_athletes
+
+from app.services.load_service import (
+    CHRONIC_DAYS,
+    compute_load_metrics,
+    compute_load_series,
+    load_training_history,
+)
+
+
+def _measure(func, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentile(samples, 50), percentile(samples, 99)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    days = 365 * args.years
+    reset_database()
+    (account_id,) = seed_athletes(1, history_days=days, sessions_per_week=5)
+    end = date.today()
+    start = end - timedelta(days=days)
+    history_start = start - timedelta(days=CHRONIC_DAYS - 1)
+
+    with SessionLocal() as db:
+        history = load_training_history(db, account_id, history_start, end)
+        span = (end - history_start).days + 1
+        print(f"history: {len(history.session_days)} sessions, {len(history.readiness_days)} readiness logs, {span} days")
+
+        query = _measure(lambda: load_training_history(db, account_id, history_start, end), args.repeat)
+        compute = _measure(lambda: compute_load_metrics(history, span), args.repeat)
+        series = _measure(lambda: compute_load_series(db, account_id, start, end), args.repeat)
+
+    for label, (p50, p99) in (("query", query), ("vectorized metrics", compute), ("full series", series)):
+        print(f"{label:<20} p50={p50:8.2f}ms  p99={p99:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Event-loop time spent logging: direct stream handler vs the queue listener.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_logging --requests 5000 --write-delay-ms 0.2
+
+``direct`` is the previous ``logging.basicConfig`` setup: the handler formats
+and writes each access line on the event loop. ``queue`` is ``setup_logging``.
+Each mode serves ``--requests`` calls to ``/health`` in-process (httpx
+``ASGITransport``), so no database time is included. The log stream is a file
+whose writes are delayed by ``--write-delay-ms``, mimicking a congested
+stderr pipe or container log driver. The report shows per-request latency and
+the time spent inside the access-log call itself.
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+
+from benchmarks.common import percentile
+
+import httpx
+
+from app.core.logging import ACCESS_LOGGER, TEXT_FORMAT, setup_logging, stop_logging
+from app.main import app
+
+
+class SlowFile:
+    """File stream whose writes take at least ``delay`` seconds."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.file = tempfile.TemporaryFile("w+")
+
+    def write(self, text: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return self.file.write(text)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+
+class CallTimer:
+    """Time the access logger's ``handle`` calls on the caller's thread."""
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.calls = 0
+
+    def wrap(self, logger: logging.Logger) -> None:
+        handle = logger.handle
+
+        def timed(record: logging.LogRecord) -> None:
+            start = time.perf_counter()
+            handle(record)
+            self.seconds += time.perf_counter() - start
+            self.calls += 1
+
+        logger.handle = timed
+
+
+def _direct_logging(stream: SlowFile) -> None:
+    root = logging.getLogger()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+async def _serve(requests: int) -> list[float]:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get("/health")
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run(mode: str, requests: int, delay_ms: float) -> dict:
+    stream = SlowFile(delay_ms / 1000)
+    root = logging.getLogger()
+    stop_logging()
+    root.handlers.clear()
+    if mode == "direct":
+        _direct_logging(stream)
+    else:
+        setup_logging(stream)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    access_logger = logging.getLogger(ACCESS_LOGGER)
+    timer = CallTimer()
+    timer.wrap(access_logger)
+    try:
+        latencies = asyncio.run(_serve(requests))
+    finally:
+        del access_logger.handle
+        stop_logging()
+        root.handlers.clear()
+    return {
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "log_us": timer.seconds / max(timer.calls, 1) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--write-delay-ms", type=float, nargs="+", default=[0.0, 0.2])
+    args = parser.parse_args()
+
+    for delay_ms in args.write_delay_ms:
+        for mode in ("direct", "queue"):
+            result = run(mode, args.requests, delay_ms)
+            print(
+                f"{mode:<7} write delay={delay_ms:.2f}ms  request p50={result['p50_ms']:6.3f}ms  "
+                f"p99={result['p99_ms']:6.3f}ms  access log call={result['log_us']:7.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""12-week x 6-day program generation: per-object ORM inserts vs the bulk insert path.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_programs --repeat 50
+"""
+import argparse
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from benchmarks.common import SessionLocal, StatementCounter, percentile, reset_database, seed_athletes
+
+from app.models import WorkoutProgram, WorkoutSession
+from app.services.program_service import generate_program
+
+WEEKS = 12
+DAYS = 6
+
+
+def generate_per_object(db, account_id: str) -> None:
+    """The previous write pattern: db.add per session, flush, commit, refresh, re-query."""
+    program = WorkoutProgram(
+        id=str(uuid4()),
+        account_id=account_id,
+        title="Baseline",
+        goal="performance",
+        created_at=datetime.utcnow(),
+        active=True,
+    )
+    db.add(program)
+    db.flush()
+    for i in range(WEEKS * DAYS):
+        db.add(
+            WorkoutSession(
+                id=str(uuid4()),
+                program_id=program.id,
+                account_id=account_id,
+                name=f"Seance {i + 1}",
+                session_date=datetime.utcnow().date(),
+                planned_duration_min=45,
+                planned_intensity=6,
+                adjusted_intensity=6,
+                status="planned",
+            )
+        )
+    db.commit()
+    db.refresh(program)
+    db.query(WorkoutSession).filter(WorkoutSession.program_id == program.id).all()
+
+
+def measure(label: str, func, account_id: str, repeat: int) -> None:
+    samples: list[float] = []
+    counter = StatementCounter()
+    with counter.active():
+        for _ in range(repeat):
+            with SessionLocal() as db:
+                start = time.perf_counter()
+                func(db, account_id)
+                samples.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{label:<12} statements/program={counter.count / repeat:6.1f}  "
+        f"p50={percentile(samples, 50):7.2f}ms  p99={percentile(samples, 99):7.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    reset_database()
+    (account_id,) = seed_athletes(1, history_days=0)
+    measure("per-object", generate_per_object, account_id, args.repeat)
+    measure(
+        "bulk",
+        lambda db, account: generate_program(db, account, "performance", DAYS, WEEKS),
+        account_id,
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
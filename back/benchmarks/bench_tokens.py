@@ -0,0 +1,51 @@
+"""Access-token validation throughput with a cold and a warm verified-token cache.
+
+Usage (from ``back/``)::
+
+    python -m benchmarks.bench_tokens --tokens 1000 --rounds 50
+"""
+import argparse
+import time
+
+from app.core.security import create_token, parse_token, parse_token_cached, token_cache
+
+
+def _rate(count: int, elapsed: float) -> float:
+    return count / elapsed if elapsed else float("inf")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    tokens = [create_token(f"account-{i}", "access", 3600) for i in range(args.tokens)]
+    total = args.tokens * args.rounds
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for token in tokens:
+            parse_token(token)
+    uncached = _rate(total, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        token_cache.clear()
+        for token in tokens:
+            parse_token_cached(token)
+    cold = _rate(total, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for token in tokens:
+            parse_token_cached(token)
+    warm = _rate(total, time.perf_counter() - start)
+
+    print(f"parse_token (no cache)   {uncached:12,.0f} validations/s")
+    print(f"cold cache               {cold:12,.0f} validations/s")
+    print(f"warm cache               {warm:12,.0f} validations/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Shared helpers for the benchmark scripts.
+
+Importing this module points ``DATABASE_URL`` at a throwaway SQLite file unless
+``BENCH_DATABASE_URL`` is set, so it must be imported before anything from ``app``.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from random import Random
+
+if "BENCH_DATABASE_URL" in os.environ:
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+else:
+    _db_dir = tempfile.mkdtemp(prefix="athlia-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+from sqlalchemy import event
+
+from app.db.base import init_db
+from app.db.session import SessionLocal, engine
+from app.models import Account, Base, ReadinessLog, WorkoutProgram, WorkoutSession
+from app.services.rollups import rebuild_rollups
+
+
+class StatementCounter:
+    """Counts SQL statements sent through ``engine`` while active."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def _on_execute(self, *_args) -> None:
+        self.count += 1
+
+    @contextmanager
+    def active(self):
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        try:
+            yield self
+        finally:
+            event.remove(engine, "before_cursor_execute", self._on_execute)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def reset_database() -> None:
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+
+
+def seed_athletes(
+    count: int,
+    history_days: int = 60,
+    sessions_per_week: int = 4,
+    password_hash: str = "scrypt$unused$unused",
+    seed: int = 7,
+) -> list[str]:
+    """Insert ``count`` athletes with sessions and readiness logs over ``history_days``."""
+    rng = Random(seed)
+    today = date.today()
+    now = datetime.utcnow()
+    account_ids = [f"athlete-{i:06d}" for i in range(count)]
+    accounts, programs, sessions, logs = [], [], [], []
+    for account_id in account_ids:
+        accounts.append(
+            {
+                "id": account_id,
+                "username": account_id,
+                "mail": f"{account_id}@bench.local",
+                "password_hash": password_hash,
+                "statut_account": "active",
+                "created_at": now,
+                "last_connection": None,
+            }
+        )
+        program_id = f"{account_id}-program"
+        programs.append(
+            {
+                "id": program_id,
+                "account_id": account_id,
+                "title": "Bench plan",
+                "goal": "performance",
+                "created_at": now,
+                "active": True,
+            }
+        )
+        for offset in range(-history_days, 7):
+            day = today + timedelta(days=offset)
+            if rng.random() < sessions_per_week / 7:
+                intensity = rng.randint(4, 8)
+                done = offset < 0 and rng.random() < 0.8
+                sessions.append(
+                    {
+                        "id": f"{account_id}-s{offset + history_days}",
+                        "program_id": program_id,
+                        "account_id": account_id,
+                        "name": "Bench session",
+                        "session_date": day,
+                        "planned_duration_min": rng.choice((30, 45, 60)),
+                        "planned_intensity": intensity,
+                        "adjusted_intensity": intensity,
+                        "status": "done" if done else "planned",
+                        "rpe_reported": rng.randint(3, 9) if done else None,
+                        "notes": None,
+                    }
+                )
+            if offset <= 0 and rng.random() < 0.7:
+                logs.append(
+                    {
+                        "id": f"{account_id}-r{offset + history_days}",
+                        "account_id": account_id,
+                        "profile_id": None,
+                        "log_date": day,
+                        "sleep_hours": round(rng.uniform(5, 9), 1),
+                        "fatigue": rng.randint(0, 8),
+                        "stress": rng.randint(0, 8),
+                        "soreness": rng.randint(0, 8),
+                        "pain_level": rng.randint(0, 8),
+                        "readiness_score": rng.randint(10, 100),
+                        "ai_advice": "bench",
+                    }
+                )
+
+    with engine.begin() as conn:
+        conn.execute(Account.__table__.insert(), accounts)
+        conn.execute(WorkoutProgram.__table__.insert(), programs)
+        if sessions:
+            conn.execute(WorkoutSession.__table__.insert(), sessions)
+        if logs:
+            conn.execute(ReadinessLog.__table__.insert(), logs)
+    with SessionLocal() as db:
+        rebuild_rollups(db)
+    return account_ids
+
@@ -0,0 +1,66 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+_db_dir = tempfile.mkdtemp(prefix="athlia-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'athlia.db')}"
+os.environ.setdefault("HASH_POOL_SIZE", "1")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.main import app
+from app.models import Base
+from app.services.analytics_service import analytics_cache
+from app.services.last_connection import last_connection_buffer
+from app.services.profile_service import profile_cache
+
+
+@pytest.fixture()
+def client():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    analytics_cache.clear()
+    last_connection_buffer.clear()
+    profile_cache.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture()
+def account(client):
+    response = client.post(
+        "/auth/register",
+        json={"username": "Lea", "mail": "lea@example.com", "password": "secret-pass"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture()
+def statements():
+    """List that collects every SQL statement executed while the test runs."""
+    executed: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture()
+def statement_budget(statements):
+    """``with statement_budget(n):`` fails when the block runs more than ``n`` SQL statements."""
+
+    @contextmanager
+    def budget(limit: int):
+        start = len(statements)
+        yield
+        issued = statements[start:]
+        assert len(issued) <= limit, f"{len(issued)} statements, budget {limit}:\n" + "\n".join(issued)
+
+    return budget
@@ -0,0 +1,73 @@
+from app.core.cache import TTLCache
+from app.services.analytics_service import analytics_cache
+
+
+def test_ttl_cache_expires_and_bounds_entries(monkeypatch):
+    import app.core.cache as cache_module
+
+    now = 1_000.0
+    monkeypatch.setattr(cache_module.time, "time", lambda: now)
+    cache = TTLCache(max_entries=2, ttl_seconds=10)
+    cache.put("a", 1)
+    cache.put("b", 2, expires_at=now + 1)
+    cache.put("c", 3)
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+
+    now += 5
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_analytics_cache_is_invalidated_by_writes(client, account):
+    account_id = account["account"]["id"]
+    client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "muscle", "week_availability": 3},
+    )
+    first = client.get(f"/analytics/{account_id}").json()
+    assert first["weekly_sessions_planned"] == 3
+    assert first["next_session_intensity"] == 6
+    assert client.get(f"/analytics/{account_id}").json() == first
+    assert (analytics_cache.hits, analytics_cache.misses) == (1, 1)
+
+    client.post(
+        "/readiness",
+        json={"account_id": account_id, "sleep_hours": 8, "fatigue": 9, "stress": 9, "soreness": 9, "pain_level": 9},
+    )
+    after = client.get(f"/analytics/{account_id}").json()
+    assert after["injury_risk_flag"] is True
+
+
+def test_analytics_batch_matches_single_endpoints_with_constant_statements(client, account, statements):
+    ids = [account["account"]["id"]]
+    for i in range(3):
+        registered = client.post(
+            "/auth/register",
+            json={"username": f"a{i}", "mail": f"a{i}@example.com", "password": "secret-pass"},
+        ).json()
+        ids.append(registered["account"]["id"])
+    for account_id in ids[:3]:
+        client.post(
+            "/workouts/programs/generate",
+            json={"account_id": account_id, "goal": "endurance", "week_availability": 2},
+        )
+    client.post(
+        "/readiness",
+        json={"account_id": ids[1], "sleep_hours": 4, "fatigue": 8, "stress": 8, "soreness": 8, "pain_level": 8},
+    )
+
+    counts = []
+    for batch in (ids[:1], ids + ["unknown"]):
+        statements.clear()
+        response = client.post("/analytics/batch", json={"account_ids": batch})
+        assert response.status_code == 200
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+    results = {item["account_id"]: item for item in response.json()["results"]}
+    assert list(results) == ids + ["unknown"]
+    for account_id in ids:
+        assert results[account_id]["analytics"] == client.get(f"/analytics/{account_id}").json()
+        assert results[account_id]["progress"] == client.get(f"/progress/{account_id}").json()
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db import session as db_session
+
+
+@pytest.fixture()
+def async_statements(client, monkeypatch):
+    """Route ``get_async_db`` through an aiosqlite engine; yields the statements it runs."""
+    async_engine = create_async_engine(
+        db_session._async_database_url(os.environ["DATABASE_URL"]),
+        poolclass=NullPool,
+    )
+    executed: list[str] = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: executed.append(args[2]))
+    monkeypatch.setattr(
+        db_session,
+        "AsyncSessionLocal",
+        async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False),
+    )
+    yield executed
+
+
+def test_async_url_uses_async_drivers():
+    assert db_session._async_database_url("sqlite:////tmp/a.db") == "sqlite+aiosqlite:////tmp/a.db"
+    assert (
+        db_session._async_database_url("postgresql://u:p@db/athlia?sslmode=require&pgbouncer=true")
+        == "postgresql+asyncpg://u:p@db/athlia?ssl=require"
+    )
+
+
+def test_unsupported_databases_are_rejected_when_engines_are_created():
+    with pytest.raises(db_session.UnsupportedDatabaseError, match="mysql"):
+        db_session._create_engine("mysql://u:p@db/athlia", "primary")
+    with pytest.raises(db_session.UnsupportedDatabaseError):
+        db_session._async_database_url("mssql://u:p@db/athlia")
+
+
+def test_routes_run_on_the_async_engine(client, async_statements):
+    account = client.post(
+        "/auth/register",
+        json={"username": "Lea", "mail": "lea@example.com", "password": "secret-pass"},
+    ).json()
+    account_id = account["account"]["id"]
+    assert client.post("/auth/refresh", json={"refreshToken": account["refreshToken"]}).status_code == 200
+
+    program = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 7},
+    ).json()
+    session_id = program["sessions"][0]["id"]
+    assert client.post(f"/workouts/sessions/{session_id}/complete", json={"rpe_reported": 7}).json()["status"] == "done"
+    readiness = client.post(
+        "/readiness",
+        json={"account_id": account_id, "sleep_hours": 8, "fatigue": 1, "stress": 1, "soreness": 1, "pain_level": 0},
+    )
+    assert readiness.status_code == 200
+    assert client.get("/readiness/latest", params={"account_id": account_id}).json()["readiness_score"] == 100
+    assert client.get("/workouts/sessions/today", params={"account_id": account_id}).json()["id"] == session_id
+    assert client.get(f"/progress/{account_id}").json()["completed_sessions"] == 1
+    assert client.get(f"/analytics/{account_id}").json()["weekly_sessions_done"] == 1
+    page = client.get("/workouts/sessions", params={"account_id": account_id, "limit": 3})
+    assert len(page.json()) == 3
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    assert len(client.get("/sync", headers=headers).json()["sessions"]) == 7
+
+    assert any(s.startswith("INSERT INTO accounts") for s in async_statements)
+    assert any(s.startswith("UPDATE workout_sessions") for s in async_statements)
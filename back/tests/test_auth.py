@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from app.core.hashing import HashingOverloadedError, PasswordHasher
+
+
+def test_process_pool_hash_round_trip():
+    hasher = PasswordHasher(pool_size=1, queue_limit=4)
+    try:
+        stored = asyncio.run(hasher.hash("secret-pass"))
+        assert asyncio.run(hasher.verify("secret-pass", stored))
+        assert not asyncio.run(hasher.verify("wrong-pass", stored))
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_full_queue_fails_fast():
+    hasher = PasswordHasher(pool_size=0, queue_limit=0)
+    with pytest.raises(HashingOverloadedError):
+        asyncio.run(hasher.hash("secret-pass"))
+    assert hasher.pending == 0
+
+
+def test_login_after_register(client, account):
+    response = client.post("/auth/login", json={"mail": "LEA@example.com", "password": "secret-pass"})
+    assert response.status_code == 200
+    assert response.json()["account"]["id"] == account["account"]["id"]
+
+    response = client.post("/auth/login", json={"mail": "lea@example.com", "password": "nope"})
+    assert response.status_code == 401
+
+
+def test_login_returns_503_when_hashing_is_saturated(client, account, monkeypatch):
+    from app.core.hashing import password_hasher
+
+    monkeypatch.setattr(password_hasher, "queue_limit", 0)
+    response = client.post("/auth/login", json={"mail": "lea@example.com", "password": "secret-pass"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
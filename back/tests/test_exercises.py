@@ -0,0 +1,92 @@
+from app.db.session import SessionLocal
+from app.models import CatalogVersion, Exercise
+from app.services import exercise_catalog
+from app.services.exercise_catalog import DEFAULT_EXERCISES, refresh_catalog
+
+
+def test_exercise_listing_is_served_from_memory(client, statements):
+    statements.clear()
+    response = client.get("/workouts/exercises")
+    assert response.status_code == 200
+    assert statements == []
+    names = [exercise["name"] for exercise in response.json()]
+    assert names == sorted(name for name, *_ in DEFAULT_EXERCISES)
+
+    cached = client.get("/workouts/exercises", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+    mats = client.get("/workouts/exercises", params={"equipment": "mat", "category": "core"}).json()
+    assert [exercise["name"] for exercise in mats] == ["Gainage"]
+    exercise_id = mats[0]["id"]
+    assert client.get(f"/workouts/exercises/{exercise_id}").json()["category"] == "core"
+    assert client.get("/workouts/exercises/missing").status_code == 404
+
+
+def test_version_bump_seeds_only_missing_defaults(client, monkeypatch):
+    new_default = ("Fentes", "strength", "legs", "bodyweight", 25)
+    monkeypatch.setattr(exercise_catalog, "DEFAULT_EXERCISES", [*DEFAULT_EXERCISES, new_default])
+    with SessionLocal() as db:
+        assert refresh_catalog(db).by_category["strength"] is not None
+        assert db.query(Exercise).count() == len(DEFAULT_EXERCISES)
+
+        monkeypatch.setattr(exercise_catalog, "CATALOG_VERSION", exercise_catalog.CATALOG_VERSION + 1)
+        catalog = refresh_catalog(db)
+        assert db.query(Exercise).count() == len(DEFAULT_EXERCISES) + 1
+        assert db.get(CatalogVersion, "exercises").version == catalog.version
+        assert "Fentes" in {exercise.name for exercise in catalog.by_muscle_group["legs"]}
+
+
+def _synthetic_catalog(count: int, seed: int = 1):
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    from app.services.exercise_catalog import build_catalog
+
+    rng = np.random.default_rng(seed)
+    muscles = [f"muscle_{i}" for i in range(90)] + ["full_body"]
+    equipment = [f"gear_{i}" for i in range(70)] + ["none"]
+    rows = [
+        SimpleNamespace(
+            id=f"ex-{i}",
+            name=f"Exercise {i:05d}",
+            category=["strength", "cardio", "core", "mobility"][i % 4],
+            muscle_groups=",".join(rng.choice(muscles, size=rng.integers(1, 3), replace=False)),
+            equipment=",".join(rng.choice(equipment, size=rng.integers(1, 3), replace=False)),
+            duration_min=30,
+        )
+        for i in range(count)
+    ]
+    return build_catalog(rows, version=1)
+
+
+def test_bitmask_eligibility_matches_set_logic():
+    from app.services.exercise_selection import eligible_exercises
+
+    catalog = _synthetic_catalog(2000)
+    owned = ["gear_1", "gear_65", "gear_3", "unknown_gear"]
+    injured = ["muscle_2", "MUSCLE_80"]
+    mask = eligible_exercises(catalog, owned, injured)
+
+    for exercise, is_eligible in zip(catalog.exercises, mask):
+        needs = set(exercise.equipment) - {"none", "bodyweight"}
+        loads = set(exercise.muscle_groups)
+        expected = needs <= set(owned) and "full_body" not in loads and not loads & {"muscle_2", "muscle_80"}
+        assert is_eligible == expected, exercise
+    assert mask.any()
+    assert eligible_exercises(catalog, None, []).all()
+
+
+def test_generated_sessions_respect_equipment_and_injuries(client, account):
+    account_id = account["account"]["id"]
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    client.post("/users", json={"id_account": account_id, "equipment": "dumbbells,mat"}, headers=headers)
+    client.post("/injuries", json={"account_id": account_id, "muscle_group": "Legs", "pain_level": 6})
+
+    program = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "muscle", "week_availability": 3},
+    ).json()
+    names = {exercise["name"] for session in program["sessions"] for exercise in session["exercises"]}
+    assert names == {"Pompes", "Gainage", "Mobilite hanches"}
+    assert program["sessions"][0]["exercises"][0]["category"] == "strength"
@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+from app.services.listing import NEXT_CURSOR_HEADER
+
+
+def _generate(client, account_id, weeks=4):
+    client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 5, "weeks": weeks},
+    )
+
+
+def test_session_pages_cover_the_full_stream(client, account):
+    account_id = account["account"]["id"]
+    _generate(client, account_id)
+
+    streamed = client.get("/workouts/sessions", params={"account_id": account_id})
+    assert streamed.status_code == 200
+    full = streamed.json()
+    assert len(full) == 20
+    assert [s["session_date"] for s in full] == sorted((s["session_date"] for s in full), reverse=True)
+
+    paged, cursor = [], None
+    while True:
+        params = {"account_id": account_id, "limit": 6}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/workouts/sessions", params=params)
+        assert response.status_code == 200
+        paged.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+    assert paged == full
+
+
+def test_session_listing_date_range(client, account):
+    account_id = account["account"]["id"]
+    _generate(client, account_id)
+    start = date.today() + timedelta(days=7)
+    end = start + timedelta(days=6)
+
+    listed = client.get(
+        "/workouts/sessions",
+        params={"account_id": account_id, "from": start.isoformat(), "to": end.isoformat()},
+    ).json()
+    assert len(listed) == 5
+    assert all(start <= date.fromisoformat(s["session_date"]) <= end for s in listed)
+
+
+def test_empty_history_streams_empty_array(client, account):
+    response = client.get("/injuries", params={"account_id": account["account"]["id"]})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_injury_pages(client, account):
+    account_id = account["account"]["id"]
+    for pain in range(5):
+        client.post("/injuries", json={"account_id": account_id, "muscle_group": "knee", "pain_level": pain})
+
+    first = client.get("/injuries", params={"account_id": account_id, "limit": 3})
+    second = client.get("/injuries", params={"account_id": account_id, "cursor": first.headers[NEXT_CURSOR_HEADER]})
+    assert NEXT_CURSOR_HEADER not in second.headers
+    ids = [i["id"] for i in first.json() + second.json()]
+    assert len(ids) == len(set(ids)) == 5
+    assert ids == [i["id"] for i in client.get("/injuries", params={"account_id": account_id}).json()]
+
+
+def test_invalid_cursor_is_rejected(client, account):
+    response = client.get("/injuries", params={"account_id": account["account"]["id"], "cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.services.load_service import TrainingHistory, compute_load_metrics
+
+
+def _history(loads_by_day: dict[int, float]) -> TrainingHistory:
+    return TrainingHistory(
+        session_days=np.array(list(loads_by_day), dtype=np.int64),
+        session_loads=np.array(list(loads_by_day.values()), dtype=np.float64),
+        readiness_days=np.array([1, 1], dtype=np.int64),
+        readiness_scores=np.array([40.0, 60.0]),
+    )
+
+
+def test_load_metrics_match_naive_windows():
+    rng = np.random.default_rng(3)
+    loads = {day: float(rng.integers(100, 600)) for day in range(60) if rng.random() < 0.6}
+    metrics = compute_load_metrics(_history(loads), 60)
+    daily = np.array([loads.get(day, 0.0) for day in range(60)])
+
+    for day in (0, 6, 27, 45, 59):
+        acute_window = daily[max(0, day - 6): day + 1]
+        acute = acute_window.sum()
+        chronic = daily[max(0, day - 27): day + 1].sum() / 4
+        padded = np.concatenate((np.zeros(7 - len(acute_window)), acute_window))
+        assert metrics["acute_load"][day] == np.float64(acute)
+        assert np.isclose(metrics["chronic_load"][day], chronic)
+        assert np.isclose(metrics["acwr"][day], acute / chronic)
+        assert np.isclose(metrics["monotony"][day], padded.mean() / padded.std())
+        assert np.isclose(metrics["strain"][day], acute * padded.mean() / padded.std())
+    assert metrics["readiness"][1] == 50.0
+    assert np.isnan(metrics["readiness"][0])
+
+
+def test_constant_float_loads_have_no_monotony():
+    for load in (271.7, 333.3):
+        metrics = compute_load_metrics(_history({day: load for day in range(400)}), 400)
+        # Once the acute window is full the load never varies, so monotony is undefined.
+        assert np.isnan(metrics["monotony"][6:]).all()
+        assert np.isnan(metrics["strain"][6:]).all()
+        assert np.isfinite(metrics["monotony"][:6]).all()
+
+
+def test_load_endpoint(client, account):
+    account_id = account["account"]["id"]
+    program = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "endurance", "week_availability": 1},
+    ).json()
+    client.post(f"/workouts/sessions/{program['sessions'][0]['id']}/complete", json={"rpe_reported": 6})
+
+    today = date.today()
+    response = client.get(
+        f"/analytics/{account_id}/load",
+        params={"from": (today - timedelta(days=2)).isoformat(), "to": today.isoformat()},
+    )
+    assert response.status_code == 200
+    points = response.json()["points"]
+    assert [p["date"] for p in points][-1] == today.isoformat()
+    assert points[-1]["daily_load"] == 45 * 6
+    assert points[-1]["acwr"] == 4.0
+    assert points[0]["acwr"] is None
+
+    bad = client.get(f"/analytics/{account_id}/load", params={"from": today.isoformat(), "to": "2000-01-01"})
+    assert bad.status_code == 400
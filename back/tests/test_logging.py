@@ -0,0 +1,67 @@
+import io
+import json
+import logging
+from dataclasses import replace
+from logging.handlers import QueueHandler
+
+import pytest
+
+from app.core import logging as app_logging
+from app.core.logging import ACCESS_LOGGER, setup_logging, should_log_access, stop_logging
+
+
+@pytest.fixture()
+def log_stream():
+    stream = io.StringIO()
+    setup_logging(stream)
+    yield stream
+    setup_logging()
+
+
+def test_records_are_written_by_the_listener_thread(log_stream):
+    root_handlers = logging.getLogger().handlers
+    assert sum(isinstance(handler, QueueHandler) for handler in root_handlers) == 1
+
+    logging.getLogger("athlia-api").info("hello %s", "world")
+    stop_logging()
+    assert "INFO athlia-api hello world" in log_stream.getvalue()
+
+
+def test_json_output_keeps_extra_fields(monkeypatch):
+    monkeypatch.setattr(app_logging, "settings", replace(app_logging.settings, log_json=True))
+    stream = io.StringIO()
+    setup_logging(stream)
+    try:
+        logging.getLogger(ACCESS_LOGGER).info("GET /health -> 200", extra={"route": "/health", "status": 200})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("athlia-api").exception("failed")
+        stop_logging()
+    finally:
+        monkeypatch.undo()
+        setup_logging()
+
+    access, failure = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert access["message"] == "GET /health -> 200"
+    assert (access["logger"], access["route"], access["status"]) == (ACCESS_LOGGER, "/health", 200)
+    assert failure["level"] == "ERROR"
+    assert "ValueError: boom" in failure["exc_info"]
+
+
+def test_access_sampling_keeps_errors_and_slow_requests(monkeypatch):
+    sampled = replace(app_logging.settings, access_log_sample_rate=0.0, access_log_sample_routes=("/health",))
+    monkeypatch.setattr(app_logging, "settings", sampled)
+    assert not should_log_access("/health", 200, 3)
+    assert should_log_access("/health", 503, 3)
+    assert should_log_access("/health", 200, sampled.access_log_slow_ms)
+    assert should_log_access("/analytics/{account_id}", 200, 3)
+
+
+def test_sampled_requests_skip_the_access_log(client, caplog, monkeypatch):
+    monkeypatch.setattr(app_logging, "settings", replace(app_logging.settings, access_log_sample_rate=0.0))
+    with caplog.at_level(logging.INFO, logger=ACCESS_LOGGER):
+        client.get("/health")
+        client.get("/no-such-page")
+    access = [record for record in caplog.records if record.name == ACCESS_LOGGER]
+    assert [(record.route, record.status) for record in access] == [("<unmatched>", 404)]
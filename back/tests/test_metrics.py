@@ -0,0 +1,104 @@
+import json
+import time
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import text
+
+from app import main
+from app.core import metrics
+from app.core.metrics import request_metrics
+from app.db.query_stats import track_queries
+from app.db.session import SessionLocal
+
+
+@pytest.fixture()
+def fresh_metrics(client):
+    request_metrics.reset()
+    yield request_metrics
+    request_metrics.reset()
+
+
+def _line(body: str, prefix: str) -> str:
+    return next(line for line in body.splitlines() if line.startswith(prefix))
+
+
+def test_requests_are_grouped_by_route_template(client, account, fresh_metrics):
+    client.get("/analytics/first-account")
+    client.get("/analytics/second-account")
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    route = 'method="GET",route="/analytics/{account_id}"'
+    assert _line(body, f"http_request_duration_seconds_count{{{route}}}").endswith(" 2")
+    assert _line(body, f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}').endswith(" 2")
+    assert _line(body, f'http_requests_total{{{route},status="200"}}').endswith(" 2")
+    assert _line(body, 'http_requests_total{method="GET",route="<unmatched>",status="404"}').endswith(" 1")
+    assert "first-account" not in body
+    assert _line(body, "http_requests_in_flight ").endswith(" 1")  # The scrape itself.
+    assert 'db_pool_checkouts_total{engine="primary"' in body
+
+
+def test_snapshots_from_other_workers_are_merged(client, fresh_metrics, monkeypatch, tmp_path):
+    monkeypatch.setattr(metrics, "settings", replace(metrics.settings, metrics_dir=str(tmp_path)))
+    other = metrics.RequestMetrics()
+    other.observe("GET", "/health", 200, 0.002)
+    other.observe("GET", "/health", 200, 0.3)
+    other.in_flight = 4
+    stale = {**other.snapshot(), "taken_at": time.time() - 3600}
+    (tmp_path / "metrics-1.json").write_text(json.dumps(other.snapshot()))
+    (tmp_path / "metrics-2.json").write_text(json.dumps(stale))
+
+    client.get("/health")
+    body = client.get("/metrics").text
+
+    route = 'method="GET",route="/health"'
+    assert _line(body, f"http_request_duration_seconds_count{{{route}}}").endswith(" 5")
+    assert int(_line(body, f'http_request_duration_seconds_bucket{{{route},le="0.005"}}').split()[-1]) >= 2
+    # Four in flight from the live worker plus this scrape; the stale worker is ignored.
+    assert _line(body, "http_requests_in_flight ").endswith(" 5")
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 3
+
+
+def test_sql_usage_is_reported_per_route(client, account, fresh_metrics, monkeypatch):
+    monkeypatch.setattr(main, "settings", replace(main.settings, debug=True))
+    response = client.post("/auth/login", json={"mail": "lea@example.com", "password": "secret-pass"})
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+
+    body = client.get("/metrics").text
+    assert _line(body, 'http_request_db_statements_total{method="POST",route="/auth/login"}').endswith(" 1")
+    assert _line(body, 'http_request_db_seconds_total{method="POST",route="/auth/login"}')
+
+
+def test_track_queries_counts_repeated_statements():
+    with track_queries() as queries, SessionLocal() as db:
+        for _ in range(3):
+            db.execute(text("SELECT 1"))
+    assert queries.statements == 3
+    assert queries.seconds > 0
+    assert queries.most_repeated() == ("SELECT 1", 3)
+
+
+def test_repeated_statements_are_logged(client, account, caplog, monkeypatch):
+    monkeypatch.setattr(main, "settings", replace(main.settings, n_plus_one_threshold=1))
+    client.post("/auth/login", json={"mail": "lea@example.com", "password": "secret-pass"})
+    assert any("Possible N+1 on POST /auth/login" in record.getMessage() for record in caplog.records)
+
+
+def test_streamed_listing_is_recorded_after_its_body(client, account, fresh_metrics):
+    account_id = account["account"]["id"]
+    client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 3, "weeks": 2},
+    )
+    assert len(client.get("/workouts/sessions", params={"account_id": account_id}).json()) == 6
+
+    body = client.get("/metrics").text
+    route = 'method="GET",route="/workouts/sessions"'
+    # The listing's SELECT runs while the body streams, after the route returned.
+    assert _line(body, f"http_request_db_statements_total{{{route}}}").endswith(" 1")
+    assert _line(body, f"http_request_duration_seconds_count{{{route}}}").endswith(" 1")
+    assert _line(body, "http_requests_in_flight ").endswith(" 1")
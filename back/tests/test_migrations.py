@@ -0,0 +1,52 @@
+from datetime import date, datetime
+
+from sqlalchemy import inspect, select, text
+
+from app.db.base import migrate
+from app.db.session import SessionLocal, engine
+from app.models import AccountTrainingRollup, ReadinessLog
+
+
+def test_migrate_upgrades_an_old_database_and_is_idempotent(client, account):
+    account_id = account["account"]["id"]
+
+    def log(log_id: str, updated_at: datetime, score: int) -> dict:
+        return {
+            "id": log_id,
+            "account_id": account_id,
+            "log_date": date.today(),
+            "sleep_hours": 7,
+            "fatigue": 3,
+            "stress": 3,
+            "soreness": 3,
+            "pain_level": 1,
+            "readiness_score": score,
+            "ai_advice": "ok",
+            "updated_at": updated_at,
+        }
+
+    # A database from before the rollups table and the one-log-per-day index.
+    with SessionLocal() as db:
+        db.execute(text("DROP INDEX uq_readiness_logs_account_day"))
+        db.execute(text("DROP TABLE account_training_rollups"))
+        db.execute(
+            ReadinessLog.__table__.insert(),
+            [log("old", datetime(2024, 5, 1, 8), 10), log("new", datetime(2024, 5, 1, 9), 90)],
+        )
+        db.commit()
+
+    applied = migrate()
+    assert applied["duplicate readiness logs removed"] == 1
+    assert applied["indexes created"] == ["uq_readiness_logs_account_day"]
+    assert applied["account rollups rebuilt"] == 1
+    assert "uq_readiness_logs_account_day" in {index["name"] for index in inspect(engine).get_indexes("readiness_logs")}
+    with SessionLocal() as db:
+        assert db.scalars(select(ReadinessLog.id)).all() == ["new"]
+        assert db.get(AccountTrainingRollup, account_id).readiness_sum == 90
+
+    assert migrate() == {
+        "updated_at added to": [],
+        "duplicate readiness logs removed": 0,
+        "indexes created": [],
+        "account rollups rebuilt": 1,
+    }
@@ -0,0 +1,53 @@
+from dataclasses import replace
+
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.db import pool
+
+
+def _options(monkeypatch, url: str, pgbouncer: bool, **overrides) -> dict:
+    monkeypatch.setattr(pool, "settings", replace(pool.settings, **overrides))
+    return pool.engine_options(make_url(url), "test", pgbouncer=pgbouncer, is_async="asyncpg" in url)
+
+
+def test_pool_settings_are_applied(monkeypatch):
+    options = _options(
+        monkeypatch,
+        "postgresql://db/athlia",
+        False,
+        db_pool_size=12,
+        db_max_overflow=3,
+        db_pool_recycle_seconds=600,
+        db_pre_ping="pessimistic",
+    )
+    assert issubclass(options["poolclass"], QueuePool)
+    assert (options["pool_size"], options["max_overflow"], options["pool_recycle"]) == (12, 3, 600)
+    assert options["pool_pre_ping"] is True
+    with pytest.raises(ValueError):
+        _options(monkeypatch, "postgresql://db/athlia", False, db_pre_ping="sometimes")
+
+
+def test_pgbouncer_mode(monkeypatch):
+    monkeypatch.setattr(pool, "settings", replace(pool.settings, db_pgbouncer=False))
+    assert pool.uses_pgbouncer("postgresql://db:6543/athlia?pgbouncer=true")
+    assert not pool.uses_pgbouncer("postgresql://db/athlia")
+
+    options = _options(monkeypatch, "postgresql+asyncpg://db/athlia", True, db_pgbouncer_pool_size=0)
+    assert issubclass(options["poolclass"], NullPool)
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+
+    small = _options(monkeypatch, "postgresql://db/athlia", True, db_pgbouncer_pool_size=2)
+    assert (small["pool_size"], small["max_overflow"]) == (2, 0)
+    assert "connect_args" not in small
+
+
+def test_checkouts_are_reported(client):
+    before = client.get("/health/db").json()["primary"]["checkouts"]
+    client.get("/progress/nobody")
+    stats = client.get("/health/db").json()["primary"]
+    assert stats["pool"] == "QueuePool"
+    assert stats["checkouts"] > before
+    assert stats["timeouts"] == 0
@@ -0,0 +1,58 @@
+from app.core.security import create_token_pair
+
+
+def _headers(account) -> dict[str, str]:
+    return {"Authorization": f"Bearer {account['token']}"}
+
+
+def test_post_creates_then_replaces_the_profile(client, account, statements):
+    account_id = account["account"]["id"]
+    created = client.post(
+        "/users",
+        json={"id_account": account_id, "sport": "trail", "birthdate": "1994-05-02T00:00:00Z", "height_cm": 170},
+        headers=_headers(account),
+    ).json()
+    assert created["created"] is True
+    assert created["birthdate"] == "1994-05-02"
+
+    statements.clear()
+    replaced = client.post("/users", json={"id_account": account_id, "sport": "rowing"}, headers=_headers(account)).json()
+    assert len(statements) == 1
+    assert replaced["created"] is False
+    assert replaced["id"] == created["id"]
+    assert (replaced["sport"], replaced["height_cm"], replaced["birthdate"]) == ("rowing", None, None)
+
+
+def test_patch_writes_only_the_supplied_fields(client, account):
+    account_id = account["account"]["id"]
+    client.post(
+        "/users",
+        json={"id_account": account_id, "sport": "trail", "height_cm": 170, "equipment": "mat"},
+        headers=_headers(account),
+    )
+
+    patched = client.patch(f"/users/{account_id}", json={"sport": "rowing", "equipment": None}, headers=_headers(account))
+    assert patched.status_code == 200
+    body = patched.json()
+    assert (body["sport"], body["height_cm"], body["equipment"], body["created"]) == ("rowing", 170, None, False)
+
+
+def test_patch_creates_a_missing_profile(client, account):
+    account_id = account["account"]["id"]
+    body = client.patch(f"/users/{account_id}", json={"week_availability": 3}, headers=_headers(account)).json()
+    assert body["created"] is True
+    assert body["week_availability"] == 3
+
+
+def test_patch_rejects_other_accounts_and_bad_dates(client, account):
+    account_id = account["account"]["id"]
+    assert client.patch("/users/someone-else", json={"sport": "x"}, headers=_headers(account)).status_code == 403
+    assert client.patch(f"/users/{account_id}", json={"sport": "x"}).status_code == 401
+    response = client.patch(f"/users/{account_id}", json={"birthdate": "not-a-date"}, headers=_headers(account))
+    assert response.status_code == 400
+
+
+def test_profile_for_a_missing_account_is_rejected(client):
+    token = create_token_pair("missing-account")["token"]
+    response = client.post("/users", json={"id_account": "missing-account"}, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
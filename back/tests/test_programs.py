@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+from app.services.program_service import plan_training_offsets, plan_week
+
+
+def test_training_days_are_spread_over_the_week():
+    assert plan_training_offsets(1) == [0]
+    assert plan_training_offsets(3) == [0, 2, 5]
+    assert plan_training_offsets(7) == list(range(7))
+
+
+def test_mesocycle_ramps_then_deloads():
+    weeks = [plan_week(6, 45, week) for week in range(8)]
+    assert [intensity for intensity, _, _ in weeks] == [6, 7, 8, 4, 6, 7, 8, 4]
+    assert [deload for _, _, deload in weeks] == [False, False, False, True] * 2
+    assert weeks[3][1] == 31
+
+
+def test_generate_twelve_week_program(client, account, statements):
+    account_id = account["account"]["id"]
+    client.get("/workouts/exercises")
+    statements.clear()
+    response = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 6, "weeks": 12},
+    )
+    assert response.status_code == 200
+    program = response.json()
+    assert program["title"] == "Plan Performance 6j/semaine - 12 semaines"
+    sessions = program["sessions"]
+    assert len(sessions) == 72
+    dates = [date.fromisoformat(s["session_date"]) for s in sessions]
+    assert dates == sorted(dates)
+    assert dates[-1] - dates[0] < timedelta(weeks=12)
+    assert sessions[18]["name"].endswith("(decharge)")
+    assert sum(1 for s in statements if "INSERT INTO workout_sessions" in s) == 1
+    assert not any(s.lstrip().startswith("SELECT workout_sessions") for s in statements)
+
+    listed = client.get("/workouts/sessions", params={"account_id": account_id}).json()
+    assert len(listed) == 72
@@ -0,0 +1,38 @@
+from app.db.session import SessionLocal
+from app.models import AccountTrainingRollup
+from app.services.rollups import ROLLUP_COUNTERS, rebuild_rollups
+
+
+def _rollup_snapshot(account_id: str) -> dict[str, int]:
+    with SessionLocal() as db:
+        rollup = db.get(AccountTrainingRollup, account_id)
+        return {name: getattr(rollup, name) for name in ROLLUP_COUNTERS}
+
+
+def test_progress_follows_writes_and_matches_rebuild(client, account):
+    account_id = account["account"]["id"]
+    assert client.get(f"/progress/{account_id}").json()["completed_sessions"] == 0
+
+    program = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "endurance", "week_availability": 4},
+    ).json()
+    first, second = program["sessions"][0]["id"], program["sessions"][1]["id"]
+    client.post(f"/workouts/sessions/{first}/complete", json={"rpe_reported": 6})
+    client.post(f"/workouts/sessions/{first}/complete", json={"rpe_reported": 8})
+    client.post(f"/workouts/sessions/{second}/complete", json={"rpe_reported": 5})
+    client.post(
+        "/readiness",
+        json={"account_id": account_id, "sleep_hours": 8, "fatigue": 2, "stress": 2, "soreness": 1, "pain_level": 0},
+    )
+
+    progress = client.get(f"/progress/{account_id}").json()
+    assert progress["completed_sessions"] == 2
+    assert progress["completion_rate"] == 50.0
+    assert progress["average_rpe"] == 6.5
+    assert progress["readiness_average"] == 100.0
+
+    incremental = _rollup_snapshot(account_id)
+    with SessionLocal() as db:
+        assert rebuild_rollups(db) == 1
+    assert _rollup_snapshot(account_id) == incremental
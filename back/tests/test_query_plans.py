@@ -0,0 +1,112 @@
+"""EXPLAIN every statement the routers issue and fail on full table scans."""
+import json
+import re
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.models import Base
+
+# Tables read in full by design (the in-memory exercise catalog).
+FULL_SCAN_ALLOWED = {"exercises", "catalog_versions"}
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)")
+_POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+@pytest.fixture()
+def executed():
+    captured: list[tuple[str, object]] = []
+
+    def _record(_conn, _cursor, statement, parameters, _context, executemany) -> None:
+        captured.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield captured
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+def _scanned_tables(statement: str, parameters) -> set[str]:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if engine.dialect.name == "postgresql":
+            cursor.execute("SET enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            pattern, lines = _POSTGRES_SCAN, [row[0] for row in cursor.fetchall()]
+        else:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            pattern, lines = _SQLITE_SCAN, [row[-1] for row in cursor.fetchall()]
+    finally:
+        raw.rollback()
+        raw.close()
+    return {match.group(1) for line in lines if (match := pattern.search(line))}
+
+
+def _exercise_routes(client, account) -> None:
+    account_id = account["account"]["id"]
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    client.post("/auth/login", json={"mail": "lea@example.com", "password": "secret-pass"})
+    client.post("/users", json={"id_account": account_id, "equipment": "mat"}, headers=headers)
+    client.post("/injuries", json={"account_id": account_id, "muscle_group": "knee", "pain_level": 3})
+    program = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 4, "weeks": 2},
+    ).json()
+    session_ids = [s["id"] for s in program["sessions"]]
+    client.post(f"/workouts/sessions/{session_ids[0]}/complete", json={"rpe_reported": 6})
+    client.post(
+        "/workouts/sessions/complete/batch",
+        json={"items": [{"session_id": session_ids[1], "rpe_reported": 5}]},
+        headers=headers,
+    )
+    client.post(
+        "/readiness",
+        json={"account_id": account_id, "sleep_hours": 7, "fatigue": 3, "stress": 2, "soreness": 2, "pain_level": 1},
+    )
+    lines = [
+        json.dumps(
+            {
+                "account_id": account_id,
+                "log_date": (date.today() - timedelta(days=offset)).isoformat(),
+                "sleep_hours": 7,
+                "fatigue": 2,
+                "stress": 2,
+                "soreness": 1,
+                "pain_level": 0,
+            }
+        )
+        for offset in range(1, 4)
+    ]
+    client.post("/readiness/bulk", content="\n".join(lines), headers={"Content-Type": "application/x-ndjson"})
+    injury_id = client.get("/injuries", params={"account_id": account_id}).json()[0]["id"]
+    client.patch(f"/injuries/{injury_id}/resolve")
+
+    client.get("/readiness/latest", params={"account_id": account_id})
+    client.get("/workouts/sessions/today", params={"account_id": account_id})
+    client.get("/workouts/sessions", params={"account_id": account_id})
+    page = client.get("/workouts/sessions", params={"account_id": account_id, "limit": 2})
+    client.get("/workouts/sessions", params={"account_id": account_id, "cursor": page.headers["X-Next-Cursor"]})
+    client.get("/injuries", params={"account_id": account_id, "limit": 1})
+    client.get(f"/progress/{account_id}")
+    client.get(f"/analytics/{account_id}")
+    client.post("/analytics/batch", json={"account_ids": [account_id, "other"]})
+    client.get(f"/analytics/{account_id}/load")
+    client.get("/sync", headers=headers)
+
+
+def test_router_queries_use_indexes(client, account, executed):
+    _exercise_routes(client, account)
+
+    checked = 0
+    offenders = {}
+    for statement, parameters in executed:
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            continue
+        checked += 1
+        scanned = _scanned_tables(statement, parameters) & set(Base.metadata.tables) - FULL_SCAN_ALLOWED
+        if scanned:
+            offenders[statement] = sorted(scanned)
+    assert checked > 20
+    assert not offenders, json.dumps(offenders, indent=2)
@@ -0,0 +1,63 @@
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import session as db_session
+from app.models import Base
+
+READINESS = {"sleep_hours": 8, "fatigue": 1, "stress": 1, "soreness": 1, "pain_level": 0}
+
+
+@pytest.fixture()
+def replica(client, monkeypatch):
+    """A second, empty SQLite file standing in for a replica that has not caught up."""
+    path = os.path.join(os.path.dirname(db_session.engine.url.database), "replica.db")
+    replica_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.drop_all(bind=replica_engine)
+    Base.metadata.create_all(bind=replica_engine)
+    monkeypatch.setattr(db_session, "read_engine", replica_engine)
+    monkeypatch.setattr(db_session, "ReadSessionLocal", sessionmaker(autoflush=False, expire_on_commit=False, bind=replica_engine))
+    yield replica_engine
+    replica_engine.dispose()
+
+
+def test_reads_go_to_replica_unless_client_just_wrote(client, account, replica):
+    account_id = account["account"]["id"]
+    write = client.post("/readiness", json={"account_id": account_id, **READINESS})
+    primary_until = write.headers[db_session.PRIMARY_UNTIL_HEADER]
+    assert float(primary_until) > time.time()
+
+    params = {"account_id": account_id}
+    assert client.get("/readiness/latest", params=params).status_code == 404
+    assert client.get("/workouts/sessions", params=params).json() == []
+
+    sticky = {db_session.PRIMARY_UNTIL_HEADER: primary_until}
+    assert client.get("/readiness/latest", params=params, headers=sticky).status_code == 200
+    assert client.get(f"/progress/{account_id}", headers=sticky).json()["readiness_average"] == 100.0
+
+    expired = {db_session.PRIMARY_UNTIL_HEADER: f"{time.time() - 1:.3f}"}
+    assert client.get("/readiness/latest", params=params, headers=expired).status_code == 404
+    forged = {db_session.PRIMARY_UNTIL_HEADER: f"{time.time() + 365 * 86400:.3f}"}
+    assert client.get("/readiness/latest", params=params, headers=forged).status_code == 404
+
+
+def test_no_header_without_replica(client, account):
+    write = client.post("/readiness", json={"account_id": account["account"]["id"], **READINESS})
+    assert db_session.PRIMARY_UNTIL_HEADER not in write.headers
+
+
+def test_replica_reads_do_not_fill_the_analytics_cache(client, account, replica):
+    account_id = account["account"]["id"]
+    write = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "muscle", "week_availability": 3},
+    )
+    sticky = {db_session.PRIMARY_UNTIL_HEADER: write.headers[db_session.PRIMARY_UNTIL_HEADER]}
+
+    # The lagging replica answers, but its result must not be cached for clients pinned to the primary.
+    assert client.get(f"/analytics/{account_id}").json()["weekly_sessions_planned"] == 0
+    assert client.get(f"/analytics/{account_id}", headers=sticky).json()["weekly_sessions_planned"] == 3
+    assert client.get(f"/analytics/{account_id}").json()["weekly_sessions_planned"] == 3
@@ -0,0 +1,160 @@
+import json
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select, text
+
+from app.db.session import SessionLocal
+from app.models import ReadinessLog, WorkoutSession
+from app.services.adaptation import (
+    build_advice,
+    build_advice_batch,
+    compute_readiness_score,
+    compute_readiness_scores,
+    suggest_intensity,
+    suggest_intensity_sql,
+)
+from app.services.readiness_service import BULK_MAX_LINE_BYTES, dedupe_readiness_logs
+
+
+def test_batch_scoring_matches_scalar_rules():
+    rng = np.random.default_rng(5)
+    n = 2000
+    sleep = np.round(rng.uniform(0, 12, n), 1)
+    fatigue, stress, soreness, pain = (rng.integers(0, 11, n) for _ in range(4))
+    scores = compute_readiness_scores(sleep, fatigue, stress, soreness, pain)
+    advice = build_advice_batch(scores, pain)
+    for i in range(n):
+        expected = compute_readiness_score(float(sleep[i]), int(fatigue[i]), int(stress[i]), int(soreness[i]), int(pain[i]))
+        assert scores[i] == expected
+        assert advice[i] == build_advice(expected, int(pain[i]))
+
+
+def test_sql_intensity_matches_python_rules(client):
+    from sqlalchemy import literal, select
+
+    with SessionLocal() as db:
+        for base in range(1, 11):
+            for score in (0, 29, 30, 49, 50, 74, 75, 100):
+                for pain in (0, 6, 7, 10):
+                    sql_value = db.scalar(select(suggest_intensity_sql(literal(base), literal(score), literal(pain))))
+                    assert sql_value == suggest_intensity(base, score, pain), (base, score, pain)
+
+
+def test_bulk_ingestion_reports_per_record_errors(client, account):
+    account_id = account["account"]["id"]
+    client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "muscle", "week_availability": 1},
+    )
+    today = date.today()
+    good = {"account_id": account_id, "sleep_hours": 8, "fatigue": 1, "stress": 1, "soreness": 1, "pain_level": 0}
+    lines = [
+        json.dumps({**good, "log_date": (today - timedelta(days=2)).isoformat()}),
+        "{not json",
+        json.dumps({**good, "log_date": today.isoformat(), "fatigue": 42}),
+        "",
+        json.dumps({**good, "account_id": "ghost", "log_date": today.isoformat()}),
+        json.dumps({**good, "log_date": today.isoformat(), "pain_level": 8}),
+    ]
+    response = client.post("/readiness/bulk", content="\n".join(lines).encode())
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["accepted"], body["rejected"]) == (2, 3)
+    assert [error["line"] for error in body["errors"]] == [2, 3, 5]
+    assert body["errors"][2]["error"] == "Unknown account"
+
+    with SessionLocal() as db:
+        assert db.query(ReadinessLog).filter(ReadinessLog.account_id == account_id).count() == 2
+        session = db.query(WorkoutSession).filter(WorkoutSession.account_id == account_id).one()
+        assert session.adjusted_intensity == suggest_intensity(session.planned_intensity, compute_readiness_score(8, 1, 1, 1, 8), 8)
+
+
+def test_bulk_ingestion_rejects_overlong_lines_without_buffering_them(client, account):
+    account_id = account["account"]["id"]
+    today = date.today()
+    good = {"account_id": account_id, "sleep_hours": 8, "fatigue": 1, "stress": 1, "soreness": 1, "pain_level": 0}
+    body = "\n".join(
+        [
+            json.dumps({**good, "log_date": (today - timedelta(days=1)).isoformat()}),
+            json.dumps({**good, "log_date": today.isoformat(), "ai_advice": "x" * BULK_MAX_LINE_BYTES}),
+            json.dumps({**good, "log_date": today.isoformat()}),
+            "y" * (BULK_MAX_LINE_BYTES + 1),
+        ]
+    ).encode()
+    # Small chunks so lines, and the overlong ones, span several reads.
+    chunks = (body[i : i + 100] for i in range(0, len(body), 100))
+    response = client.post("/readiness/bulk", content=chunks)
+    assert response.status_code == 200
+    assert response.json() == {
+        "accepted": 2,
+        "rejected": 2,
+        "errors": [
+            {"line": 2, "error": f"Line exceeds {BULK_MAX_LINE_BYTES} bytes"},
+            {"line": 4, "error": f"Line exceeds {BULK_MAX_LINE_BYTES} bytes"},
+        ],
+    }
+
+
+def test_resubmitting_readiness_replaces_the_day_log(client, account, statements):
+    account_id = account["account"]["id"]
+    client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "muscle", "week_availability": 1},
+    )
+    tired = {"account_id": account_id, "sleep_hours": 5, "fatigue": 6, "stress": 5, "soreness": 4, "pain_level": 2}
+    client.post("/readiness", json=tired)
+
+    statements.clear()
+    response = client.post("/readiness", json={**tired, "sleep_hours": 8, "fatigue": 1, "stress": 1, "soreness": 0, "pain_level": 0})
+    assert response.json()["readiness_score"] == 100
+    writes = [s for s in statements if not s.lstrip().upper().startswith(("BEGIN", "COMMIT"))]
+    assert len(writes) == 3
+
+    with SessionLocal() as db:
+        assert db.query(ReadinessLog).filter(ReadinessLog.account_id == account_id).count() == 1
+        session = db.query(WorkoutSession).filter(WorkoutSession.account_id == account_id).one()
+        assert session.adjusted_intensity == suggest_intensity(session.planned_intensity, 100, 0)
+    assert client.get(f"/progress/{account_id}").json()["readiness_average"] == 100.0
+    assert client.get("/readiness/latest", params={"account_id": account_id}).json()["readiness_score"] == 100
+
+
+def test_dedupe_keeps_the_latest_log_of_each_day(client, account):
+    account_id = account["account"]["id"]
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    stamp = datetime(2024, 5, 1, 8)
+
+    def log(log_id: str, day: date, updated_at: datetime, score: int) -> dict:
+        return {
+            "id": log_id,
+            "account_id": account_id,
+            "log_date": day,
+            "sleep_hours": 7,
+            "fatigue": 3,
+            "stress": 3,
+            "soreness": 3,
+            "pain_level": 1,
+            "readiness_score": score,
+            "ai_advice": "ok",
+            "updated_at": updated_at,
+        }
+
+    with SessionLocal() as db:
+        db.execute(text("DROP INDEX uq_readiness_logs_account_day"))
+        # The older submission of each day has the larger uuid.
+        db.execute(
+            ReadinessLog.__table__.insert(),
+            [
+                log("ffffffff-old", today, stamp, 10),
+                log("00000000-new", today, stamp + timedelta(hours=2), 90),
+                # Same ``updated_at``, as left by ``migrate_sync_columns``: insertion order decides.
+                log("ffffffff-old-y", yesterday, stamp, 20),
+                log("00000000-new-y", yesterday, stamp, 80),
+            ],
+        )
+        db.commit()
+
+        assert dedupe_readiness_logs(db) == 2
+        kept = db.execute(select(ReadinessLog.log_date, ReadinessLog.readiness_score).order_by(ReadinessLog.log_date))
+        assert kept.all() == [(yesterday, 80), (today, 90)]
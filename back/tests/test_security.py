@@ -0,0 +1,35 @@
+import time
+
+from app.core import security
+from app.core.security import TokenCache, create_token, parse_token, parse_token_cached
+
+
+def test_parse_token_rejects_tampered_signature():
+    token = create_token("acc-1", "access", 60)
+    assert parse_token(token)["sub"] == "acc-1"
+    assert parse_token(token[:-2] + "xx") is None
+
+
+def test_cached_token_is_not_served_after_expiry(monkeypatch):
+    security.token_cache.clear()
+    token = create_token("acc-1", "access", 60)
+    payload = parse_token_cached(token)
+    assert payload is not None
+    assert security.token_cache.get(token) is payload
+
+    now = time.time()
+    monkeypatch.setattr(security.time, "time", lambda: now + 61)
+    assert parse_token_cached(token) is None
+    assert len(security.token_cache) == 0
+
+
+def test_token_cache_is_bounded_lru():
+    cache = TokenCache(max_size=2)
+    exp = int(time.time()) + 60
+    for name in ("a", "b"):
+        cache.put(name, {"sub": name, "type": "access", "exp": exp})
+    assert cache.get("a") is not None
+    cache.put("c", {"sub": "c", "type": "access", "exp": exp})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
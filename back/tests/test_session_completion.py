@@ -0,0 +1,71 @@
+from app.db.session import SessionLocal
+from app.models import AccountTrainingRollup
+from app.services.rollups import ROLLUP_COUNTERS, rebuild_rollups
+
+
+def _rollup(account_id):
+    with SessionLocal() as db:
+        rollup = db.get(AccountTrainingRollup, account_id)
+        return {name: getattr(rollup, name) for name in ROLLUP_COUNTERS}
+
+
+def test_batch_completion_is_idempotent(client, account, statements):
+    account_id = account["account"]["id"]
+    program = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 4},
+    ).json()
+    first, second, third = (s["id"] for s in program["sessions"][:3])
+    client.post(f"/workouts/sessions/{third}/complete", json={"rpe_reported": 4})
+
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    batch = {
+        "items": [
+            {"session_id": first, "rpe_reported": 5},
+            {"session_id": second, "rpe_reported": 6, "notes": "legs heavy"},
+            {"session_id": first, "rpe_reported": 7},
+            {"session_id": third, "rpe_reported": 8},
+            {"session_id": "missing", "rpe_reported": 3},
+        ],
+    }
+    statements.clear()
+    response = client.post("/workouts/sessions/complete/batch", json=batch, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["completed"] == 3
+    assert [r["status"] for r in body["results"]] == ["superseded", "completed", "completed", "completed", "not_found"]
+    assert sum(1 for s in statements if s.lstrip().startswith("UPDATE workout_sessions")) == 1
+
+    progress = client.get(f"/progress/{account_id}").json()
+    assert progress["completed_sessions"] == 3
+    assert progress["average_rpe"] == 7.0
+    incremental = _rollup(account_id)
+    with SessionLocal() as db:
+        rebuild_rollups(db)
+    assert _rollup(account_id) == incremental
+
+    statements.clear()
+    replay = client.post("/workouts/sessions/complete/batch", json=batch, headers=headers).json()
+    assert replay["completed"] == 0
+    assert [r["status"] for r in replay["results"]][1:4] == ["unchanged"] * 3
+    assert not any(s.lstrip().startswith(("UPDATE", "INSERT")) for s in statements)
+
+
+def test_batch_ignores_other_accounts_sessions(client, account):
+    account_id = account["account"]["id"]
+    session_id = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 1},
+    ).json()["sessions"][0]["id"]
+
+    other = client.post(
+        "/auth/register", json={"username": "Max", "mail": "max@example.com", "password": "secret-pass"}
+    ).json()
+
+    batch = {"items": [{"session_id": session_id, "rpe_reported": 5}]}
+    response = client.post(
+        "/workouts/sessions/complete/batch", json=batch, headers={"Authorization": f"Bearer {other['token']}"}
+    )
+    assert response.json()["results"] == [{"session_id": session_id, "status": "not_found"}]
+    assert client.get(f"/progress/{account_id}").json()["completed_sessions"] == 0
+    assert client.post("/workouts/sessions/complete/batch", json=batch).status_code == 401
@@ -0,0 +1,138 @@
+"""Upper bounds on SQL statements per endpoint.
+
+The data is sized so that a per-row query (N+1) in any listing or batch endpoint
+pushes it over its budget. New routes must be added to ``BUDGETS``.
+
+Routes return ``FastJSONResponse`` without runtime validation, so every response
+is also checked here against the route's ``response_model``.
+"""
+import json
+from datetime import date, timedelta
+
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+from app.main import app
+
+BUDGETS = {
+    ("GET", "/"): 0,
+    ("GET", "/health"): 0,
+    ("GET", "/health/db"): 0,
+    ("GET", "/metrics"): 0,
+    ("POST", "/auth/register"): 2,
+    ("POST", "/auth/login"): 1,
+    ("POST", "/auth/refresh"): 1,
+    ("POST", "/users"): 1,
+    ("PATCH", "/users/{account_id}"): 1,
+    ("POST", "/workouts/programs/generate"): 7,
+    ("GET", "/workouts/sessions/today"): 1,
+    ("POST", "/workouts/sessions/{session_id}/complete"): 3,
+    ("POST", "/workouts/sessions/complete/batch"): 3,
+    ("GET", "/workouts/sessions"): 1,
+    ("GET", "/workouts/exercises"): 0,
+    ("GET", "/workouts/exercises/{exercise_id}"): 0,
+    ("POST", "/readiness"): 3,
+    ("POST", "/readiness/bulk"): 5,
+    ("GET", "/readiness/latest"): 1,
+    ("POST", "/injuries"): 1,
+    ("GET", "/injuries"): 1,
+    ("PATCH", "/injuries/{injury_id}/resolve"): 1,
+    ("GET", "/progress/{account_id}"): 1,
+    ("GET", "/analytics/{account_id}"): 4,
+    ("POST", "/analytics/batch"): 4,
+    ("GET", "/analytics/{account_id}/load"): 1,
+    ("GET", "/sync"): 4,
+}
+
+
+RESPONSE_MODELS = {
+    (method, route.path): TypeAdapter(route.response_model)
+    for route in app.routes
+    if isinstance(route, APIRoute) and route.response_model is not None
+    for method in route.methods
+}
+
+
+def test_every_route_has_a_budget():
+    routes = {(method, route.path) for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+    assert routes == set(BUDGETS)
+
+
+def test_endpoints_stay_within_their_budgets(client, statement_budget):
+    def call(method: str, route: str, url: str | None = None, **kwargs):
+        with statement_budget(BUDGETS[(method, route)]):
+            response = client.request(method, url or route, **kwargs)
+        assert response.status_code == 200, f"{method} {url or route}: {response.text}"
+        body = response.json()
+        adapter = RESPONSE_MODELS.get((method, route))
+        if adapter is not None:
+            # Round-tripping also catches fields the schema does not declare.
+            assert adapter.dump_python(adapter.validate_python(body), mode="json") == body
+        return body
+
+    for route in ("/", "/health", "/health/db"):
+        call("GET", route)
+    account = call(
+        "POST", "/auth/register", json={"username": "Lea", "mail": "lea@example.com", "password": "secret-pass"}
+    )
+    account_id = account["account"]["id"]
+    other_id = client.post(
+        "/auth/register", json={"username": "Max", "mail": "max@example.com", "password": "secret-pass"}
+    ).json()["account"]["id"]
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    call("POST", "/auth/login", json={"mail": "lea@example.com", "password": "secret-pass"})
+    call("POST", "/auth/refresh", json={"refreshToken": account["refreshToken"]})
+    call("POST", "/users", json={"id_account": account_id, "equipment": "mat"}, headers=headers)
+    call("PATCH", "/users/{account_id}", f"/users/{account_id}", json={"sport": "trail"}, headers=headers)
+
+    program = call(
+        "POST",
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 5, "weeks": 4},
+    )
+    sessions = program["sessions"]
+    assert len(sessions) == 20
+    call("GET", "/workouts/sessions/today", params={"account_id": account_id})
+    call(
+        "POST",
+        "/workouts/sessions/{session_id}/complete",
+        f"/workouts/sessions/{sessions[0]['id']}/complete",
+        json={"rpe_reported": 6},
+    )
+    call(
+        "POST",
+        "/workouts/sessions/complete/batch",
+        json={"items": [{"session_id": session["id"], "rpe_reported": 7} for session in sessions[1:15]]},
+        headers=headers,
+    )
+    assert len(call("GET", "/workouts/sessions", params={"account_id": account_id})) == 20
+    assert len(call("GET", "/workouts/sessions", params={"account_id": account_id, "limit": 10})) == 10
+    exercises = call("GET", "/workouts/exercises")
+    call("GET", "/workouts/exercises/{exercise_id}", f"/workouts/exercises/{exercises[0]['id']}")
+
+    readiness = {"sleep_hours": 7, "fatigue": 2, "stress": 2, "soreness": 2, "pain_level": 1}
+    call("POST", "/readiness", json={"account_id": account_id, **readiness})
+    lines = [
+        json.dumps({"account_id": owner, "log_date": str(date.today() - timedelta(days=day)), **readiness})
+        for owner in (account_id, other_id)
+        for day in range(1, 21)
+    ]
+    assert call("POST", "/readiness/bulk", content="\n".join(lines))["accepted"] == 40
+    call("GET", "/readiness/latest", params={"account_id": account_id})
+
+    injury_ids = [
+        call("POST", "/injuries", json={"account_id": account_id, "muscle_group": group, "pain_level": 3})["id"]
+        for group in ("legs", "back", "core", "chest", "hips")
+    ]
+    call("PATCH", "/injuries/{injury_id}/resolve", f"/injuries/{injury_ids[0]}/resolve")
+    assert len(call("GET", "/injuries", params={"account_id": account_id})) == 5
+
+    call("GET", "/progress/{account_id}", f"/progress/{account_id}")
+    call("GET", "/analytics/{account_id}", f"/analytics/{account_id}")
+    batch = call("POST", "/analytics/batch", json={"account_ids": [account_id, other_id, "missing"]})
+    assert len(batch["results"]) == 3
+    call("GET", "/analytics/{account_id}/load", f"/analytics/{account_id}/load")
+    changes = call("GET", "/sync", headers=headers)
+    assert len(changes["sessions"]) == 20
+    with statement_budget(BUDGETS[("GET", "/metrics")]):
+        assert client.get("/metrics").status_code == 200
@@ -0,0 +1,93 @@
+import asyncio
+import contextlib
+from dataclasses import replace
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app import main
+from app.db.session import SessionLocal
+from app.models import Account, Injury, UserProfile
+from app.services.last_connection import flush_last_connections, last_connection_buffer
+
+
+def test_write_endpoints_stay_within_their_statement_budgets(client, account, statement_budget):
+    account_id = account["account"]["id"]
+    headers = {"Authorization": f"Bearer {account['token']}"}
+
+    with statement_budget(1):
+        assert client.post("/auth/refresh", json={"refreshToken": account["refreshToken"]}).status_code == 200
+    with statement_budget(1):
+        assert client.post("/users", json={"id_account": account_id}, headers=headers).status_code == 200
+
+    # The profile written above is cached, so its equipment is not read again.
+    with statement_budget(6):
+        program = client.post(
+            "/workouts/programs/generate",
+            json={"account_id": account_id, "goal": "performance", "week_availability": 7},
+        )
+    assert program.status_code == 200, program.text
+    session_id = program.json()["sessions"][0]["id"]
+    with statement_budget(3):
+        assert client.post(f"/workouts/sessions/{session_id}/complete", json={"rpe_reported": 7}).status_code == 200
+
+    with statement_budget(1):
+        injury = client.post("/injuries", json={"account_id": account_id, "muscle_group": "legs", "pain_level": 3})
+    assert injury.status_code == 200, injury.text
+    with statement_budget(1):
+        assert client.patch(f"/injuries/{injury.json()['id']}/resolve").status_code == 200
+    assert client.patch("/injuries/missing/resolve").status_code == 404
+
+
+def test_injury_insert_links_the_profile(client, account):
+    account_id = account["account"]["id"]
+    headers = {"Authorization": f"Bearer {account['token']}"}
+    client.post("/users", json={"id_account": account_id}, headers=headers)
+    injury_id = client.post("/injuries", json={"account_id": account_id, "muscle_group": "legs", "pain_level": 3}).json()["id"]
+    client.patch(f"/injuries/{injury_id}/resolve")
+
+    with SessionLocal() as db:
+        injury = db.get(Injury, injury_id)
+        assert injury.profile_id == db.scalar(select(UserProfile.id).where(UserProfile.account_id == account_id))
+        assert injury.is_active is False
+
+
+def test_login_buffers_last_connection(client, account, statements, statement_budget):
+    with statement_budget(1):
+        assert client.post("/auth/login", json={"mail": "lea@example.com", "password": "secret-pass"}).status_code == 200
+    assert len(last_connection_buffer) == 1
+
+    statements.clear()
+    assert flush_last_connections() == 1
+    assert len(last_connection_buffer) == 0
+    assert [s for s in statements if s.startswith("UPDATE accounts")]
+
+
+def test_periodic_flush_survives_a_failed_flush(client, account, caplog, monkeypatch):
+    client.post("/auth/login", json={"mail": "lea@example.com", "password": "secret-pass"})
+    attempts = []
+
+    def flaky_flush() -> int:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("database went away")
+        return flush_last_connections()
+
+    monkeypatch.setattr(main, "flush_last_connections", flaky_flush)
+    monkeypatch.setattr(main, "settings", replace(main.settings, last_connection_flush_seconds=0))
+
+    async def run_until_second_flush() -> None:
+        task = asyncio.create_task(main._flush_last_connections_periodically())
+        while len(attempts) < 2 and not task.done():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(run_until_second_flush(), timeout=5))
+    assert len(attempts) >= 2
+    assert "Periodic last_connection flush failed" in caplog.text
+    assert len(last_connection_buffer) == 0
+    registered_at = datetime.fromisoformat(account["account"]["last_connection"])
+    with SessionLocal() as db:
+        assert db.get(Account, account["account"]["id"]).last_connection > registered_at
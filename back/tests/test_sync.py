@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+from app.db.session import SessionLocal
+from app.models import WorkoutSession
+from app.services.sync_service import SYNC_OVERLAP, encode_sync_cursor
+
+
+def _auth(account):
+    return {"Authorization": f"Bearer {account['token']}"}
+
+
+def _sync(client, account, since=None):
+    params = {"since": since} if since else {}
+    response = client.get("/sync", params=params, headers=_auth(account))
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_initial_sync_returns_everything(client, account):
+    account_id = account["account"]["id"]
+    client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 3},
+    )
+    client.post("/injuries", json={"account_id": account_id, "muscle_group": "knee", "pain_level": 4})
+
+    payload = _sync(client, account)
+    assert len(payload["sessions"]) == 3
+    assert [i["muscle_group"] for i in payload["injuries"]] == ["knee"]
+    assert payload["readiness"] == []
+    assert payload["profile"] is None
+    assert payload["cursor"]
+
+
+def test_delta_sync_returns_only_changed_rows(client, account, statements):
+    account_id = account["account"]["id"]
+    program = client.post(
+        "/workouts/programs/generate",
+        json={"account_id": account_id, "goal": "performance", "week_availability": 3},
+    ).json()
+    # Age every row past the overlap window, as if the last sync happened a while ago.
+    with SessionLocal() as db:
+        db.query(WorkoutSession).update({"updated_at": datetime.utcnow() - timedelta(hours=1)})
+        db.commit()
+    since = encode_sync_cursor(datetime.utcnow() - SYNC_OVERLAP * 4)
+
+    unchanged = client.get("/sync", params={"since": since}, headers=_auth(account))
+    assert unchanged.json()["sessions"] == []
+    assert len(unchanged.content) < 300
+
+    session_id = program["sessions"][1]["id"]
+    client.post(f"/workouts/sessions/{session_id}/complete", json={"rpe_reported": 6})
+    statements.clear()
+    payload = _sync(client, account, since)
+    assert [s["id"] for s in payload["sessions"]] == [session_id]
+    assert payload["sessions"][0]["status"] == "done"
+    assert len([s for s in statements if s.lstrip().startswith("SELECT")]) == 4
+
+
+def test_invalid_since_is_rejected(client, account):
+    response = client.get("/sync", params={"since": "%%%"}, headers=_auth(account))
+    assert response.status_code == 400
+
+
+def test_sync_requires_a_valid_access_token(client, account):
+    assert client.get("/sync").status_code == 401
+    assert client.get("/sync", headers={"Authorization": "Bearer not-a-token"}).status_code == 401
+    refresh = {"Authorization": f"Bearer {account['refreshToken']}"}
+    assert client.get("/sync", headers=refresh).status_code == 401
+    # The old query parameter no longer selects an account.
+    assert client.get("/sync", params={"account_id": account["account"]["id"]}).status_code == 401
@@ -13,6 +13,19 @@ export class ApiError extends Error {
 const baseUrl =
   (process.env.EXPO_PUBLIC_API_URL || "http://localhost:3000").replace(/\/$/, "");
 
+// Read-your-writes: after a write the backend returns X-Primary-Until (epoch
+// seconds). Echoing it until it expires keeps our reads on the primary database.
+const PRIMARY_UNTIL_HEADER = "X-Primary-Until";
+let primaryUntil: string | null = null;
+
+function primaryUntilHeader(): Record<string, string> {
+  if (!primaryUntil || Number(primaryUntil) * 1000 <= Date.now()) {
+    primaryUntil = null;
+    return {};
+  }
+  return { [PRIMARY_UNTIL_HEADER]: primaryUntil };
+}
+
 type RequestOptions = {
   method?: "GET" | "POST" | "PUT" | "PATCH" | "DELETE";
   token?: string;
@@ -28,6 +41,7 @@ export async function apiFetch<TResponse>(
   const requestHeaders: Record<string, string> = {
     ...(!isFormData ? { "Content-Type": "application/json" } : {}),
     ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    ...primaryUntilHeader(),
     ...headers,
   };
 
@@ -41,6 +55,11 @@ export async function apiFetch<TResponse>(
       : undefined,
   });
 
+  const issuedPrimaryUntil = response.headers.get(PRIMARY_UNTIL_HEADER);
+  if (issuedPrimaryUntil) {
+    primaryUntil = issuedPrimaryUntil;
+  }
+
   const text = await response.text();
   const data = text ? (JSON.parse(text) as unknown) : null;
 